@@ -2,10 +2,13 @@
 # app/api/v1/agentic.py
 
 from fastapi import APIRouter, HTTPException, Request, Body, Header
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union, AsyncIterator
+import json
 from loguru import logger
 from app.services.agentic.agentic import Agentic
+from app.core.metrics import metrics
 
 
 router = APIRouter(
@@ -27,11 +30,13 @@ class AgenticRequest(BaseModel):
     uid: str
     state: Optional[str] = None
     location: Optional[Location] = None  # 🔥 선택적 필드
+    source_lang: Optional[str] = None  # 이전 응답의 metadata.source_lang (멀티턴 진행 중 언어 감지 생략)
 
 class AgenticResponse(BaseModel):
     """에이전틱 응답 모델"""
     response: str
     metadata: Dict[str, Any]
+    structured_response: Optional[Union[List[Any], Dict[str, Any]]] = None  # 검색 결과 등 구조화된 응답 원본
 
     state: Optional[str] = None
     url: Optional[str] = None
@@ -39,6 +44,25 @@ class AgenticResponse(BaseModel):
 # 에이전트 인스턴스 생성
 agentic = Agentic()
 
+def _extract_token(authorization: Optional[str]) -> Optional[str]:
+    """Authorization 헤더에서 토큰을 추출합니다."""
+    if authorization and authorization.startswith("Bearer "):
+        return authorization.split(" ")[1]
+    return authorization
+
+def _split_response(response: Any) -> Dict[str, Any]:
+    """구조화된 응답은 response 에 JSON 문자열로, structured_response 에 원본 구조로 나누어 담습니다."""
+    if isinstance(response, (list, dict)):
+        return {
+            "response": json.dumps(response, ensure_ascii=False, default=str),
+            "structured_response": response
+        }
+    return {"response": response, "structured_response": None}
+
+def _format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Server-Sent Events 형식의 메시지를 생성합니다."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
 @router.post(
     "",
     response_model=AgenticResponse,
@@ -62,10 +86,7 @@ async def agentic_handler(request: AgenticRequest, authorization: Optional[str]
     try:
         logger.info(f"[TOKEN] Authorization header: {authorization}")
         
-        if authorization and authorization.startswith("Bearer "):
-            token = authorization.split(" ")[1]
-        else:
-            token = authorization
+        token = _extract_token(authorization)
 
         logger.info(f"[TOKEN] Extracted token: {token}")
         logger.info(f"[request.location] {request.location}")
@@ -76,14 +97,15 @@ async def agentic_handler(request: AgenticRequest, authorization: Optional[str]
             uid=request.uid,
             token=token,
             state=request.state,
-            location=request.location
+            location=request.location,
+            source_lang=request.source_lang
         )
         
         logger.info(f"[에이전트 응답] : {result}")
         
         # 응답 반환
         return AgenticResponse(
-            response=result["response"],
+            **_split_response(result["response"]),
             metadata=result["metadata"],
             state=result.get("state"),
             url=result.get("url")
@@ -95,3 +117,55 @@ async def agentic_handler(request: AgenticRequest, authorization: Optional[str]
             status_code=500,
             detail=f"에이전틱 처리 중 오류가 발생했습니다: {str(e)}"
         )
+
+
+@router.post(
+    "/stream",
+    summary="에이전틱 스트리밍 엔드포인트",
+    description="처리 단계 이벤트(classified, agent_started)와 최종 응답 토큰(token)을 Server-Sent Events 로 전송하고, 완료 시 done 이벤트로 전체 응답을 전송합니다."
+)
+async def agentic_stream_handler(request: AgenticRequest, authorization: Optional[str] = Header(None)) -> StreamingResponse:
+    """
+    에이전틱 스트리밍 핸들러
+
+    Args:
+        request: 에이전틱 요청
+        authorization: 인증 토큰
+
+    Returns:
+        StreamingResponse: text/event-stream 응답
+    """
+    token = _extract_token(authorization)
+    logger.info(f"[STREAM] request.location: {request.location}")
+
+    async def event_stream() -> AsyncIterator[str]:
+        async for event, data in agentic.stream_response(
+            query=request.query,
+            uid=request.uid,
+            token=token,
+            state=request.state,
+            location=request.location,
+            source_lang=request.source_lang
+        ):
+            if event == "done":
+                data = {**data, **_split_response(data["response"])}
+            yield _format_sse(event, data)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # 프록시 버퍼링 비활성화
+        }
+    )
+
+
+@router.get(
+    "/metrics",
+    summary="에이전틱 내부 카운터 조회",
+    description="빠른 경로 사용량, 캐시 적중률 등 프로세스 단위 카운터를 반환합니다."
+)
+async def agentic_metrics() -> Dict[str, int]:
+    """프로세스 단위 카운터 조회"""
+    return metrics.snapshot()
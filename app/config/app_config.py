@@ -13,6 +13,11 @@ class LLMProvider(str, Enum):
     GROQ = "groq"
 
 
+class PipelineMode(str, Enum):
+    STAGED = "staged"  # translate_query → AgenticClassifier.classify (LLM 2회)
+    FUSED = "fused"    # AgenticClassifier.understand 단일 호출 (LLM 1회)
+
+
 class Settings(BaseModel):
     """
     애플리케이션 설정 클래스
@@ -55,6 +60,25 @@ class Settings(BaseModel):
     GROQ_LIGHTWEIGHT_MODEL: str
     GROQ_HIGHPERFORMANCE_MODEL: str
 
+    # 에이전틱 파이프라인 설정 (전처리 + 분류 방식)
+    AGENTIC_PIPELINE_MODE: PipelineMode
+    # 로컬 언어 감지 신뢰도 임계값 (이 값 이상이면 LLM 언어 감지 생략, 1 초과 시 비활성화)
+    LANG_DETECT_CONFIDENCE_THRESHOLD: float
+    # 임베딩 기반 에이전트 분류 설정 (확신할 때만 LLM 분류 생략)
+    INTENT_CLASSIFIER_ENABLED: bool
+    INTENT_CLASSIFIER_MIN_SCORE: float
+    INTENT_CLASSIFIER_MARGIN: float
+    # LLM 분류 시 하위 의도(캘린더 동작, 위치 태그 / 카카오 카테고리, 희망 직무)까지 한 번에 추출
+    HIERARCHICAL_CLASSIFICATION_ENABLED: bool
+    # 언어 감지 / 분류와 동시에 에이전트 입력(사용자 정보, 실시간 위치 주소)을 미리 조회
+    DEPENDENCY_PREFETCH_ENABLED: bool
+
+    # LLM HTTP 커넥션 풀 설정 (프로바이더 base URL 별 공유 클라이언트)
+    HTTP_POOL_MAX_CONNECTIONS: int
+    HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS: int
+    HTTP_POOL_KEEPALIVE_EXPIRY: float
+    HTTP2_ENABLED: bool
+
 
 # .env 파일에서 환경변수 로드 또는 기본값 사용
 def get_env_var(var_name, default_value):
@@ -97,6 +121,21 @@ settings = Settings(
     GROQ_API_KEY=get_env_var("GROQ_API_KEY", ""),
     GROQ_LIGHTWEIGHT_MODEL=get_env_var("GROQ_LIGHTWEIGHT_MODEL", "llama-3.1-8b-instant"),
     GROQ_HIGHPERFORMANCE_MODEL=get_env_var("GROQ_HIGHPERFORMANCE_MODEL", "llama-3.3-70b-versatile"),
+
+    # 에이전틱 파이프라인 설정
+    AGENTIC_PIPELINE_MODE=PipelineMode(get_env_var("AGENTIC_PIPELINE_MODE", "staged")),
+    LANG_DETECT_CONFIDENCE_THRESHOLD=float(get_env_var("LANG_DETECT_CONFIDENCE_THRESHOLD", "0.9")),
+    INTENT_CLASSIFIER_ENABLED=get_env_var("INTENT_CLASSIFIER_ENABLED", "true").lower() == "true",
+    INTENT_CLASSIFIER_MIN_SCORE=float(get_env_var("INTENT_CLASSIFIER_MIN_SCORE", "0.4")),
+    INTENT_CLASSIFIER_MARGIN=float(get_env_var("INTENT_CLASSIFIER_MARGIN", "0.05")),
+    HIERARCHICAL_CLASSIFICATION_ENABLED=get_env_var("HIERARCHICAL_CLASSIFICATION_ENABLED", "true").lower() == "true",
+    DEPENDENCY_PREFETCH_ENABLED=get_env_var("DEPENDENCY_PREFETCH_ENABLED", "true").lower() == "true",
+
+    # LLM HTTP 커넥션 풀 설정
+    HTTP_POOL_MAX_CONNECTIONS=int(get_env_var("HTTP_POOL_MAX_CONNECTIONS", "100")),
+    HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS=int(get_env_var("HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS", "20")),
+    HTTP_POOL_KEEPALIVE_EXPIRY=float(get_env_var("HTTP_POOL_KEEPALIVE_EXPIRY", "30")),
+    HTTP2_ENABLED=get_env_var("HTTP2_ENABLED", "true").lower() == "true",
 )
 
 # 디버깅을 위한 설정 로그 출력
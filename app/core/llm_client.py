@@ -1,9 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator, List, Tuple, Callable
 import httpx
+import json
 import time
 from loguru import logger
 from app.config.app_config import settings, LLMProvider
+from app.core.metrics import metrics
+from langchain_core.runnables import Runnable
 from langchain_openai import ChatOpenAI
 from langchain_groq import ChatGroq
 from langchain_community.chat_models import ChatOllama
@@ -14,6 +17,104 @@ from dotenv import load_dotenv
 load_dotenv()
 client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+OPENAI_BASE_URL = "https://api.openai.com/v1"
+
+# 프로바이더 origin 별 공유 HTTP 클라이언트 (keep-alive 커넥션 재사용)
+_async_http_clients: Dict[str, httpx.AsyncClient] = {}
+_sync_http_clients: Dict[str, httpx.Client] = {}
+
+# (tier, provider) 별 LLM 클라이언트 / LangChain LLM 과 이름별 체인 레지스트리 (프로세스 단위로 한 번만 생성)
+_llm_clients: Dict[Tuple[str, str], "BaseLLMClient"] = {}
+_langchain_llms: Dict[Tuple[str, str], Any] = {}
+_chains: Dict[str, Runnable] = {}
+
+
+def _pool_key(base_url: str) -> str:
+    """base URL 의 origin (scheme://host:port) 을 풀 키로 사용합니다."""
+    url = httpx.URL(base_url)
+    return f"{url.scheme}://{url.host}:{url.port or (443 if url.scheme == 'https' else 80)}"
+
+
+def _use_http2(base_url: str) -> bool:
+    """HTTPS 프로바이더이고 h2 패키지가 설치된 경우에만 HTTP/2 를 사용합니다."""
+    if not settings.HTTP2_ENABLED or httpx.URL(base_url).scheme != "https":
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _pool_options(base_url: str) -> Dict[str, Any]:
+    return {
+        "limits": httpx.Limits(
+            max_connections=settings.HTTP_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_POOL_KEEPALIVE_EXPIRY,
+        ),
+        "http2": _use_http2(base_url),
+    }
+
+
+def get_http_client(base_url: str) -> httpx.AsyncClient:
+    """base URL 에 해당하는 공유 비동기 HTTP 클라이언트를 반환합니다. (없으면 생성)"""
+    key = _pool_key(base_url)
+    http_client = _async_http_clients.get(key)
+    if http_client is None or http_client.is_closed:
+        options = _pool_options(base_url)
+        http_client = httpx.AsyncClient(**options)
+        _async_http_clients[key] = http_client
+        logger.info(f"[HTTP 풀] 비동기 클라이언트 생성: {key} (HTTP/2: {options['http2']})")
+    return http_client
+
+
+def get_sync_http_client(base_url: str) -> httpx.Client:
+    """base URL 에 해당하는 공유 동기 HTTP 클라이언트를 반환합니다. (LangChain 동기 호출용)"""
+    key = _pool_key(base_url)
+    http_client = _sync_http_clients.get(key)
+    if http_client is None or http_client.is_closed:
+        options = _pool_options(base_url)
+        http_client = httpx.Client(**options)
+        _sync_http_clients[key] = http_client
+        logger.info(f"[HTTP 풀] 동기 클라이언트 생성: {key} (HTTP/2: {options['http2']})")
+    return http_client
+
+
+def _provider_base_urls() -> List[str]:
+    """설정된 경량/고성능 프로바이더의 base URL 목록을 반환합니다."""
+    base_urls = []
+    for provider, is_lightweight in [(settings.LIGHTWEIGHT_LLM_PROVIDER, True), (settings.HIGH_PERFORMANCE_LLM_PROVIDER, False)]:
+        if provider == LLMProvider.GROQ:
+            base_urls.append(GROQ_BASE_URL)
+        elif provider == LLMProvider.OPENAI:
+            base_urls.append(OPENAI_BASE_URL)
+        elif provider == LLMProvider.OLLAMA:
+            base_urls.append(settings.LIGHTWEIGHT_OLLAMA_URL if is_lightweight else settings.HIGH_PERFORMANCE_OLLAMA_URL)
+    return base_urls
+
+
+async def init_http_clients() -> None:
+    """애플리케이션 시작 시 설정된 프로바이더의 공유 HTTP 클라이언트를 생성합니다."""
+    for base_url in _provider_base_urls():
+        get_http_client(base_url)
+        get_sync_http_client(base_url)
+    logger.info(f"[HTTP 풀] 초기화 완료: {sorted(_async_http_clients)}")
+
+
+async def close_http_clients() -> None:
+    """애플리케이션 종료 시 공유 HTTP 클라이언트를 모두 닫습니다."""
+    for http_client in _async_http_clients.values():
+        await http_client.aclose()
+    for http_client in _sync_http_clients.values():
+        http_client.close()
+    _async_http_clients.clear()
+    _sync_http_clients.clear()
+    # 닫힌 풀을 참조하는 LLM / 체인도 함께 폐기
+    reset_llm_registry()
+    logger.info("[HTTP 풀] 모든 클라이언트 종료 완료")
+
 class BaseLLMClient(ABC):
     """LLM 클라이언트의 기본 추상 클래스"""
     
@@ -22,6 +123,11 @@ class BaseLLMClient(ABC):
         """프롬프트를 기반으로 텍스트를 생성합니다."""
         pass
     
+    @abstractmethod
+    def generate_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """프롬프트를 기반으로 생성되는 텍스트를 조각 단위로 반환합니다."""
+        pass
+    
     @abstractmethod
     async def check_connection(self) -> bool:
         """LLM 서버 연결 상태를 확인합니다."""
@@ -43,7 +149,7 @@ class GroqClient(BaseLLMClient):
             self.timeout = 60  # 고성능 모델 기본 타임아웃
             logger.info(f"[GroqClient] 고성능 모델 초기화 완료: MODEL={self.model}, TIMEOUT={self.timeout}초")
         
-        self.base_url = "https://api.groq.com/openai/v1"
+        self.base_url = GROQ_BASE_URL
         
         # API 키가 없을 때 예외를 발생시키지 않고 경고만 출력
         if not self.api_key:
@@ -53,14 +159,14 @@ class GroqClient(BaseLLMClient):
         """Groq 서버 연결 상태를 확인합니다."""
         start_time = time.time()
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                headers = {"Authorization": f"Bearer {self.api_key}"}
-                response = await client.get(f"{self.base_url}/models", headers=headers)
-                response.raise_for_status()
-                elapsed = time.time() - start_time
-                model_type = "경량" if self.is_lightweight else "고성능"
-                logger.info(f"[Groq {model_type}] 연결 확인 시간: {elapsed:.2f}초")
-                return True
+            client = get_http_client(self.base_url)
+            headers = {"Authorization": f"Bearer {self.api_key}"}
+            response = await client.get(f"{self.base_url}/models", headers=headers, timeout=self.timeout)
+            response.raise_for_status()
+            elapsed = time.time() - start_time
+            model_type = "경량" if self.is_lightweight else "고성능"
+            logger.info(f"[Groq {model_type}] 연결 확인 시간: {elapsed:.2f}초")
+            return True
         except Exception as e:
             elapsed = time.time() - start_time
             model_type = "경량" if self.is_lightweight else "고성능"
@@ -84,23 +190,24 @@ class GroqClient(BaseLLMClient):
         }
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                request_start = time.time()
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=headers,
-                    json=payload
-                )
-                request_time = time.time() - request_start
-                model_type = "경량" if self.is_lightweight else "고성능"
-                logger.info(f"[Groq {model_type}] API 요청 시간: {request_time:.2f}초")
+            client = get_http_client(self.base_url)
+            request_start = time.time()
+            response = await client.post(
+                f"{self.base_url}/chat/completions",
+                headers=headers,
+                json=payload,
+                timeout=self.timeout
+            )
+            request_time = time.time() - request_start
+            model_type = "경량" if self.is_lightweight else "고성능"
+            logger.info(f"[Groq {model_type}] API 요청 시간: {request_time:.2f}초")
                 
-                response.raise_for_status()
-                result = response.json()["choices"][0]["message"]["content"]
+            response.raise_for_status()
+            result = response.json()["choices"][0]["message"]["content"]
                 
-                total_time = time.time() - start_time
-                logger.info(f"[Groq {model_type}] 전체 생성 시간: {total_time:.2f}초")
-                return result
+            total_time = time.time() - start_time
+            logger.info(f"[Groq {model_type}] 전체 생성 시간: {total_time:.2f}초")
+            return result
         except httpx.TimeoutException as e:
             elapsed = time.time() - start_time
             model_type = "경량" if self.is_lightweight else "고성능"
@@ -117,6 +224,59 @@ class GroqClient(BaseLLMClient):
             logger.error(f"[Groq {model_type}] 예상치 못한 오류: {str(e)} (소요 시간: {elapsed:.2f}초)")
             raise ValueError(f"Groq 처리 중 오류 발생: {str(e)}")
 
+    async def generate_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Groq API 스트리밍 응답(SSE)을 사용하여 생성되는 텍스트를 조각 단위로 반환합니다."""
+        start_time = time.time()
+        first_token_time = None
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        payload = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.7,
+            "stream": True,
+            **kwargs
+        }
+        
+        model_type = "경량" if self.is_lightweight else "고성능"
+        try:
+            client = get_http_client(self.base_url)
+            async with client.stream(
+                "POST",
+                f"{self.base_url}/chat/completions",
+                headers=headers,
+                json=payload,
+                timeout=self.timeout
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    choices = json.loads(data).get("choices") or [{}]
+                    content = choices[0].get("delta", {}).get("content")
+                    if content:
+                        if first_token_time is None:
+                            first_token_time = time.time() - start_time
+                            logger.info(f"[Groq {model_type}] 첫 토큰 수신 시간: {first_token_time:.2f}초")
+                        yield content
+            
+            total_time = time.time() - start_time
+            logger.info(f"[Groq {model_type}] 전체 스트리밍 시간: {total_time:.2f}초")
+        except httpx.TimeoutException as e:
+            elapsed = time.time() - start_time
+            logger.error(f"[Groq {model_type}] 스트리밍 타임아웃: {str(e)} (소요 시간: {elapsed:.2f}초)")
+            raise TimeoutError(f"Groq 서버 응답 시간 초과 (타임아웃: {self.timeout}초)")
+        except httpx.RequestError as e:
+            elapsed = time.time() - start_time
+            logger.error(f"[Groq {model_type}] 스트리밍 요청 실패: {str(e)} (소요 시간: {elapsed:.2f}초)")
+            raise ConnectionError(f"Groq 서버 요청 실패: {str(e)}")
+
 class OllamaClient(BaseLLMClient):
     """Ollama API 클라이언트"""
     
@@ -139,13 +299,13 @@ class OllamaClient(BaseLLMClient):
         """Ollama 서버 연결 상태를 확인합니다."""
         start_time = time.time()
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(self.tags_url)
-                response.raise_for_status()
-                elapsed = time.time() - start_time
-                model_type = "경량" if self.is_lightweight else "고성능"
-                logger.info(f"[Ollama {model_type}] 연결 확인 시간: {elapsed:.2f}초")
-                return True
+            client = get_http_client(self.base_url)
+            response = await client.get(self.tags_url, timeout=self.timeout)
+            response.raise_for_status()
+            elapsed = time.time() - start_time
+            model_type = "경량" if self.is_lightweight else "고성능"
+            logger.info(f"[Ollama {model_type}] 연결 확인 시간: {elapsed:.2f}초")
+            return True
         except Exception as e:
             elapsed = time.time() - start_time
             model_type = "경량" if self.is_lightweight else "고성능"
@@ -163,19 +323,19 @@ class OllamaClient(BaseLLMClient):
         }
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                request_start = time.time()
-                response = await client.post(self.generate_url, json=payload)
-                request_time = time.time() - request_start
-                model_type = "경량" if self.is_lightweight else "고성능"
-                logger.info(f"[Ollama {model_type}] API 요청 시간: {request_time:.2f}초")
+            client = get_http_client(self.base_url)
+            request_start = time.time()
+            response = await client.post(self.generate_url, json=payload, timeout=self.timeout)
+            request_time = time.time() - request_start
+            model_type = "경량" if self.is_lightweight else "고성능"
+            logger.info(f"[Ollama {model_type}] API 요청 시간: {request_time:.2f}초")
                 
-                response.raise_for_status()
-                result = response.json()["response"]
+            response.raise_for_status()
+            result = response.json()["response"]
                 
-                total_time = time.time() - start_time
-                logger.info(f"[Ollama {model_type}] 전체 생성 시간: {total_time:.2f}초")
-                return result
+            total_time = time.time() - start_time
+            logger.info(f"[Ollama {model_type}] 전체 생성 시간: {total_time:.2f}초")
+            return result
         except httpx.TimeoutException as e:
             elapsed = time.time() - start_time
             model_type = "경량" if self.is_lightweight else "고성능"
@@ -192,6 +352,46 @@ class OllamaClient(BaseLLMClient):
             logger.error(f"[Ollama {model_type}] 예상치 못한 오류: {str(e)} (소요 시간: {elapsed:.2f}초)")
             raise ValueError(f"Ollama 처리 중 오류 발생: {str(e)}")
 
+    async def generate_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Ollama API 스트리밍 응답(NDJSON)을 사용하여 생성되는 텍스트를 조각 단위로 반환합니다."""
+        start_time = time.time()
+        first_token_time = None
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": True,
+            **kwargs
+        }
+        
+        model_type = "경량" if self.is_lightweight else "고성능"
+        try:
+            client = get_http_client(self.base_url)
+            async with client.stream("POST", self.generate_url, json=payload, timeout=self.timeout) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    chunk = json.loads(line)
+                    content = chunk.get("response")
+                    if content:
+                        if first_token_time is None:
+                            first_token_time = time.time() - start_time
+                            logger.info(f"[Ollama {model_type}] 첫 토큰 수신 시간: {first_token_time:.2f}초")
+                        yield content
+                    if chunk.get("done"):
+                        break
+            
+            total_time = time.time() - start_time
+            logger.info(f"[Ollama {model_type}] 전체 스트리밍 시간: {total_time:.2f}초")
+        except httpx.TimeoutException as e:
+            elapsed = time.time() - start_time
+            logger.error(f"[Ollama {model_type}] 스트리밍 타임아웃: {str(e)} (소요 시간: {elapsed:.2f}초)")
+            raise TimeoutError(f"Ollama 서버 응답 시간 초과 (타임아웃: {self.timeout}초)")
+        except httpx.RequestError as e:
+            elapsed = time.time() - start_time
+            logger.error(f"[Ollama {model_type}] 스트리밍 요청 실패: {str(e)} (소요 시간: {elapsed:.2f}초)")
+            raise ConnectionError(f"Ollama 서버 요청 실패: {str(e)}")
+
 class OpenAIClient(BaseLLMClient):
     """OpenAI API 클라이언트"""
     
@@ -205,7 +405,7 @@ class OpenAIClient(BaseLLMClient):
             self.api_key = settings.HIGH_PERFORMANCE_OPENAI_API_KEY
             self.model = settings.HIGH_PERFORMANCE_OPENAI_MODEL
             self.timeout = settings.HIGH_PERFORMANCE_OPENAI_TIMEOUT
-        self.base_url = "https://api.openai.com/v1"
+        self.base_url = OPENAI_BASE_URL
         
         if not self.api_key:
             raise ValueError("OpenAI API 키가 설정되지 않았습니다.")
@@ -214,14 +414,14 @@ class OpenAIClient(BaseLLMClient):
         """OpenAI 서버 연결 상태를 확인합니다."""
         start_time = time.time()
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                headers = {"Authorization": f"Bearer {self.api_key}"}
-                response = await client.get(f"{self.base_url}/models", headers=headers)
-                response.raise_for_status()
-                elapsed = time.time() - start_time
-                model_type = "경량" if self.is_lightweight else "고성능"
-                logger.info(f"[OpenAI {model_type}] 연결 확인 시간: {elapsed:.2f}초")
-                return True
+            client = get_http_client(self.base_url)
+            headers = {"Authorization": f"Bearer {self.api_key}"}
+            response = await client.get(f"{self.base_url}/models", headers=headers, timeout=self.timeout)
+            response.raise_for_status()
+            elapsed = time.time() - start_time
+            model_type = "경량" if self.is_lightweight else "고성능"
+            logger.info(f"[OpenAI {model_type}] 연결 확인 시간: {elapsed:.2f}초")
+            return True
         except Exception as e:
             elapsed = time.time() - start_time
             model_type = "경량" if self.is_lightweight else "고성능"
@@ -243,23 +443,24 @@ class OpenAIClient(BaseLLMClient):
         }
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                request_start = time.time()
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=headers,
-                    json=payload
-                )
-                request_time = time.time() - request_start
-                model_type = "경량" if self.is_lightweight else "고성능"
-                logger.info(f"[OpenAI {model_type}] API 요청 시간: {request_time:.2f}초")
+            client = get_http_client(self.base_url)
+            request_start = time.time()
+            response = await client.post(
+                f"{self.base_url}/chat/completions",
+                headers=headers,
+                json=payload,
+                timeout=self.timeout
+            )
+            request_time = time.time() - request_start
+            model_type = "경량" if self.is_lightweight else "고성능"
+            logger.info(f"[OpenAI {model_type}] API 요청 시간: {request_time:.2f}초")
                 
-                response.raise_for_status()
-                result = response.json()["choices"][0]["message"]["content"]
+            response.raise_for_status()
+            result = response.json()["choices"][0]["message"]["content"]
                 
-                total_time = time.time() - start_time
-                logger.info(f"[OpenAI {model_type}] 전체 생성 시간: {total_time:.2f}초")
-                return result
+            total_time = time.time() - start_time
+            logger.info(f"[OpenAI {model_type}] 전체 생성 시간: {total_time:.2f}초")
+            return result
         except httpx.TimeoutException as e:
             elapsed = time.time() - start_time
             model_type = "경량" if self.is_lightweight else "고성능"
@@ -276,13 +477,82 @@ class OpenAIClient(BaseLLMClient):
             logger.error(f"[OpenAI {model_type}] 예상치 못한 오류: {str(e)} (소요 시간: {elapsed:.2f}초)")
             raise ValueError(f"OpenAI 처리 중 오류 발생: {str(e)}")
 
+    async def generate_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """OpenAI API 스트리밍 응답(SSE)을 사용하여 생성되는 텍스트를 조각 단위로 반환합니다."""
+        start_time = time.time()
+        first_token_time = None
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        payload = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": True,
+            **kwargs
+        }
+        
+        model_type = "경량" if self.is_lightweight else "고성능"
+        try:
+            client = get_http_client(self.base_url)
+            async with client.stream(
+                "POST",
+                f"{self.base_url}/chat/completions",
+                headers=headers,
+                json=payload,
+                timeout=self.timeout
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    choices = json.loads(data).get("choices") or [{}]
+                    content = choices[0].get("delta", {}).get("content")
+                    if content:
+                        if first_token_time is None:
+                            first_token_time = time.time() - start_time
+                            logger.info(f"[OpenAI {model_type}] 첫 토큰 수신 시간: {first_token_time:.2f}초")
+                        yield content
+            
+            total_time = time.time() - start_time
+            logger.info(f"[OpenAI {model_type}] 전체 스트리밍 시간: {total_time:.2f}초")
+        except httpx.TimeoutException as e:
+            elapsed = time.time() - start_time
+            logger.error(f"[OpenAI {model_type}] 스트리밍 타임아웃: {str(e)} (소요 시간: {elapsed:.2f}초)")
+            raise TimeoutError(f"OpenAI 서버 응답 시간 초과 (타임아웃: {self.timeout}초)")
+        except httpx.RequestError as e:
+            elapsed = time.time() - start_time
+            logger.error(f"[OpenAI {model_type}] 스트리밍 요청 실패: {str(e)} (소요 시간: {elapsed:.2f}초)")
+            raise ConnectionError(f"OpenAI 서버 요청 실패: {str(e)}")
+
+def _registry_key(is_lightweight: bool) -> Tuple[str, str]:
+    """레지스트리 키 (tier, provider) 를 반환합니다."""
+    provider = settings.LIGHTWEIGHT_LLM_PROVIDER if is_lightweight else settings.HIGH_PERFORMANCE_LLM_PROVIDER
+    return ("lightweight" if is_lightweight else "high_performance", provider.value)
+
+
 def get_llm_client(is_lightweight: bool = True) -> BaseLLMClient:
     """
     설정된 LLM 프로바이더에 따라 적절한 클라이언트를 반환합니다.
+    (tier, provider) 별로 한 번만 생성해서 재사용합니다.
     
     Args:
         is_lightweight (bool): 경량 모델 사용 여부 (기본값: True)
     """
+    key = _registry_key(is_lightweight)
+    llm_client = _llm_clients.get(key)
+    if llm_client is None:
+        llm_client = _create_llm_client(is_lightweight)
+        _llm_clients[key] = llm_client
+        metrics.incr(f"registry.llm_client.built.{key[0]}.{key[1]}")
+    return llm_client
+
+
+def _create_llm_client(is_lightweight: bool) -> BaseLLMClient:
     provider = settings.LIGHTWEIGHT_LLM_PROVIDER if is_lightweight else settings.HIGH_PERFORMANCE_LLM_PROVIDER
     
     if provider == LLMProvider.OLLAMA:
@@ -295,22 +565,75 @@ def get_llm_client(is_lightweight: bool = True) -> BaseLLMClient:
         raise ValueError(f"지원하지 않는 LLM 프로바이더: {provider}") 
     
 def get_langchain_llm(is_lightweight: bool = True):
+    """
+    설정된 LLM 프로바이더에 따라 LangChain LLM 을 반환합니다.
+    (tier, provider) 별로 한 번만 생성해서 재사용합니다.
+    """
+    key = _registry_key(is_lightweight)
+    llm = _langchain_llms.get(key)
+    if llm is None:
+        llm = _create_langchain_llm(is_lightweight)
+        _langchain_llms[key] = llm
+        metrics.incr(f"registry.langchain_llm.built.{key[0]}.{key[1]}")
+    return llm
+
+
+def get_chain(name: str, build: Callable[[], Runnable]) -> Runnable:
+    """
+    이름별 LangChain 체인을 반환합니다. 처음 요청될 때만 build() 로 생성하고 이후에는 재사용합니다.
+    요청마다 달라지는 값은 프롬프트 템플릿 변수로 전달해야 합니다.
+
+    Args:
+        name: 체인 이름 (예: "foodstore.query_analyze")
+        build: 체인 생성 함수
+    """
+    chain = _chains.get(name)
+    if chain is None:
+        chain = build()
+        _chains[name] = chain
+        metrics.incr(f"registry.chain.built.{name}")
+        logger.info(f"[체인 레지스트리] 체인 생성: {name}")
+    else:
+        metrics.incr("registry.chain.reused")
+    return chain
+
+
+def reset_llm_registry() -> None:
+    """레지스트리에 저장된 클라이언트 / LLM / 체인을 모두 폐기합니다."""
+    _llm_clients.clear()
+    _langchain_llms.clear()
+    _chains.clear()
+
+
+def _create_langchain_llm(is_lightweight: bool):
     provider = settings.LIGHTWEIGHT_LLM_PROVIDER if is_lightweight else settings.HIGH_PERFORMANCE_LLM_PROVIDER
 
     if provider == LLMProvider.OPENAI:
         model = settings.LIGHTWEIGHT_OPENAI_MODEL if is_lightweight else settings.HIGH_PERFORMANCE_OPENAI_MODEL
         api_key = settings.LIGHTWEIGHT_OPENAI_API_KEY if is_lightweight else settings.HIGH_PERFORMANCE_OPENAI_API_KEY
         timeout = settings.LIGHTWEIGHT_OPENAI_TIMEOUT if is_lightweight else settings.HIGH_PERFORMANCE_OPENAI_TIMEOUT
-        return ChatOpenAI(model=model, api_key=api_key, timeout=timeout)
+        return ChatOpenAI(
+            model=model,
+            api_key=api_key,
+            timeout=timeout,
+            http_client=get_sync_http_client(OPENAI_BASE_URL),
+            http_async_client=get_http_client(OPENAI_BASE_URL)
+        )
     
     elif provider == LLMProvider.GROQ:
         model = settings.GROQ_LIGHTWEIGHT_MODEL if is_lightweight else settings.GROQ_HIGHPERFORMANCE_MODEL
         api_key = settings.GROQ_API_KEY
-        return ChatGroq(model=model, api_key=api_key)
+        return ChatGroq(
+            model=model,
+            api_key=api_key,
+            http_client=get_sync_http_client(GROQ_BASE_URL),
+            http_async_client=get_http_client(GROQ_BASE_URL)
+        )
 
     elif provider == LLMProvider.OLLAMA:
         model = settings.LIGHTWEIGHT_OLLAMA_MODEL if is_lightweight else settings.HIGH_PERFORMANCE_OLLAMA_MODEL
         base_url = settings.LIGHTWEIGHT_OLLAMA_URL if is_lightweight else settings.HIGH_PERFORMANCE_OLLAMA_URL
+        # langchain_community ChatOllama 는 외부 HTTP 클라이언트 주입을 지원하지 않음
         return ChatOllama(model=model, base_url=base_url)
     
     else:
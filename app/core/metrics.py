@@ -0,0 +1,39 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Optional
+
+
+class Metrics:
+    """프로세스 단위 카운터 (빠른 경로 사용량, 캐시 적중률 등 관측용)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = defaultdict(int)
+
+    def incr(self, name: str, value: int = 1) -> None:
+        """카운터를 증가시킵니다."""
+        with self._lock:
+            self._counters[name] += value
+
+    def get(self, name: str) -> int:
+        """카운터 값을 반환합니다."""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self, prefix: Optional[str] = None) -> Dict[str, int]:
+        """현재 카운터 값을 복사해서 반환합니다. (prefix 지정 시 해당 항목만)"""
+        with self._lock:
+            return {
+                name: value
+                for name, value in sorted(self._counters.items())
+                if prefix is None or name.startswith(prefix)
+            }
+
+    def reset(self) -> None:
+        """모든 카운터를 초기화합니다."""
+        with self._lock:
+            self._counters.clear()
+
+
+# 전역 카운터 인스턴스
+metrics = Metrics()
@@ -1,6 +1,8 @@
 from fastapi import FastAPI
 from app.api.v1 import agentic
 from app.config.logging_config import setup_logging
+from app.core.llm_client import init_http_clients, close_http_clients
+from app.services.agentic.agentic_intent_classifier import warm_intent_classifier
 from fastapi.middleware.cors import CORSMiddleware
 from py_eureka_client import eureka_client
 from os import getenv, path
@@ -29,6 +31,9 @@ logger.info("Application starting up...")
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("[WORKFLOW] Server starting (lifespan)")
+    await init_http_clients()
+    # 임베딩 분류기 모델을 워커 시작 시 로드 (첫 요청 지연 방지)
+    await warm_intent_classifier()
     await eureka_client.init_async(
         eureka_server=EUREKA_IP,
         app_name=EUREKA_APP_NAME,
@@ -38,6 +43,7 @@ async def lifespan(app: FastAPI):
     yield
     logger.info("[WORKFLOW] Server shutting down (lifespan)")
     await eureka_client.stop_async()
+    await close_http_clients()
 
 # FastAPI 앱 생성
 app = FastAPI(
@@ -1,4 +1,6 @@
 from enum import Enum
+from typing import Optional
+from pydantic import BaseModel
 
 
 class AgentType(str, Enum):
@@ -16,6 +18,19 @@ class AgentType(str, Enum):
     CAT = "cat"
     EUM = "eum"
 
+
+class SubIntent(BaseModel):
+    """
+    분류 단계에서 함께 추출한 하위 의도
+    - 값이 None 인 항목은 해당 에이전트가 기존처럼 후속 LLM 호출로 판단
+    """
+    calendar_action: Optional[str] = None     # calendar : add | delete | edit | check
+    location_tag: Optional[str] = None        # location : Find | None
+    location_intention: Optional[str] = None  # location : 검색 키워드 (족발, 스타벅스 등)
+    kakao_category: Optional[str] = None      # location : 카카오 카테고리 코드 (MT1 ... PO3)
+    job_role: Optional[bool] = None           # job_search / cover_letter : 희망 직무 명시 여부
+    desired_field: Optional[str] = None       # cover_letter : 희망 직무 / 분야
+
 # 게시판 카테고리 모델
 # 대분류-소분류 형태
 class PostCategory(str, Enum):
@@ -1,23 +1,36 @@
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, Tuple
 from loguru import logger
+import time
+from app.config.app_config import settings, PipelineMode
+from app.core.metrics import metrics
+from app.models.agentic_response import AgentType
 from app.services.agentic.agentic_classifier import AgenticClassifier
-from app.services.agentic.agentic_response_generator import AgenticResponseGenerator
-from app.services.common.postprocessor import Postprocessor
-from app.services.common.preprocessor import translate_query
+from app.services.agentic.agentic_context import RequestContext
+from app.services.agentic.agentic_response_generator import AgenticResponseGenerator, resolve_state_route, state_route_needs_translation, agent_dependencies, SPECULATIVE_DEPENDENCIES
+from app.services.common.postprocessor import Postprocessor, LANGUAGE_CODE_MAP
+from app.services.common.preprocessor import translate_query, detect_query_language
 # from app.api.v1.agentic import Location
 from typing import Optional
 
 class Agentic:
     """에이전트 클래스 - 워크플로우 관리"""
-    
+
     def __init__(self):
         self.classifier = AgenticClassifier()
         self.response_generator = AgenticResponseGenerator()
         self.postprocessor = Postprocessor()
         logger.info("[에이전트] 초기화 완료")
-    
-    async def get_response(self, query: str, uid: str, token: Optional[str] = None, state: Optional[str] = None, location: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
-        """질의에 대한 응답을 생성합니다."""
+
+    async def get_response(self, query: str, uid: str, token: Optional[str] = None, state: Optional[str] = None, location: Optional[Dict[str, str]] = None, source_lang: Optional[str] = None) -> Dict[str, Any]:
+        """
+        질의에 대한 응답을 생성합니다.
+
+        Args:
+            source_lang: 이전 턴 응답의 metadata.source_lang (멀티턴 진행 중일 때 언어 감지 생략용)
+        """
+        english_query = query
+        agentic_type = None
+        context = None
         try:
             # 0. guideline
             if state == 'guide':
@@ -29,68 +42,47 @@ class Agentic:
             logger.info(f"[WORKFLOW] ====== Starting agentic workflow for user {uid} ======")
             logger.info(f"[WORKFLOW] Original query: {query}")
             logger.info(f"[WORKFLOW] Original state: {state}")
-            
-            # 1. 전처리 (언어 감지 및 번역)  > 수정 완료
-            logger.info(f"[WORKFLOW] Step 1: Preprocessing (language detection and translation)")
-            translation_result = translate_query(query)
-            source_lang = translation_result["lang_code"]
-            english_query = translation_result["translated_query"]
-            logger.info(f"[에이전트] 언어 감지 완료 - 소스 언어: {source_lang}, 영어 번역: {english_query}")
-            
-            # 2. 기능 분류 > 수정 완료
-            logger.info(f"[WORKFLOW] Step 2: Classification")
-            agentic_type = await self.classifier.classify(english_query)
-            
-            logger.info(f"[에이전트] 에이전틱 유형: {agentic_type}")
-            
+
+            # 요청 컨텍스트 (에이전트에 요청 데이터를 명시적으로 전달)
+            context = RequestContext(uid=uid, token=token, location=location)
+            self._start_prefetch(context, state)
+
+            # 1+2. 언어 감지 / 번역 / 기능 분류
+            understanding = await self._understand(query, state, source_lang)
+            source_lang = context.source_lang = understanding["source_lang"]
+            english_query = understanding["english_query"]
+            agentic_type = understanding["agentic_type"]
+            context.cancel_prefetch(keep=agent_dependencies(agentic_type))
+
             # 3. 응답 생성
             logger.info(f"[WORKFLOW] Step 3: Response generation")
 
             logger.info(f"[응답 생성 live_location] : {location}")
 
-            result = await self.response_generator.generate_response(original_query, english_query, agentic_type, uid, token, state,source_lang,location)
+            result = await self.response_generator.generate_response(original_query, english_query, agentic_type, state, context, sub_intent=understanding["sub_intent"])
 
             logger.info(f"[에이전트] 응답 생성 완료 : {result}")
 
-            # result["url"] 예외처리
-            if "url" not in result or result["url"] is None:
-                result["url"] = "None"
-
-            # state 예외처리
-            if result["metadata"].get("state") in [None , "general", "calendar", "post"]:
-                result["metadata"]["state"] = "initial"
+            self._normalize_result(result)
 
-
-            
             # 4. 후처리 (원문 언어로 번역)
-            logger.info(f"[WORKFLOW] Step 4: Postprocessing (translation back to original language)")
-            processed_response = await self.postprocessor.postprocess(result["response"], source_lang, "general")
-            result["response"] = processed_response["response"]
-            result["metadata"]["translated"] = True
-            
+            if self.postprocessor.should_translate(result["response"], source_lang, result.get("output_lang")):
+                logger.info(f"[WORKFLOW] Step 4: Postprocessing (translation back to original language)")
+                processed_response = await self.postprocessor.postprocess(result["response"], source_lang, "general")
+                result["response"] = processed_response["response"]
+                result["metadata"]["translated"] = True
+            else:
+                # 이미 사용자 언어로 생성된 응답은 번역 생략
+                logger.info(f"[WORKFLOW] Step 4: Postprocessing skipped (response already in {source_lang})")
+                metrics.incr("postprocess.skipped")
+                result["metadata"]["translated"] = False
+
             # 5. 응답 데이터 구성
+            response_data = self._build_response_data(result, understanding, uid)
 
-            logger.info(f"[WORKFLOW] 응답 데이터 구성 시작")
-            response_data = {
-                "response": result["response"],
-                "metadata": {
-                    "english_query": english_query,
-                    "source_lang": source_lang,
-                    "agentic_type": agentic_type,
-                    "uid": uid,
-                    "state": result.get("metadata", {}).get("state", "general")
-                },
-                "state": result.get("metadata", {}).get("state", "general"),
-                "url": result["url"]
-            }
-            
-            # 메타데이터에 추가 정보가 있으면 병합
-            if "metadata" in result:
-                response_data["metadata"].update(result["metadata"])
-                
             logger.info(f"[WORKFLOW] ====== Agentic workflow completed for user {uid} ======")
             return response_data
-            
+
         except Exception as e:
             logger.error(f"응답 생성 중 오류 발생: {str(e)}")
             logger.error(f"[WORKFLOW] ====== Error in agentic workflow: {str(e)} ======")
@@ -104,4 +96,232 @@ class Agentic:
                     "uid": uid,
                     "error": str(e)
                 }
-            } 
\ No newline at end of file
+            }
+        finally:
+            if context is not None:
+                context.cancel_prefetch()
+
+    async def stream_response(self, query: str, uid: str, token: Optional[str] = None, state: Optional[str] = None, location: Optional[Dict[str, str]] = None, source_lang: Optional[str] = None) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        질의에 대한 응답을 단계별 이벤트로 스트리밍합니다. (SSE 엔드포인트용)
+
+        Yields:
+            Tuple[str, Dict[str, Any]]: (이벤트 이름, 데이터)
+            - classified    : 언어 감지 / 분류 완료
+            - agent_started : 에이전트 실행 시작
+            - token         : 최종 응답 텍스트 조각
+            - done          : 최종 응답 (get_response 와 동일한 형식)
+            - error         : 처리 중 오류
+        """
+        english_query = query
+        agentic_type = None
+        context = None
+        try:
+            logger.info(f"[WORKFLOW] ====== Starting agentic stream for user {uid} ======")
+            context = RequestContext(uid=uid, token=token, location=location)
+            self._start_prefetch(context, state)
+
+            # 1+2. 언어 감지 / 번역 / 기능 분류
+            understanding = await self._understand(query, state, source_lang)
+            source_lang = context.source_lang = understanding["source_lang"]
+            english_query = understanding["english_query"]
+            agentic_type = understanding["agentic_type"]
+            context.cancel_prefetch(keep=agent_dependencies(agentic_type))
+            yield "classified", {
+                "agentic_type": agentic_type,
+                "source_lang": source_lang,
+                "english_query": english_query,
+                "pipeline_mode": understanding["pipeline_mode"]
+            }
+
+            # 3. 응답 생성
+            yield "agent_started", {"agentic_type": agentic_type}
+
+            if agentic_type == AgentType.GENERAL and resolve_state_route(state) is None and source_lang == "en":
+                # 일반 질의 + 번역 불필요 → 생성 토큰을 그대로 전달
+                chunks = []
+                async for chunk in self.response_generator.stream_general_response(english_query):
+                    chunks.append(chunk)
+                    yield "token", {"text": chunk}
+                result = {
+                    "response": "".join(chunks),
+                    "metadata": {
+                        "query": english_query,
+                        "agentic_type": AgentType.GENERAL.value,
+                        "translated": False
+                    }
+                }
+                self._normalize_result(result)
+            else:
+                result = await self.response_generator.generate_response(query, english_query, agentic_type, state, context, sub_intent=understanding["sub_intent"])
+                self._normalize_result(result)
+
+                # 4. 후처리 (원문 언어로 번역)
+                if not self.postprocessor.should_translate(result["response"], source_lang, result.get("output_lang")):
+                    metrics.incr("postprocess.skipped")
+                    result["metadata"]["translated"] = False
+                    if isinstance(result["response"], str):
+                        yield "token", {"text": result["response"]}
+                elif isinstance(result["response"], str):
+                    # 번역 결과를 생성되는 대로 전달
+                    chunks = []
+                    async for chunk in self.postprocessor.postprocess_stream(result["response"], source_lang):
+                        chunks.append(chunk)
+                        yield "token", {"text": chunk}
+                    result["response"] = "".join(chunks)
+                    result["metadata"]["translated"] = True
+                else:
+                    # 구조화된 응답은 한 번에 전달 (done 이벤트)
+                    processed_response = await self.postprocessor.postprocess(result["response"], source_lang, "general")
+                    result["response"] = processed_response["response"]
+                    result["metadata"]["translated"] = True
+
+            # 5. 응답 데이터 구성
+            yield "done", self._build_response_data(result, understanding, uid)
+            logger.info(f"[WORKFLOW] ====== Agentic stream completed for user {uid} ======")
+
+        except Exception as e:
+            logger.error(f"[WORKFLOW] ====== Error in agentic stream: {str(e)} ======")
+            yield "error", {
+                "response": "죄송합니다. 응답을 생성하는 중에 오류가 발생했습니다.",
+                "metadata": {
+                    "query": query,
+                    "english_query": english_query,
+                    "agentic_type": agentic_type,
+                    "state": "error",
+                    "uid": uid,
+                    "error": str(e)
+                }
+            }
+        finally:
+            if context is not None:
+                context.cancel_prefetch()
+
+    def _start_prefetch(self, context: RequestContext, state: Optional[str]) -> None:
+        """
+        분류와 동시에 에이전트 입력(사용자 정보, 실시간 위치 주소) 조회를 시작합니다.
+        - state 로 라우팅되는 턴은 담당 에이전트의 입력만, 그 외에는 위치 / 날씨 / 이벤트 / 게시글 공통 입력
+        - 라우팅 후 쓰이지 않는 조회는 cancel_prefetch 로 취소
+        """
+        if not settings.DEPENDENCY_PREFETCH_ENABLED:
+            return
+        state_route = resolve_state_route(state)
+        context.prefetch(agent_dependencies(state_route) if state_route is not None else SPECULATIVE_DEPENDENCIES)
+
+    async def _understand(self, query: str, state: Optional[str], source_lang: Optional[str]) -> Dict[str, Any]:
+        """
+        언어 감지, 영어 번역, 기능 분류 단계를 수행합니다.
+
+        Returns:
+            Dict[str, Any]: source_lang, english_query, agentic_type, sub_intent, pipeline_mode, understand_time
+        """
+        pipeline_mode = settings.AGENTIC_PIPELINE_MODE
+        understand_start = time.time()
+
+        # 0. 멀티턴 진행 중인 state 는 분류 없이 state 만으로 라우팅
+        state_route = resolve_state_route(state)
+        # 분류 단계에서 함께 추출한 하위 의도 (에이전트의 후속 분류 호출 생략용)
+        sub_intent = None
+        translation_result = None
+
+        if state_route is not None:
+            logger.info(f"[WORKFLOW] Step 1+2: State routing ({state} → {state_route.value}), classification skipped")
+            agentic_type = state_route.value
+            if source_lang in LANGUAGE_CODE_MAP:
+                # 이전 턴에서 감지된 언어를 그대로 사용 (LLM 호출 생략)
+                logger.info(f"[에이전트] 이전 턴 언어 사용 - 소스 언어: {source_lang}")
+            else:
+                logger.info(f"[WORKFLOW] Step 1: Preprocessing (language detection only)")
+                source_lang = detect_query_language(query)
+                if source_lang is None:
+                    translation_result = await translate_query(query)
+                    source_lang = translation_result["lang_code"]
+                logger.info(f"[에이전트] 언어 감지 완료 - 소스 언어: {source_lang}")
+            # 이력서 / 자소서 / 잡서치는 원문을 자체적으로 한국어로 다시 작성하므로 원문 그대로 전달
+            english_query = query
+            if state_route_needs_translation(state, source_lang):
+                # 위치 카테고리 응답은 카카오 검색어로 쓰이므로 영어로 번역 (감지 단계의 번역 결과가 있으면 재사용)
+                logger.info(f"[WORKFLOW] Step 1: Translating state-routed query ({state})")
+                if translation_result is None:
+                    translation_result = await translate_query(query, lang_code=source_lang)
+                english_query = translation_result["translated_query"]
+        elif pipeline_mode == PipelineMode.FUSED:
+            detected_lang = detect_query_language(query)
+            if detected_lang == "en":
+                # 영어로 확실히 감지되면 번역 없이 분류만 수행
+                logger.info(f"[WORKFLOW] Step 1: English detected locally, translation skipped")
+                source_lang = "en"
+                english_query = query
+                logger.info(f"[WORKFLOW] Step 2: Classification")
+                classification = await self.classifier.classify_hierarchical(english_query)
+                agentic_type = classification["agent_type"]
+                sub_intent = classification["sub_intent"]
+            else:
+                # 1+2. 언어 감지 + 번역 + 기능 분류 (단일 LLM 호출)
+                logger.info(f"[WORKFLOW] Step 1+2: Fused understanding (language detection, translation and classification)")
+                understanding = await self.classifier.understand(query)
+                source_lang = detected_lang or understanding["lang_code"]
+                english_query = understanding["translated_query"]
+                agentic_type = understanding["agent_type"]
+                sub_intent = understanding["sub_intent"]
+            logger.info(f"[에이전트] 언어 감지 완료 - 소스 언어: {source_lang}, 영어 번역: {english_query}")
+        else:
+            # 1. 전처리 (언어 감지 및 번역)  > 수정 완료
+            logger.info(f"[WORKFLOW] Step 1: Preprocessing (language detection and translation)")
+            translation_result = await translate_query(query, lang_code=detect_query_language(query))
+            source_lang = translation_result["lang_code"]
+            english_query = translation_result["translated_query"]
+            logger.info(f"[에이전트] 언어 감지 완료 - 소스 언어: {source_lang}, 영어 번역: {english_query}")
+
+            # 2. 기능 분류 > 수정 완료
+            logger.info(f"[WORKFLOW] Step 2: Classification")
+            classification = await self.classifier.classify_hierarchical(english_query)
+            agentic_type = classification["agent_type"]
+            sub_intent = classification["sub_intent"]
+
+        understand_time = time.time() - understand_start
+        logger.info(f"[에이전트] 에이전틱 유형: {agentic_type}")
+        logger.info(f"[WORKFLOW] 이해 단계 완료 - 모드: {pipeline_mode.value}, 소요 시간: {understand_time:.2f}초")
+
+        return {
+            "source_lang": source_lang,
+            "english_query": english_query,
+            "agentic_type": agentic_type,
+            "sub_intent": sub_intent,
+            "pipeline_mode": "state" if state_route is not None else pipeline_mode.value,
+            "understand_time": understand_time
+        }
+
+    def _normalize_result(self, result: Dict[str, Any]) -> None:
+        """에이전트 응답의 url / state 값을 보정합니다."""
+        # result["url"] 예외처리
+        if "url" not in result or result["url"] is None:
+            result["url"] = "None"
+
+        # state 예외처리
+        if result["metadata"].get("state") in [None , "general", "calendar", "post"]:
+            result["metadata"]["state"] = "initial"
+
+    def _build_response_data(self, result: Dict[str, Any], understanding: Dict[str, Any], uid: str) -> Dict[str, Any]:
+        """API 응답 데이터를 구성합니다."""
+        logger.info(f"[WORKFLOW] 응답 데이터 구성 시작")
+        response_data = {
+            "response": result["response"],
+            "metadata": {
+                "english_query": understanding["english_query"],
+                "source_lang": understanding["source_lang"],
+                "agentic_type": understanding["agentic_type"],
+                "uid": uid,
+                "state": result.get("metadata", {}).get("state", "general"),
+                "pipeline_mode": understanding["pipeline_mode"],
+                "understand_time": round(understanding["understand_time"], 3)
+            },
+            "state": result.get("metadata", {}).get("state", "general"),
+            "url": result["url"]
+        }
+
+        # 메타데이터에 추가 정보가 있으면 병합
+        if "metadata" in result:
+            response_data["metadata"].update(result["metadata"])
+
+        return response_data
@@ -1,11 +1,6 @@
-from googleapiclient.discovery import build # Google API 클라이언트 생성 도구
-from google_auth_oauthlib.flow import InstalledAppFlow # OAuth 인증 흐름을 다루는 도구
-from google.auth.transport.requests import Request # 토큰 갱신 시 필요한 요청 객체
-from datetime import datetime #날짜 다룰 때 사용
+from datetime import datetime, timedelta #날짜 다룰 때 사용
 # 파일 저장 및 불러오기용 (토큰 저장)
 import os
-import pickle
-import requests
 import json
 import re
 from dotenv import load_dotenv
@@ -13,14 +8,19 @@ load_dotenv()  # .env 파일 자동 로딩
 from langchain_groq import ChatGroq
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, NamedTuple, Optional
 from loguru import logger
 from pathlib import Path
 from langchain_openai import ChatOpenAI
 from langchain.output_parsers import StructuredOutputParser
 from pydantic import BaseModel, Field
 from app.config.app_config import settings
-from app.core.llm_client import get_langchain_llm
+from app.core.llm_client import get_langchain_llm, get_chain, get_http_client
+from app.core.metrics import metrics
+from app.services.agentic.agentic_calendar_cache import calendar_snapshots, to_snapshot_event
+from app.services.agentic.agentic_calendar_google import SCOPES, google_calendar
+from app.services.agentic.agentic_calendar_selector import select_candidates, to_check_items
+from app.services.agentic.agentic_calendar_time import now_in_calendar_tz, parse_event_time, parse_time_window, start_of_day, strip_temporal_expressions
 
 def get_llm_client(is_lightweight=False):
     """Get the appropriate LLM client based on the lightweight flag."""
@@ -30,91 +30,136 @@ def get_llm_client(is_lightweight=False):
 CALENDAR_API_URL = os.getenv("CALENDAR_API_URL","https://api.eum-friends.com/calendar")
 if not CALENDAR_API_URL:
     raise ValueError("CALENDAR_API_URL 환경변수가 설정되지 않았습니다.")
+# 캘린더 백엔드 요청 타임아웃 (초) - 커넥션은 공유 HTTP 풀을 사용
+CALENDAR_API_TIMEOUT = int(os.getenv("CALENDAR_API_TIMEOUT", "10"))
+# Google Calendar 직접 조회 시 페이지 크기 / 기간 표현이 없을 때 조회 일수
+CALENDAR_LIST_PAGE_SIZE = int(os.getenv("CALENDAR_LIST_PAGE_SIZE", "250"))
+CALENDAR_LIST_DEFAULT_DAYS = int(os.getenv("CALENDAR_LIST_DEFAULT_DAYS", "30"))
 ###21
 ################################################ 캘린더 일정 리스트로 반환
 # 결과 출력 (선택)
-def Output_organization(formatted_events) -> str:
-    outputs = []
-    for formatted in formatted_events:
-        outputs.append("------\n" + formatted)
-    return "\n".join(outputs)
-
-def Calendar_list():
-    creds = get_credentials()
-    service = build('calendar', 'v3', credentials=creds)
-
-    # 일정 목록 가져오기
-    events_result = service.events().list(
-        calendarId='primary',
-        maxResults=2500,
-        singleEvents=True,
-        orderBy='startTime'
-    ).execute()
-    events = events_result.get('items', [])
-
-    if not events:
-        print("📭 등록된 일정이 없습니다.")
-        return
-
-
-    # 요약용 이벤트 리스트 (AI가 분석할 수 있도록 최소 정보만 포함)
-    simplified_events = [
-        {
-            "id": event["id"],
-            "summary": event.get("summary", "(제목 없음)"),
-            "start": event['start'].get('dateTime', event['start'].get('date')),
-            "end": event['end'].get('dateTime', event['end'].get('date'))
-        }
-        for event in events
-    ]
-    def format_event_pretty(event: dict) -> str:
-        return (
-            f'"id": "{event["id"]}",\n'
-            f'"summary": "{event["summary"]}",\n'
-            f'"start": "{event["start"]}",\n'
-            f'"end": "{event["end"]}"'
-        )
-    # 예시 사용법
-    events = [
-        {
-            "id": "########",
-            "summary": "점심약속",
-            "start": "2025-04-22T12:30:00+09:00",
-            "end": "2025-04-22T14:00:00+09:00"
-        }
-    ]
+def Output_organization(events) -> str:
+    return "\n".join("------\n" + format_event_pretty(event) for event in events)
 
-    # 포맷된 문자열을 저장할 리스트
-    formatted_events = [format_event_pretty(event) for event in simplified_events]
+class CalendarEvent(NamedTuple):
+    """Google Calendar 일정 요약 (AI 분석용 최소 정보)"""
+    id: str
+    summary: str
+    start: str
+    end: str
+
+
+def format_event_pretty(event: CalendarEvent) -> str:
+    return (
+        f'"id": "{event.id}",\n'
+        f'"summary": "{event.summary}",\n'
+        f'"start": "{event.start}",\n'
+        f'"end": "{event.end}"'
+    )
+
+
+def calendar_service():
+    """Google Calendar API service 객체를 반환합니다. (한 번 만든 객체 재사용)"""
+    return google_calendar.service()
 
-    
 
-    return formatted_events
+def iter_calendar_events(time_min: Optional[datetime] = None, time_max: Optional[datetime] = None, page_size: int = CALENDAR_LIST_PAGE_SIZE) -> Iterator[CalendarEvent]:
+    """
+    기간 내 일정을 pageToken 으로 한 페이지씩 읽으며 반환합니다. (필요한 만큼만 요청)
+
+    Args:
+        time_min: 조회 시작 시각 (포함)
+        time_max: 조회 종료 시각 (미포함)
+        page_size: 페이지당 일정 수
+    """
+    service = calendar_service()
+    params = {
+        "calendarId": "primary",
+        "maxResults": page_size,
+        "singleEvents": True,
+        "orderBy": "startTime",
+        # 필요한 필드만 응답받음
+        "fields": "nextPageToken,items(id,summary,start,end)"
+    }
+    if time_min is not None:
+        params["timeMin"] = time_min.isoformat()
+    if time_max is not None:
+        params["timeMax"] = time_max.isoformat()
+
+    while True:
+        events_result = service.events().list(**params).execute()
+        for event in events_result.get('items', []):
+            yield CalendarEvent(
+                id=event["id"],
+                summary=event.get("summary", "(제목 없음)"),
+                start=event['start'].get('dateTime', event['start'].get('date')),
+                end=event['end'].get('dateTime', event['end'].get('date'))
+            )
+        params["pageToken"] = events_result.get("nextPageToken")
+        if not params["pageToken"]:
+            return
+
+
+def Calendar_list(user_input: Optional[str] = None, now: Optional[datetime] = None) -> Iterator[CalendarEvent]:
+    """
+    요청 기간의 일정을 반환합니다. (제너레이터)
+    기간 표현이 없으면 오늘부터 CALENDAR_LIST_DEFAULT_DAYS 일 동안의 일정
+    """
+    window = parse_time_window(user_input, now) if user_input else None
+    if window is None:
+        today = start_of_day(now_in_calendar_tz(now))
+        window = (today, today + timedelta(days=CALENDAR_LIST_DEFAULT_DAYS))
+    return iter_calendar_events(*window)
 
 ################################################ 캘린더 일정 리스트로 반환
 
 ################################################ 구글 켈린더 일정 확인
-def schedule(token):
+async def schedule(token):
+    """사용자 일정 목록을 반환합니다. (스냅샷 캐시 우선, 만료 시 조건부 갱신)"""
     try:
         logger.info("[구글 켈린더 일정 확인]")
-        url = f"{CALENDAR_API_URL}"
-        access_token = token
-
-        headers = {
-            "Authorization": f"{access_token}",  # ✅ Bearer 꼭 포함
-            "Content-Type": "application/json"
-        }
-
-        response = requests.get(url, headers=headers)
+        cached_events = calendar_snapshots.get(token)
+        if cached_events is not None:
+            logger.info("[캘린더 스냅샷] 캐시된 일정 사용")
+            return cached_events
+
+        async with calendar_snapshots.lock(token):
+            # 같은 사용자의 다른 요청이 먼저 갱신했으면 그 결과 사용
+            cached_events = calendar_snapshots.get(token, record=False)
+            if cached_events is not None:
+                return cached_events
+
+            url = f"{CALENDAR_API_URL}"
+            access_token = token
+
+            headers = {
+                "Authorization": f"{access_token}",  # ✅ Bearer 꼭 포함
+                "Content-Type": "application/json",
+                **calendar_snapshots.conditional_headers(token)
+            }
 
-        if response.status_code == 200:
-            print("✅ 일정 가져오기 성공")
-            response = response.json()
-            return response
-        else:
-            print(f"❌ 요청 실패: {response.status_code}")
-            print("💬 응답 내용:", response.text)
-            return response.status_code
+            response = await get_http_client(CALENDAR_API_URL).get(url, headers=headers, timeout=CALENDAR_API_TIMEOUT)
+
+            if response.status_code == 304:
+                cached_events = calendar_snapshots.not_modified(token)
+                if cached_events is not None:
+                    print("✅ 일정 변경 없음 (스냅샷 재사용)")
+                    return cached_events
+
+            if response.status_code == 200:
+                print("✅ 일정 가져오기 성공")
+                events = response.json()
+                calendar_snapshots.put(
+                    token,
+                    events,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified")
+                )
+                return events
+            else:
+                print(f"❌ 요청 실패: {response.status_code}")
+                print("💬 응답 내용:", response.text)
+                return response.status_code
 
     except Exception as e:
         print("❌ 일정 조회 중 오류 발생:", e)
@@ -153,119 +198,101 @@ def calendar_events(events):
 ################################################ 구글 켈린더 일정 확인
 
 ################################################ 구글 켈린더 엑세스
-# 인증 범위 지정
-SCOPES = ['https://www.googleapis.com/auth/calendar']
-
-# 사용자 인증 + access_token 관리
+# 사용자 인증 + access_token 관리 (메모리 캐시, 만료 전 백그라운드 갱신)
 def get_credentials():
-    creds = None
-    if os.path.exists('token.pickle'):
-        with open('token.pickle','rb') as token : 
-            creds = pickle.load(token)
-            print("[사용자 인증 + access_token 관리] " , creds)
-
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(
-                'client_secret.json', SCOPES )
-            creds = flow.run_local_server(port=8080)
-
-        # 새 토큰 저장
-        with open('token.pickle', 'wb') as token:
-            pickle.dump(creds, token)
-
-    return creds  # ✅ 함수 끝에서 항상 반환
+    return google_calendar.credentials()
 ################################################ 구글 켈린더 엑세스
 
 ################################################ user input 분류
-def Input_analysis(user_input):
+async def Input_analysis(user_input):
     
-    llm = get_llm_client(is_lightweight=False)  # 고성능 모델 사용
-
-    parser = JsonOutputParser(pydantic_object={
-        "type": "object",
-        "properties": {
-            "input": {"type": "string"},
-            "output": {"type": "string"},
-        }
-    })
-    prompt = ChatPromptTemplate.from_messages([
-    ("system", """You're a scheduling assistant.
-
-    Classify the user's sentence into one of the following three categories:
-    - Add (new schedule)
-    - Delete (remove schedule)
-    - Edit (modify schedule)
-    - Check (Check schedule)
-
-    Return the result as JSON like:
-    {{
-    "input": "...",
-    "output": "add"  // or "delete" or "edit"
-    }}
-
-    Examples:
-    # ✅ ADD
-    {{"input": "오늘 오후에 영화 보자", "output": "add"}},
-    {{"input": "5월 3일에 생일 파티 일정 추가해줘", "output": "add"}},
-    {{"input": "이번 주 금요일에 미용실 예약 좀 넣어줘", "output": "add"}},
-    {{"input": "4월 20일에 친구랑 저녁 약속 있어", "output": "add"}},
-    {{"input": "내일 오전 9시에 회의 있어", "output": "add"}},
-    {{"input": "주말에 등산 일정 잡아줘", "output": "add"}},
-    {{"input": "다음주 화요일에 프로젝트 발표 있어", "output": "add"}},
-    {{"input": "오늘 밤에 헬스장 갈 거야", "output": "add"}},
-    {{"input": "7시에 엄마랑 전화하기 일정 넣어줘", "output": "add"}},
-
-    # ✅ DELETE
-    {{"input": "오늘 저녁 약속 취소해줘", "output": "delete"}},
-    {{"input": "5시 회의 일정 없애줘", "output": "delete"}},
-    {{"input": "내일 생일 파티 취소됐어", "output": "delete"}},
-    {{"input": "친구 만나는 일정 지워줘", "output": "delete"}},
-    {{"input": "방금 넣은 일정 삭제해줘", "output": "delete"}},
-    {{"input": "이번 주말 일정 취소할래", "output": "delete"}},
-    {{"input": "3시에 예약한 거 없애줘", "output": "delete"}},
-    {{"input": "다음주 월요일 약속 취소해줘", "output": "delete"}},
-    {{"input": "쇼핑 일정 삭제해줘", "output": "delete"}},
-    {{"input": "헬스장 안 가기로 했어", "output": "delete"}},
-
-    # ✅ EDIT
-    {{"input": "내일 회의 시간 바꿔줘", "output": "edit"}},
-    {{"input": "오늘 약속 3시로 변경해줘", "output": "edit"}},
-    {{"input": "저녁 6시 약속 7시로 옮겨줘", "output": "edit"}},
-    {{"input": "생일 파티 장소 바뀌었어", "output": "edit"}},
-    {{"input": "오후 회의 Zoom 링크로 수정해줘", "output": "edit"}},
-    {{"input": "영화 시간 2시로 바꿔줘", "output": "edit"}},
-    {{"input": "점심 시간 다시 조정해줘", "output": "edit"}},
-    {{"input": "오늘 일정 제목 바꿔줘", "output": "edit"}},
-    {{"input": "내일 약속 위치 바뀜", "output": "edit"}},
-    {{"input": "저녁 약속 시간 변경해줘", "output": "edit"}}
+    def build_chain():
+        llm = get_llm_client(is_lightweight=False)  # 고성능 모델 사용
+
+        parser = JsonOutputParser(pydantic_object={
+            "type": "object",
+            "properties": {
+                "input": {"type": "string"},
+                "output": {"type": "string"},
+            }
+        })
+        prompt = ChatPromptTemplate.from_messages([
+        ("system", """You're a scheduling assistant.
+
+        Classify the user's sentence into one of the following three categories:
+        - Add (new schedule)
+        - Delete (remove schedule)
+        - Edit (modify schedule)
+        - Check (Check schedule)
+
+        Return the result as JSON like:
+        {{
+        "input": "...",
+        "output": "add"  // or "delete" or "edit"
+        }}
+
+        Examples:
+        # ✅ ADD
+        {{"input": "오늘 오후에 영화 보자", "output": "add"}},
+        {{"input": "5월 3일에 생일 파티 일정 추가해줘", "output": "add"}},
+        {{"input": "이번 주 금요일에 미용실 예약 좀 넣어줘", "output": "add"}},
+        {{"input": "4월 20일에 친구랑 저녁 약속 있어", "output": "add"}},
+        {{"input": "내일 오전 9시에 회의 있어", "output": "add"}},
+        {{"input": "주말에 등산 일정 잡아줘", "output": "add"}},
+        {{"input": "다음주 화요일에 프로젝트 발표 있어", "output": "add"}},
+        {{"input": "오늘 밤에 헬스장 갈 거야", "output": "add"}},
+        {{"input": "7시에 엄마랑 전화하기 일정 넣어줘", "output": "add"}},
+
+        # ✅ DELETE
+        {{"input": "오늘 저녁 약속 취소해줘", "output": "delete"}},
+        {{"input": "5시 회의 일정 없애줘", "output": "delete"}},
+        {{"input": "내일 생일 파티 취소됐어", "output": "delete"}},
+        {{"input": "친구 만나는 일정 지워줘", "output": "delete"}},
+        {{"input": "방금 넣은 일정 삭제해줘", "output": "delete"}},
+        {{"input": "이번 주말 일정 취소할래", "output": "delete"}},
+        {{"input": "3시에 예약한 거 없애줘", "output": "delete"}},
+        {{"input": "다음주 월요일 약속 취소해줘", "output": "delete"}},
+        {{"input": "쇼핑 일정 삭제해줘", "output": "delete"}},
+        {{"input": "헬스장 안 가기로 했어", "output": "delete"}},
+
+        # ✅ EDIT
+        {{"input": "내일 회의 시간 바꿔줘", "output": "edit"}},
+        {{"input": "오늘 약속 3시로 변경해줘", "output": "edit"}},
+        {{"input": "저녁 6시 약속 7시로 옮겨줘", "output": "edit"}},
+        {{"input": "생일 파티 장소 바뀌었어", "output": "edit"}},
+        {{"input": "오후 회의 Zoom 링크로 수정해줘", "output": "edit"}},
+        {{"input": "영화 시간 2시로 바꿔줘", "output": "edit"}},
+        {{"input": "점심 시간 다시 조정해줘", "output": "edit"}},
+        {{"input": "오늘 일정 제목 바꿔줘", "output": "edit"}},
+        {{"input": "내일 약속 위치 바뀜", "output": "edit"}},
+        {{"input": "저녁 약속 시간 변경해줘", "output": "edit"}}
      
-    # ✅ CHECK
-    {{"input": "이번 주 내 일정 알려줘", "output": "check"}},
-    {{"input": "내일 일정 확인해줘", "output": "check"}},
-    {{"input": "5월 3일에 무슨 일정 있었지?", "output": "check"}},
-    {{"input": "다음주 금요일 스케줄 알려줘", "output": "check"}},
-    {{"input": "내가 이번 달에 뭐 있지?", "output": "check"}},
-    {{"input": "오늘 약속 뭐 있나?", "output": "check"}},
-    {{"input": "이번 주말에 일정 있어?", "output": "check"}},
-    {{"input": "다음주 일정 좀 볼 수 있을까?", "output": "check"}},
-    {{"input": "지금 예정된 일정이 뭐야?", "output": "check"}},
-    {{"input": "남은 이번 달 스케줄 보여줘", "output": "check"}}
-    """),
-        ("user", "{input}")
-    ])
-
-    chain = prompt | llm | parser
-
-    def parse_product(description: str) -> dict:
-        result = chain.invoke({"input": description})
+        # ✅ CHECK
+        {{"input": "이번 주 내 일정 알려줘", "output": "check"}},
+        {{"input": "내일 일정 확인해줘", "output": "check"}},
+        {{"input": "5월 3일에 무슨 일정 있었지?", "output": "check"}},
+        {{"input": "다음주 금요일 스케줄 알려줘", "output": "check"}},
+        {{"input": "내가 이번 달에 뭐 있지?", "output": "check"}},
+        {{"input": "오늘 약속 뭐 있나?", "output": "check"}},
+        {{"input": "이번 주말에 일정 있어?", "output": "check"}},
+        {{"input": "다음주 일정 좀 볼 수 있을까?", "output": "check"}},
+        {{"input": "지금 예정된 일정이 뭐야?", "output": "check"}},
+        {{"input": "남은 이번 달 스케줄 보여줘", "output": "check"}}
+        """),
+            ("user", "{input}")
+        ])
+
+        return prompt | llm | parser
+
+    chain = get_chain("calendar.input_analysis", build_chain)
+
+    async def parse_product(description: str) -> dict:
+        result = await chain.ainvoke({"input": description})
 
         return json.dumps(result, indent=2)
         
     description = f"user_input:{user_input}"
-    response = parse_product(description)
+    response = await parse_product(description)
     response = json.loads(response)  # 문자열 → 딕셔너리
 
     print("[Input_analysis] :  ",response["output"])
@@ -276,61 +303,124 @@ def Input_analysis(user_input):
 
 ################################################ 일정 추가
 
-def MakeSchedule(user_input):
+# 일정 추가 요청의 앞뒤 요청 표현 (일정 제목에서 제거)
+_ADD_REQUEST_ENDING = re.compile(
+    r"\s*(?:일정|스케줄)?\s*(?:좀\s*)?(?:추가해\s*줘|추가|넣어\s*줘|잡아\s*줘|등록해\s*줘|만들어\s*줘|있어|있음|갈\s*거야|할\s*거야|하기로\s*했어|보자|하자)?\s*[.!?~]*$"
+    r"|\s+(?:to|on|in)\s+(?:my\s+)?(?:calendar|schedule)\s*[.!?]*$",
+    re.IGNORECASE
+)
+_ADD_REQUEST_PREFIX = re.compile(r"^(?:please\s+)?(?:add|schedule|create|put|set up|book|remind me to)\s+(?:an?\s+|the\s+)?", re.IGNORECASE)
+_LOCATION = re.compile(r"(\S+)에서\s*")
 
-    llm = get_llm_client(is_lightweight=False)  # 고성능 모델 사용
 
-    parser = JsonOutputParser(pydantic_object={
-        "type": "object",
-        "properties": {
-            "summary": {"type": "string"},
-            "location": {"type": "string"},
-            "description": { "type": "string"},
-            "startDateTime":{ "type": "string"},
-            "endDateTime":{ "type": "string"}
-        }
-    })
-    system_prompt = f"""
-    0. today's date : {datetime.now()}
-    1. This is an example of a one-shot. 
+def rule_based_schedule(user_input: str, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+    """
+    날짜/시각 표현을 규칙 기반으로 해석해 일정 JSON 을 만듭니다. (MakeSchedule 과 같은 형식)
+
+    Returns:
+        Optional[Dict[str, Any]]: 일정 정보. 시각이나 제목을 확실히 알 수 없으면 None (LLM 으로 처리)
+    """
+    window = parse_event_time(user_input, now)
+    if window is None:
+        return None
+
+    rest = strip_temporal_expressions(user_input)
+    location = ""
+    match = _LOCATION.search(rest)
+    if match:
+        location = match.group(1)
+        rest = rest[:match.start()] + rest[match.end():]
+
+    summary = _ADD_REQUEST_PREFIX.sub("", _ADD_REQUEST_ENDING.sub("", rest)).strip(" ,.!?~")
+    if not summary:
+        return None
+
+    start, end = window
+    return {
+        "summary": summary,
+        "location": location,
+        "description": user_input,
+        "startDateTime": start.isoformat(),
+        "endDateTime": end.isoformat()
+    }
+
+
+async def MakeSchedule(user_input, original_input: Optional[str] = None):
+    """
+    일정 정보를 만듭니다.
+
+    Args:
+        user_input: (영어로 번역된) 사용자 요청
+        original_input: 번역 전 사용자 원문 (규칙 기반 해석은 원문 우선)
+    """
+    # 날짜/시각이 명확한 요청은 LLM 없이 바로 일정 생성 (한국어 규칙이 적용되도록 원문 먼저 확인)
+    rule_event = None
+    for text in dict.fromkeys(filter(None, (original_input, user_input))):
+        rule_event = rule_based_schedule(text)
+        if rule_event is not None:
+            break
+    if rule_event is not None:
+        metrics.incr("calendar.make_schedule.rule_based")
+        print("[ADD_CALENDAR_output] ",rule_event)
+        return rule_event
+    metrics.incr("calendar.make_schedule.llm_fallback")
+
+    def build_chain():
+        llm = get_llm_client(is_lightweight=False)  # 고성능 모델 사용
+
+        parser = JsonOutputParser(pydantic_object={
+            "type": "object",
+            "properties": {
+                "summary": {"type": "string"},
+                "location": {"type": "string"},
+                "description": { "type": "string"},
+                "startDateTime":{ "type": "string"},
+                "endDateTime":{ "type": "string"}
+            }
+        })
+        system_prompt = """
+        0. today's date : {today}
+        1. This is an example of a one-shot. 
     
-    "summary": "f< requested by user >",
-    "location": "< Places mentioned by users >",
-    "description": "< What users said >",
-    "startDateTime": "2025-05-02T10:00:00+09:00",
-    "endDateTime": "2025-05-02T11:00:00+09:00",
+        "summary": "f< requested by user >",
+        "location": "< Places mentioned by users >",
+        "description": "< What users said >",
+        "startDateTime": "2025-05-02T10:00:00+09:00",
+        "endDateTime": "2025-05-02T11:00:00+09:00",
     
-    ...
-    ⚠️ Do NOT include any explanation or message. ONLY return a valid JSON object. No natural language.
+        ...
+        ⚠️ Do NOT include any explanation or message. ONLY return a valid JSON object. No natural language.
 
-    """
+        """
 
-    prompt=system_prompt
-    logger.info("[ADD_CALENDAR_system_prompt] ",prompt)
+        prompt=system_prompt
+        logger.info("[ADD_CALENDAR_system_prompt] ",prompt)
 
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", prompt),
-        ("user", "{input}")
-    ])
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", prompt),
+            ("user", "{input}")
+        ])
 
-    chain = prompt | llm | parser
+        return prompt | llm | parser
 
-    def parse_product(description: str) -> dict:
-        result = chain.invoke({"input": description})
+    chain = get_chain("calendar.make_schedule", build_chain)
+
+    async def parse_product(description: str) -> dict:
+        result = await chain.ainvoke({"input": description, "today": datetime.now()})
         print("[USER INPUT] : ",description)
         print(json.dumps(result, indent=2, ensure_ascii=False))
         return result
 
     description = user_input
 
-    response = parse_product(description)
+    response = await parse_product(description)
     print("[ADD_CALENDAR_output] ",response)
 
     return response
 
 # 실제 이벤트 등록 함수
 # 위에서 얻은 인증 정보로 API를 사용할 수 있는 service 객체 생성
-def add_event(make_event , token):
+async def add_event(make_event , token):
     try:
         print("[TOKEN] ",token)
         url = f"{CALENDAR_API_URL}"
@@ -343,11 +433,14 @@ def add_event(make_event , token):
         print("\n📤 보내는 이벤트 JSON:")
         print(json.dumps(make_event, indent=4, ensure_ascii=False))
 
-        response = requests.post(url, headers=headers, data=json.dumps(make_event))
+        response = await get_http_client(CALENDAR_API_URL).post(url, headers=headers, content=json.dumps(make_event), timeout=CALENDAR_API_TIMEOUT)
 
         if response.status_code == 200:
             print("✅ 일정이 성공적으로 추가되었습니다.")
-            print("🔗 응답:", response.json())
+            created = response.json()
+            print("🔗 응답:", created)
+            created_id = created.get("id") if isinstance(created, dict) else None
+            calendar_snapshots.apply_add(token, to_snapshot_event(created_id, make_event) if created_id else {})
             return make_event
         else:
             print(f"❌ 요청 실패: {response.status_code}")
@@ -405,77 +498,82 @@ delete_set = [
 ]
 
 
-def delete_event(user_input,token):
+async def delete_event(user_input,token):
 
-    formatted_events = schedule(token)
-    schedule_list=calendar_events(formatted_events)
+    formatted_events = await schedule(token)
+    # 요청 기간 / 제목 유사도로 추린 후보 일정만 LLM 에 전달
+    selection = select_candidates(formatted_events, user_input)
+    schedule_list=calendar_events(selection["candidates"])
 
-    llm = get_llm_client(is_lightweight=False)  # 고성능 모델 사용
+    def build_chain():
+        llm = get_llm_client(is_lightweight=False)  # 고성능 모델 사용
 
-    parser = JsonOutputParser(pydantic_object={
-        "type": "object",
-        "properties": {
-            "id": {"type": "string"}
-        }
-    })
+        parser = JsonOutputParser(pydantic_object={
+            "type": "object",
+            "properties": {
+                "id": {"type": "string"}
+            }
+        })
 
     
-    # 프롬프트 문자열 구성
-    system_prompt_template = f"""
-    [ROLE]
-    You are an AI that deletes one event from a user's schedule according to their request.
-
-    [Today's Date]  
-    {datetime.now()}
-
-    [User Request]  
-    The user asked to delete an existing event from their calendar.
-
-    [Schedule List]  
-    Below is the list of events retrieved from the calendar:  
-    @@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@  
-    {schedule_list}  
-    @@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
-
-    [INSTRUCTION]  
-    1. Identify which event the user wants to delete by matching the appropriate `"id"` from the list.  
-    2. Return only the `"id"` of the selected event to be deleted.
-
-    [Output Format]  
-    Return the result in the following JSON format:
-
-    ```json
-    "id": "<id of the event to delete>"
-    "summary": "<title of the event>",
-    "description": "<description of the event>",
-    "startDateTime": "<start time in ISO 8601 format>",
-    "endDateTime": "<end time in ISO 8601 format>"
-
-    ⚠️ Do NOT include any explanation or message. ONLY return a valid JSON object. No natural language.
-    """
+        # 프롬프트 문자열 구성
+        system_prompt_template = """
+        [ROLE]
+        You are an AI that deletes one event from a user's schedule according to their request.
+
+        [Today's Date]  
+        {today}
+
+        [User Request]  
+        The user asked to delete an existing event from their calendar.
+
+        [Schedule List]  
+        Below is the list of events retrieved from the calendar:  
+        @@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@  
+        {schedule_list}  
+        @@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
+
+        [INSTRUCTION]  
+        1. Identify which event the user wants to delete by matching the appropriate `"id"` from the list.  
+        2. Return only the `"id"` of the selected event to be deleted.
+
+        [Output Format]  
+        Return the result in the following JSON format:
+
+        ```json
+        "id": "<id of the event to delete>"
+        "summary": "<title of the event>",
+        "description": "<description of the event>",
+        "startDateTime": "<start time in ISO 8601 format>",
+        "endDateTime": "<end time in ISO 8601 format>"
+
+        ⚠️ Do NOT include any explanation or message. ONLY return a valid JSON object. No natural language.
+        """
     
-    print("[DELETE_CALENDAR_system_prompt] ",system_prompt_template)
+        print("[DELETE_CALENDAR_system_prompt] ",system_prompt_template)
+
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", system_prompt_template ),
+            ("user", "{input}")
+        ])
 
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", system_prompt_template ),
-        ("user", "{input}")
-    ])
+        return prompt | llm | parser
 
-    chain = prompt | llm | parser
+    chain = get_chain("calendar.delete_event", build_chain)
 
-    def parse_product(description: str) -> dict:
-        result = chain.invoke({"input": description})
+    async def parse_product(description: str) -> dict:
+        result = await chain.ainvoke({"input": description, "today": datetime.now(), "schedule_list": schedule_list})
         
         return json.dumps(result, indent=2)
 
     description = user_input
 
-    response = parse_product(description)
+    response = await parse_product(description)
     print("[DELETE_CALENDAR_output] :",response)
 
     return response
 
-def calendar_delete_api(delete_id,token):
+async def calendar_delete_api(delete_id,token):
     
     delete_id=json.loads(delete_id)
     schedule_id = delete_id.get("id")
@@ -493,11 +591,12 @@ def calendar_delete_api(delete_id,token):
             "Content-Type": "application/json"
         }
 
-        response = requests.delete(url, headers=headers, data="")
+        response = await get_http_client(CALENDAR_API_URL).delete(url, headers=headers, timeout=CALENDAR_API_TIMEOUT)
 
         if response.status_code == 200:
             print("✅ 일정이 성공적으로 수정되었습니다.")
             print("🔗 응답:", response.json())
+            calendar_snapshots.apply_delete(token, schedule_id)
             return delete_id
         else:
             print(f"❌ 요청 실패: {response.status_code}")
@@ -512,85 +611,90 @@ def calendar_delete_api(delete_id,token):
 ################################################ 일정 삭제
 
 ################################################ 일정 수정
-def edit_event(user_input,token):
+async def edit_event(user_input,token):
 
     logger.info("[user_input]",user_input)
 
-    formatted_events = schedule(token)
-    schedule_list=calendar_events(formatted_events)
+    formatted_events = await schedule(token)
+    # 요청 기간 / 제목 유사도로 추린 후보 일정만 LLM 에 전달
+    selection = select_candidates(formatted_events, user_input)
+    schedule_list=calendar_events(selection["candidates"])
     
-    llm = get_llm_client(is_lightweight=False)  # 고성능 모델 사용
-
-    parser = JsonOutputParser(pydantic_object={
-        "type": "object",
-        "properties": {
-            "id": {"type": "string"},
-            "summary": {"type": "string"},
-            "start": {"type": "string"},
-            "end" : {"type": "string"}
-        }
-    })
-
-    # 프롬프트 문자열 구성
-    system_prompt_template = f"""
-    [Role]
-    You are an AI that modifies one event from a schedule list according to user input.
-
-    [Today's Date]  
-    {datetime.now()}
-
-    [User Request]  
-    The user has asked to change an existing event in their schedule.
-
-    [Schedule List]  
-    Below is the list of events retrieved from the calendar:  
-    ##############################################################################################################
-    {schedule_list}
-    ##############################################################################################################
-
-    [INSTRUCTION]  
-    1. Based on the user input, select the appropriate schedule item by its `"id"`.  
-    2. Modify its fields as requested by the user:  
-    - Change `summary`, `location`, `description`, `startDateTime`, or `endDateTime` if specified.
-    - Keep `description` non-empty — never leave it blank.
-
-    3. Return only the updated item in the following JSON format:
-
-    ```json
-    "id": "<id from the selected schedule>",
-    "summary": "<summary from user input>",
-    "location": "<location from user input>",
-    "description": "<description from user input, must not be empty>",
-    "startDateTime": "<ISO 8601 format start time>",
-    "endDateTime": "<ISO 8601 format end time>"
+    def build_chain():
+        llm = get_llm_client(is_lightweight=False)  # 고성능 모델 사용
+
+        parser = JsonOutputParser(pydantic_object={
+            "type": "object",
+            "properties": {
+                "id": {"type": "string"},
+                "summary": {"type": "string"},
+                "start": {"type": "string"},
+                "end" : {"type": "string"}
+            }
+        })
+
+        # 프롬프트 문자열 구성
+        system_prompt_template = """
+        [Role]
+        You are an AI that modifies one event from a schedule list according to user input.
+
+        [Today's Date]  
+        {today}
+
+        [User Request]  
+        The user has asked to change an existing event in their schedule.
+
+        [Schedule List]  
+        Below is the list of events retrieved from the calendar:  
+        ##############################################################################################################
+        {schedule_list}
+        ##############################################################################################################
+
+        [INSTRUCTION]  
+        1. Based on the user input, select the appropriate schedule item by its `"id"`.  
+        2. Modify its fields as requested by the user:  
+        - Change `summary`, `location`, `description`, `startDateTime`, or `endDateTime` if specified.
+        - Keep `description` non-empty — never leave it blank.
+
+        3. Return only the updated item in the following JSON format:
+
+        ```json
+        "id": "<id from the selected schedule>",
+        "summary": "<summary from user input>",
+        "location": "<location from user input>",
+        "description": "<description from user input, must not be empty>",
+        "startDateTime": "<ISO 8601 format start time>",
+        "endDateTime": "<ISO 8601 format end time>"
     
-    ⚠️ Do NOT include any explanation or message. ONLY return a valid JSON object. No natural language.
-    """
+        ⚠️ Do NOT include any explanation or message. ONLY return a valid JSON object. No natural language.
+        """
     
-    print("[EDIT_CALENDAR_system_prompt] ",system_prompt_template)
+        print("[EDIT_CALENDAR_system_prompt] ",system_prompt_template)
+
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", system_prompt_template ),
+            ("user", "{input}")
+        ])
 
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", system_prompt_template ),
-        ("user", "{input}")
-    ])
+        return prompt | llm | parser
 
-    chain = prompt | llm | parser
+    chain = get_chain("calendar.edit_event", build_chain)
 
-    def parse_product(description: str) -> dict:
-        result = chain.invoke({"input": description})
+    async def parse_product(description: str) -> dict:
+        result = await chain.ainvoke({"input": description, "today": datetime.now(), "schedule_list": schedule_list})
 
         return json.dumps(result, indent=2, ensure_ascii=False)
 
     description = user_input
 
-    response = parse_product(description)
+    response = await parse_product(description)
 
     print("[EDIT_CALENDAR_output] :",response)
    
     return response
 
 
-def calendar_edit_api(response,token):
+async def calendar_edit_api(response,token):
     response_dict = json.loads(response)
     event_id = response_dict["id"]
     print(f"[event_id] : {event_id}")
@@ -616,11 +720,12 @@ def calendar_edit_api(response,token):
         }
 
         print("\n📤 보내는 이벤트 JSON:")
-        response = requests.patch(url, headers=headers, data=response)
+        response = await get_http_client(CALENDAR_API_URL).patch(url, headers=headers, content=response, timeout=CALENDAR_API_TIMEOUT)
 
         if response.status_code == 200:
             print("✅ 일정이 성공적으로 수정되었습니다.")
             print("🔗 응답:", response.json())
+            calendar_snapshots.apply_edit(token, event_id, response_dict)
             return response_dict
         else:
             print(f"❌ 요청 실패: {response.status_code}")
@@ -634,75 +739,86 @@ def calendar_edit_api(response,token):
 ################################################ 일정 수정
 
 ################################################ 일정 확인
-def check_event(user_input,token):
+async def check_event(user_input,token):
 
-    formatted_events = schedule(token)
+    formatted_events = await schedule(token)
     if formatted_events == 500 : 
         return formatted_events
 
-    schedule_list=calendar_events(formatted_events)
-    
-    llm = get_llm_client(is_lightweight=False)  # 고성능 모델 사용
+    selection = select_candidates(formatted_events, user_input)
+    if selection["window"] is not None:
+        # 기간 조회는 LLM 없이 기간 내 일정을 바로 반환
+        metrics.incr("calendar.check.direct")
+        response = json.dumps(to_check_items(selection["in_window"]), indent=2, ensure_ascii=False)
+        print("[CHECK_CALENDAR_output] :",response)
+        return response
 
-    parser = JsonOutputParser(pydantic_object={
-        "type": "object",
-        "properties": {
-            "input": {"type": "string"},
-            "output": {"type": "string"},
-        }
-    })
+    schedule_list=calendar_events(selection["candidates"])
+    
+    def build_chain():
+        llm = get_llm_client(is_lightweight=False)  # 고성능 모델 사용
+
+        parser = JsonOutputParser(pydantic_object={
+            "type": "object",
+            "properties": {
+                "input": {"type": "string"},
+                "output": {"type": "string"},
+            }
+        })
 
     
-    # 프롬프트 문자열 구성
-    system_prompt_template = f"""
-    You are an AI that summarizes and reformats schedule data retrieved from Google Calendar.
+        # 프롬프트 문자열 구성
+        system_prompt_template = """
+        You are an AI that summarizes and reformats schedule data retrieved from Google Calendar.
 
-    [Today's Date]  
-    {datetime.now()}
+        [Today's Date]  
+        {today}
 
-    [Schedule List]  
-    Below is the raw schedule data from Google Calendar:  
-    {schedule_list}
+        [Schedule List]  
+        Below is the raw schedule data from Google Calendar:  
+        {schedule_list}
 
-    [Your Task]  
-    Extract the relevant schedule items and reformat them into a valid JSON array.
+        [Your Task]  
+        Extract the relevant schedule items and reformat them into a valid JSON array.
 
-    Each item should have the following structure:
+        Each item should have the following structure:
 
-    ```json
+        ```json
     
-    "summary": "Event title",
-    "description": "Event description (if available)",
-    "start": 
-        "dateTime": "Start time in ISO format",
-        "timeZone": "Time zone"
-    ,
-    "end": 
-        "dateTime": "End time in ISO format",
-        "timeZone": "Time zone"
+        "summary": "Event title",
+        "description": "Event description (if available)",
+        "start": 
+            "dateTime": "Start time in ISO format",
+            "timeZone": "Time zone"
+        ,
+        "end": 
+            "dateTime": "End time in ISO format",
+            "timeZone": "Time zone"
     
     
 
-    ⚠️ Do NOT include any explanation or message. ONLY return a valid JSON object. No natural language.
-    """
+        ⚠️ Do NOT include any explanation or message. ONLY return a valid JSON object. No natural language.
+        """
     
-    print("[CHECK_CALENDAR_system_prompt] ",system_prompt_template)
+        print("[CHECK_CALENDAR_system_prompt] ",system_prompt_template)
+
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", system_prompt_template ),
+            ("user", "{input}")
+        ])
 
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", system_prompt_template ),
-        ("user", "{input}")
-    ])
+        return prompt | llm | parser
 
-    chain = prompt | llm | parser
+    chain = get_chain("calendar.check_event", build_chain)
 
-    def parse_product(description: str) -> dict:
-        result = chain.invoke({"input": description})
+    async def parse_product(description: str) -> dict:
+        result = await chain.ainvoke({"input": description, "today": datetime.now(), "schedule_list": schedule_list})
         
         return json.dumps(result, indent=2, ensure_ascii=False)
 
     description = user_input
 
-    response = parse_product(description)
+    response = await parse_product(description)
     print("[CHECK_CALENDAR_output] :",response)
 
 
@@ -713,17 +829,24 @@ class AgenticCalendar:
     def __init__(self):
         pass  # 필요한 초기화가 있다면 여기에
 
-    def Calendar_function(self, query: str, token: str) -> Dict[str, Any]:
-
-        logger.info("[CATEGORY CLASSIFICATION 초기화]")
-        classification = Input_analysis(query)
+    async def Calendar_function(self, query: str, token: str, classification: Optional[str] = None, original_query: Optional[str] = None) -> Dict[str, Any]:
+        """
+        캘린더 요청을 처리합니다.
+
+        Args:
+            classification: 분류 단계에서 이미 판단한 동작 (add / delete / edit / check, 없으면 Input_analysis 로 분류)
+            original_query: 번역 전 사용자 원문 (일정 추가 시 규칙 기반 해석에 사용)
+        """
+        if classification is None:
+            logger.info("[CATEGORY CLASSIFICATION 초기화]")
+            classification = await Input_analysis(query)
         logger.info("[CALENDAR_CATEGORY] ",classification)
         
         if classification == "add" :
             print("일정 추가")        
-            make_event = MakeSchedule(query) ## 이벤트 생성
+            make_event = await MakeSchedule(query, original_query) ## 이벤트 생성
             logger.info(f"[MAKED_EVENT] {make_event}")
-            event_result = add_event( make_event , token ) ## 이벤트 추가
+            event_result = await add_event( make_event , token ) ## 이벤트 추가
             
             if event_result == 500 :
                 return {
@@ -745,8 +868,8 @@ class AgenticCalendar:
             }
         elif classification == "edit" : 
             print("일정 수정")
-            make_event = edit_event(query,token) 
-            event_result = calendar_edit_api(make_event, token)
+            make_event = await edit_event(query,token) 
+            event_result = await calendar_edit_api(make_event, token)
             if event_result == 500 : 
                 return {
                     "response": "구글계정 서비스를 이용하세요.",
@@ -768,8 +891,8 @@ class AgenticCalendar:
         
         elif classification == "delete" : 
             print("일정 삭제")
-            make_event = delete_event(query,token)
-            event_result = calendar_delete_api(make_event,token)
+            make_event = await delete_event(query,token)
+            event_result = await calendar_delete_api(make_event,token)
             if event_result == 500 : 
                 return {
                     "response": "구글계정 서비스를 이용하세요.",
@@ -792,7 +915,7 @@ class AgenticCalendar:
             
         elif classification == "check" : 
             print("일정 확인") 
-            check_output = check_event(query,token)
+            check_output = await check_event(query,token)
             # 프론트에게 잘보이도록 파싱.
             if check_output == 500 : 
                 return {
@@ -0,0 +1,185 @@
+import asyncio
+import copy
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+from loguru import logger
+from app.core.metrics import metrics
+
+# 사용자별 일정 스냅샷 유지 시간 (초) / 최대 보관 사용자 수
+CALENDAR_SNAPSHOT_TTL = float(os.getenv("CALENDAR_SNAPSHOT_TTL", "300"))
+CALENDAR_SNAPSHOT_MAX_USERS = int(os.getenv("CALENDAR_SNAPSHOT_MAX_USERS", "1024"))
+
+
+class CalendarSnapshot:
+    """한 사용자의 일정 목록 스냅샷"""
+
+    def __init__(self, events: List[Dict[str, Any]], etag: Optional[str] = None, last_modified: Optional[str] = None):
+        self.events = events
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = time.monotonic()
+        self.stale = False
+
+    def is_fresh(self, ttl: float) -> bool:
+        return not self.stale and time.monotonic() - self.fetched_at < ttl
+
+    def touch(self) -> None:
+        """백엔드가 변경 없음(304)을 알려준 경우 유효 시간을 연장합니다."""
+        self.fetched_at = time.monotonic()
+        self.stale = False
+
+
+def to_snapshot_event(event_id: str, payload: Dict[str, Any], base: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    일정 추가/수정 요청 본문(startDateTime / endDateTime 형식)을 백엔드 조회 형식으로 변환합니다.
+
+    Args:
+        event_id: 일정 id
+        payload: 요청 본문 (summary, location, description, startDateTime, endDateTime)
+        base: 기존 일정 (수정 시 변경되지 않은 필드 유지)
+    """
+    event = copy.deepcopy(base) if base else {"id": event_id}
+    for field in ("summary", "location", "description"):
+        if payload.get(field) is not None:
+            event[field] = payload[field]
+    for field, key in (("startDateTime", "start"), ("endDateTime", "end")):
+        if payload.get(field):
+            event[key] = {**event.get(key, {}), "dateTime": payload[field]}
+    return event
+
+
+class CalendarSnapshotCache:
+    """
+    사용자별 캘린더 일정 스냅샷 캐시
+    - TTL 동안은 백엔드 조회 없이 스냅샷 반환
+    - 우리 쪽 추가/수정/삭제 결과는 스냅샷에 바로 반영 (write-through)
+    - TTL 만료 시 ETag / Last-Modified 로 조건부 갱신
+    - 사용자별 락은 기다리는 요청이 있는 동안만 보관
+    """
+
+    def __init__(self, ttl: float = CALENDAR_SNAPSHOT_TTL, max_users: int = CALENDAR_SNAPSHOT_MAX_USERS):
+        self.ttl = ttl
+        self.max_users = max_users
+        self._snapshots: "OrderedDict[str, CalendarSnapshot]" = OrderedDict()
+        # 키 → [락, 사용 중인 요청 수]
+        self._locks: Dict[str, list] = {}
+
+    def _key(self, token: str) -> str:
+        # 토큰 원문을 키로 보관하지 않음
+        return hashlib.sha256((token or "").encode("utf-8")).hexdigest()
+
+    @asynccontextmanager
+    async def lock(self, token: str) -> AsyncIterator[None]:
+        """같은 사용자의 동시 조회를 하나의 백엔드 요청으로 합치기 위한 락 (마지막 요청이 끝나면 제거)"""
+        key = self._key(token)
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and self._locks.get(key) is entry:
+                del self._locks[key]
+
+    @property
+    def lock_count(self) -> int:
+        return len(self._locks)
+
+    def peek(self, token: str) -> Optional[CalendarSnapshot]:
+        """유효 여부와 관계없이 스냅샷을 반환합니다. (조건부 갱신용)"""
+        return self._snapshots.get(self._key(token))
+
+    def get(self, token: str, record: bool = True) -> Optional[List[Dict[str, Any]]]:
+        """유효한 스냅샷의 일정 목록을 반환합니다. (없거나 만료되면 None)"""
+        key = self._key(token)
+        snapshot = self._snapshots.get(key)
+        if snapshot is None or not snapshot.is_fresh(self.ttl):
+            if record:
+                metrics.incr("calendar.snapshot.miss")
+            return None
+        self._snapshots.move_to_end(key)
+        if record:
+            metrics.incr("calendar.snapshot.hit")
+        return snapshot.events
+
+    def put(self, token: str, events: List[Dict[str, Any]], etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """백엔드에서 받은 일정 목록을 저장합니다."""
+        key = self._key(token)
+        self._snapshots[key] = CalendarSnapshot(events, etag, last_modified)
+        self._snapshots.move_to_end(key)
+        while len(self._snapshots) > self.max_users:
+            self._snapshots.popitem(last=False)
+
+    def conditional_headers(self, token: str) -> Dict[str, str]:
+        """만료된 스냅샷이 있으면 조건부 요청 헤더를 반환합니다."""
+        snapshot = self.peek(token)
+        headers = {}
+        if snapshot is not None:
+            if snapshot.etag:
+                headers["If-None-Match"] = snapshot.etag
+            if snapshot.last_modified:
+                headers["If-Modified-Since"] = snapshot.last_modified
+        return headers
+
+    def not_modified(self, token: str) -> Optional[List[Dict[str, Any]]]:
+        """304 응답을 받은 경우 기존 스냅샷을 재사용합니다."""
+        snapshot = self.peek(token)
+        if snapshot is None:
+            return None
+        snapshot.touch()
+        metrics.incr("calendar.snapshot.not_modified")
+        return snapshot.events
+
+    def apply_add(self, token: str, event: Dict[str, Any]) -> None:
+        """추가된 일정을 스냅샷에 반영합니다. (id 를 알 수 없으면 다음 조회 시 갱신)"""
+        snapshot = self.peek(token)
+        if snapshot is None:
+            return
+        if not event.get("id"):
+            self.invalidate(token)
+            return
+        snapshot.events.append(event)
+        metrics.incr("calendar.snapshot.write_through")
+
+    def apply_edit(self, token: str, event_id: str, payload: Dict[str, Any]) -> None:
+        """수정된 일정을 스냅샷에 반영합니다."""
+        snapshot = self.peek(token)
+        if snapshot is None:
+            return
+        for index, event in enumerate(snapshot.events):
+            if event.get("id") == event_id:
+                snapshot.events[index] = to_snapshot_event(event_id, payload, base=event)
+                metrics.incr("calendar.snapshot.write_through")
+                return
+        self.invalidate(token)
+
+    def apply_delete(self, token: str, event_id: str) -> None:
+        """삭제된 일정을 스냅샷에서 제거합니다."""
+        snapshot = self.peek(token)
+        if snapshot is None:
+            return
+        snapshot.events = [event for event in snapshot.events if event.get("id") != event_id]
+        metrics.incr("calendar.snapshot.write_through")
+
+    def invalidate(self, token: str) -> None:
+        """스냅샷을 만료시킵니다. (조건부 갱신 정보는 유지)"""
+        snapshot = self.peek(token)
+        if snapshot is not None:
+            snapshot.stale = True
+            metrics.incr("calendar.snapshot.invalidated")
+            logger.info("[캘린더 스냅샷] 만료 처리")
+
+    def clear(self) -> None:
+        self._snapshots.clear()
+        self._locks.clear()
+
+
+# 전역 스냅샷 캐시 인스턴스
+calendar_snapshots = CalendarSnapshotCache()
@@ -0,0 +1,158 @@
+import os
+import pickle
+import threading
+from datetime import datetime
+from typing import Any, Optional, Tuple
+import httplib2
+from google.auth.transport.requests import Request # 토큰 갱신 시 필요한 요청 객체
+from google_auth_httplib2 import AuthorizedHttp # creds 로 인증하는 httplib2 연결
+from google_auth_oauthlib.flow import InstalledAppFlow # OAuth 인증 흐름을 다루는 도구
+from googleapiclient.discovery import build # Google API 클라이언트 생성 도구
+from loguru import logger
+from app.core.metrics import metrics
+
+# 인증 범위 지정
+SCOPES = ['https://www.googleapis.com/auth/calendar']
+
+# 토큰 / OAuth 클라이언트 파일 경로
+GOOGLE_TOKEN_PATH = os.getenv("GOOGLE_TOKEN_PATH", "token.pickle")
+GOOGLE_CLIENT_SECRET_PATH = os.getenv("GOOGLE_CLIENT_SECRET_PATH", "client_secret.json")
+# 만료 몇 초 전에 미리 갱신할지
+GOOGLE_TOKEN_REFRESH_MARGIN = int(os.getenv("GOOGLE_TOKEN_REFRESH_MARGIN", "300"))
+MIN_REFRESH_INTERVAL = 30
+
+
+def _token_state(creds: Any) -> Tuple[Any, ...]:
+    """토큰 변경 여부 비교용 값"""
+    return (creds.token, creds.refresh_token, creds.expiry)
+
+
+class GoogleCalendarClient:
+    """
+    Google Calendar 인증 정보 / service 객체 캐시
+    - token.pickle 은 처음 한 번만 읽고, 토큰이 실제로 바뀐 경우에만 다시 저장
+    - 만료 GOOGLE_TOKEN_REFRESH_MARGIN 초 전에 백그라운드에서 미리 갱신
+    - build() 로 만든 service 객체를 스레드별로 재사용 (discovery 문서 재파싱 방지)
+      httplib2 연결은 스레드 안전하지 않으므로 스레드마다 별도 연결 / service 사용
+    - 갱신할 수 없는 무효한 토큰이면 OAuth 인증 흐름을 다시 실행
+    """
+
+    def __init__(self, token_path: str = GOOGLE_TOKEN_PATH, client_secret_path: str = GOOGLE_CLIENT_SECRET_PATH, refresh_margin: int = GOOGLE_TOKEN_REFRESH_MARGIN):
+        self.token_path = token_path
+        self.client_secret_path = client_secret_path
+        self.refresh_margin = refresh_margin
+        self._creds = None
+        self._saved_state = None
+        # 인증 정보가 교체될 때마다 증가 (스레드별 service 재생성 기준)
+        self._generation = 0
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+
+    def credentials(self):
+        """유효한 인증 정보를 반환합니다."""
+        with self._lock:
+            if self._creds is None:
+                self._creds = self._load()
+                self._save_if_changed()
+                self._schedule_refresh()
+            if not self._creds.valid and not self._creds.refresh_token:
+                # 만료됐는데 refresh_token 이 없으면 갱신할 수 없으므로 다시 인증
+                logger.warning("[Google 인증] 토큰 만료 (refresh_token 없음), 다시 인증")
+                self._creds = self._authorize()
+                self._save_if_changed()
+            elif not self._creds.valid or self._expires_soon():
+                self._refresh()
+            return self._creds
+
+    def service(self):
+        """현재 스레드에서 재사용되는 Calendar API service 객체를 반환합니다."""
+        with self._lock:
+            creds = self.credentials()
+            generation = self._generation
+        cached = getattr(self._local, "service", None)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        # 갱신은 같은 creds 객체를 갱신하므로 service 는 인증 정보가 교체될 때까지 유효
+        http = AuthorizedHttp(creds, http=httplib2.Http())
+        service = build('calendar', 'v3', http=http, cache_discovery=False)
+        metrics.incr("google_calendar.service.built")
+        self._local.service = (generation, service)
+        return service
+
+    def close(self) -> None:
+        """백그라운드 갱신을 중단하고 캐시를 비웁니다."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._creds = None
+            self._saved_state = None
+            self._generation += 1
+
+    def _load(self):
+        creds = None
+        if os.path.exists(self.token_path):
+            with open(self.token_path, 'rb') as token:
+                creds = pickle.load(token)
+            self._saved_state = _token_state(creds)
+            logger.info("[Google 인증] 저장된 토큰 로드")
+
+        if not creds or (not creds.valid and not (creds.expired and creds.refresh_token)):
+            creds = self._authorize()
+        return creds
+
+    def _authorize(self):
+        """OAuth 인증 흐름으로 새 인증 정보를 발급받습니다."""
+        flow = InstalledAppFlow.from_client_secrets_file(self.client_secret_path, SCOPES)
+        creds = flow.run_local_server(port=8080)
+        self._generation += 1
+        metrics.incr("google_calendar.token.authorized")
+        return creds
+
+    def _expires_soon(self) -> bool:
+        expiry = self._creds.expiry
+        # google-auth 의 expiry 는 naive UTC
+        return expiry is not None and (expiry - datetime.utcnow()).total_seconds() < self.refresh_margin
+
+    def _refresh(self) -> None:
+        if self._creds.refresh_token:
+            self._creds.refresh(Request())
+            metrics.incr("google_calendar.token.refreshed")
+            logger.info("[Google 인증] 토큰 갱신")
+        self._save_if_changed()
+        self._schedule_refresh()
+
+    def _save_if_changed(self) -> None:
+        state = _token_state(self._creds)
+        if state == self._saved_state:
+            return
+        with open(self.token_path, 'wb') as token:
+            pickle.dump(self._creds, token)
+        self._saved_state = state
+        metrics.incr("google_calendar.token.saved")
+
+    def _schedule_refresh(self) -> None:
+        """만료 전에 백그라운드에서 갱신하도록 예약합니다."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._creds.expiry is None or not self._creds.refresh_token:
+            return
+        # 유효 시간이 margin 보다 짧은 토큰이어도 연속 갱신하지 않도록 최소 간격 유지
+        delay = max((self._creds.expiry - datetime.utcnow()).total_seconds() - self.refresh_margin, MIN_REFRESH_INTERVAL)
+        self._timer = threading.Timer(delay, self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _background_refresh(self) -> None:
+        try:
+            with self._lock:
+                if self._creds is not None:
+                    self._refresh()
+        except Exception as e:
+            logger.error(f"[Google 인증] 백그라운드 토큰 갱신 실패: {str(e)}")
+
+
+# 전역 Google Calendar 클라이언트
+google_calendar = GoogleCalendarClient()
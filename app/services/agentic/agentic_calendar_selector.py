@@ -0,0 +1,121 @@
+import os
+import re
+from datetime import datetime
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional
+from loguru import logger
+from app.core.metrics import metrics
+from app.services.agentic.agentic_calendar_time import TimeWindow, now_in_calendar_tz, parse_event_datetime, parse_time_window
+
+# LLM 에 전달할 후보 일정 최대 개수
+CALENDAR_CANDIDATE_TOP_K = int(os.getenv("CALENDAR_CANDIDATE_TOP_K", "5"))
+
+# 제목 비교 시 의미 없는 요청 표현 (일정/취소/삭제 등)
+_REQUEST_WORDS = re.compile(
+    r"일정|스케줄|약속|취소|삭제|지워|없애|빼|변경|수정|바꿔|옮겨|알려|확인|보여|해줘|줘|좀|"
+    r"schedule|event|appointment|cancel|delete|remove|change|edit|move|show|check|please",
+    re.IGNORECASE
+)
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def event_time(event: Dict[str, Any], key: str = "start") -> Optional[datetime]:
+    """일정의 시작/종료 시각을 반환합니다. (dateTime / date / 문자열 형식 모두 지원)"""
+    value = event.get(key)
+    if isinstance(value, dict):
+        value = value.get("dateTime") or value.get("date")
+    return parse_event_datetime(value)
+
+
+def in_window(event: Dict[str, Any], window: TimeWindow) -> bool:
+    """일정이 기간과 겹치는지 확인합니다."""
+    start = event_time(event, "start")
+    if start is None:
+        return False
+    end = event_time(event, "end") or start
+    window_start, window_end = window
+    if end == start:
+        return window_start <= start < window_end
+    return start < window_end and end > window_start
+
+
+def _normalize(text: str) -> str:
+    return _NON_WORD.sub("", _REQUEST_WORDS.sub(" ", text or "")).lower()
+
+
+def _bigrams(text: str) -> set:
+    return {text[i:i + 2] for i in range(len(text) - 1)} or {text}
+
+
+def title_score(summary: str, query: str) -> float:
+    """
+    일정 제목과 요청 문장의 유사도 (0 ~ 1)
+    - 제목이 요청에 그대로 포함되면 1
+    - 그 외에는 문자 bigram 포함 비율 / 편집 유사도 중 큰 값
+    """
+    title = _normalize(summary)
+    request = _normalize(query)
+    if not title or not request:
+        return 0.0
+    if title in request:
+        return 1.0
+    overlap = len(_bigrams(title) & _bigrams(request)) / len(_bigrams(title))
+    return max(overlap, SequenceMatcher(None, title, request).ratio())
+
+
+def select_candidates(events: Any, query: str, now: Optional[datetime] = None, top_k: int = CALENDAR_CANDIDATE_TOP_K) -> Dict[str, Any]:
+    """
+    요청과 관련 있는 일정 후보를 고릅니다.
+
+    Args:
+        events: schedule() 결과 (일정 목록)
+        query: 사용자 요청
+        now: 기준 시각 (기본값: 현재 시각)
+        top_k: 최대 후보 수
+
+    Returns:
+        Dict[str, Any]:
+        - window: 요청에서 추출한 기간 (없으면 None)
+        - in_window: 기간 내 일정 전체 (기간이 없으면 전체 일정)
+        - candidates: 제목 유사도 순 상위 top_k 일정
+    """
+    if not isinstance(events, list):
+        events = []
+    now = now_in_calendar_tz(now)
+    window = parse_time_window(query, now)
+
+    scoped = [event for event in events if in_window(event, window)] if window else list(events)
+
+    def rank(event: Dict[str, Any]):
+        start = event_time(event, "start")
+        distance = abs((start - now).total_seconds()) if start else float("inf")
+        return -title_score(event.get("summary", ""), query), distance
+
+    # 기간 내 일정이 없으면 (기간 해석 오류 대비) 전체 일정에서 제목으로 후보 선정
+    pool = scoped if scoped or window is None else events
+    candidates = sorted(pool, key=rank)[:top_k]
+
+    metrics.incr("calendar.candidates.selected", len(candidates))
+    logger.info(f"[캘린더 후보] 전체 {len(events)}개 → 기간 내 {len(scoped)}개 → 후보 {len(candidates)}개 (기간: {window})")
+    return {"window": window, "in_window": scoped, "candidates": candidates}
+
+
+def _time_field(value: Any) -> Dict[str, str]:
+    if isinstance(value, dict):
+        return {"dateTime": value.get("dateTime", value.get("date", "")), "timeZone": value.get("timeZone", "")}
+    return {"dateTime": value or "", "timeZone": ""}
+
+
+def to_check_items(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """일정 확인 응답 형식(summary / description / start / end)으로 변환합니다. (시작 시각 순)"""
+    timed = sorted((event for event in events if event_time(event, "start")), key=lambda event: event_time(event, "start"))
+    ordered = timed + [event for event in events if not event_time(event, "start")]
+    return [
+        {
+            "summary": event.get("summary", ""),
+            "description": event.get("description", ""),
+            "start": _time_field(event.get("start")),
+            "end": _time_field(event.get("end"))
+        }
+        for event in ordered
+    ]
@@ -0,0 +1,422 @@
+import os
+import re
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+# 사용자 기본 시간대 (상대 날짜 해석 기준)
+CALENDAR_TIMEZONE = ZoneInfo(os.getenv("CALENDAR_TIMEZONE", "Asia/Seoul"))
+
+TimeWindow = Tuple[datetime, datetime]
+
+WEEKDAYS_KO = {"월": 0, "화": 1, "수": 2, "목": 3, "금": 4, "토": 5, "일": 6}
+WEEKDAYS_EN = {
+    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
+    "friday": 4, "saturday": 5, "sunday": 6,
+    "mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6,
+}
+MONTHS_EN = {
+    "january": 1, "february": 2, "march": 3, "april": 4, "may": 5, "june": 6,
+    "july": 7, "august": 8, "september": 9, "october": 10, "november": 11, "december": 12,
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "jun": 6, "jul": 7, "aug": 8,
+    "sep": 9, "sept": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+# 상대 날짜 (오늘 기준 일수)
+RELATIVE_DAYS = [
+    (re.compile(r"글피"), 3),
+    (re.compile(r"모레|day after tomorrow", re.IGNORECASE), 2),
+    (re.compile(r"그저께|그제|day before yesterday", re.IGNORECASE), -2),
+    (re.compile(r"내일|tomorrow", re.IGNORECASE), 1),
+    (re.compile(r"어제|yesterday", re.IGNORECASE), -1),
+    (re.compile(r"오늘|today|tonight", re.IGNORECASE), 0),
+]
+
+# 주 / 달 단위 상대 표현 (기준 주/달로부터의 오프셋)
+WEEK_OFFSETS = [
+    (re.compile(r"다다음\s*주"), 2),
+    (re.compile(r"다음\s*주|next\s+week", re.IGNORECASE), 1),
+    (re.compile(r"지난\s*주|저번\s*주|last\s+week", re.IGNORECASE), -1),
+    (re.compile(r"이번\s*주|금주|this\s+week", re.IGNORECASE), 0),
+]
+MONTH_OFFSETS = [
+    (re.compile(r"다음\s*달|next\s+month", re.IGNORECASE), 1),
+    (re.compile(r"지난\s*달|저번\s*달|last\s+month", re.IGNORECASE), -1),
+    (re.compile(r"이번\s*달|이달|this\s+month", re.IGNORECASE), 0),
+]
+
+_ISO_DATE = re.compile(r"(\d{4})[-./](\d{1,2})[-./](\d{1,2})")
+_KO_MONTH_DAY = re.compile(r"(\d{1,2})\s*월\s*(\d{1,2})\s*일")
+_SLASH_DATE = re.compile(r"(?<![\d/])(\d{1,2})/(\d{1,2})(?![\d/])")
+_EN_MONTH_DAY = re.compile(r"\b(" + "|".join(MONTHS_EN) + r")\.?\s+(\d{1,2})(?:st|nd|rd|th)?\b", re.IGNORECASE)
+_EN_DAY_MONTH = re.compile(r"\b(\d{1,2})(?:st|nd|rd|th)?\s+(?:of\s+)?(" + "|".join(MONTHS_EN) + r")\b", re.IGNORECASE)
+_KO_DAY = re.compile(r"(?<!\d)(\d{1,2})\s*일(?!\s*(?:간|동안|정))")
+_KO_WEEKDAY = re.compile(r"([월화수목금토일])요일")
+_EN_WEEKDAY = re.compile(r"\b(?:(this|next|last|coming)\s+)?(" + "|".join(WEEKDAYS_EN) + r")\b", re.IGNORECASE)
+_WEEKEND = re.compile(r"주말|weekend", re.IGNORECASE)
+
+
+def now_in_calendar_tz(now: Optional[datetime] = None) -> datetime:
+    """기준 시각을 사용자 시간대로 반환합니다."""
+    if now is None:
+        return datetime.now(CALENDAR_TIMEZONE)
+    if now.tzinfo is None:
+        return now.replace(tzinfo=CALENDAR_TIMEZONE)
+    return now.astimezone(CALENDAR_TIMEZONE)
+
+
+def start_of_day(value: datetime) -> datetime:
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _day_window(day: datetime) -> TimeWindow:
+    start = start_of_day(day)
+    return start, start + timedelta(days=1)
+
+
+def _safe_date(now: datetime, year: int, month: int, day: int) -> Optional[datetime]:
+    try:
+        return start_of_day(now).replace(year=year, month=month, day=day)
+    except ValueError:
+        return None
+
+
+def _week_offset(text: str) -> Optional[int]:
+    for pattern, offset in WEEK_OFFSETS:
+        if pattern.search(text):
+            return offset
+    return None
+
+
+# 날짜 표현 종류 (일정 추가 시 지난 날짜 처리 기준)
+DATE_ABSOLUTE = "absolute"            # 연도까지 있는 날짜
+DATE_MONTH_DAY = "month_day"          # 연도 없는 월/일 → 지났으면 내년
+DATE_DAY = "day"                      # 일만 있는 날짜 → 지났으면 다음 달
+DATE_WEEKDAY = "weekday"              # 주 지정 없는 요일 (항상 오늘 이후)
+DATE_THIS_WEEK_WEEKDAY = "this_week"  # 이번 주 + 요일 → 지났으면 모호
+DATE_RELATIVE = "relative"            # 주 지정 요일, 오늘/내일/어제 등 명시적 상대 날짜
+
+
+def _match_date(text: str, now: datetime) -> Optional[Tuple[datetime, str]]:
+    """텍스트에서 하루 단위 날짜와 표현 종류를 찾습니다. (절대 날짜 → 요일 → 상대 날짜 순)"""
+    today = start_of_day(now)
+
+    def dated(day: Optional[datetime], kind: str) -> Optional[Tuple[datetime, str]]:
+        return (day, kind) if day is not None else None
+
+    match = _ISO_DATE.search(text)
+    if match:
+        return dated(_safe_date(now, int(match.group(1)), int(match.group(2)), int(match.group(3))), DATE_ABSOLUTE)
+
+    match = _KO_MONTH_DAY.search(text)
+    if match:
+        return dated(_safe_date(now, now.year, int(match.group(1)), int(match.group(2))), DATE_MONTH_DAY)
+
+    match = _EN_MONTH_DAY.search(text)
+    if match:
+        return dated(_safe_date(now, now.year, MONTHS_EN[match.group(1).lower()], int(match.group(2))), DATE_MONTH_DAY)
+
+    match = _EN_DAY_MONTH.search(text)
+    if match:
+        return dated(_safe_date(now, now.year, MONTHS_EN[match.group(2).lower()], int(match.group(1))), DATE_MONTH_DAY)
+
+    match = _SLASH_DATE.search(text)
+    if match:
+        return dated(_safe_date(now, now.year, int(match.group(1)), int(match.group(2))), DATE_MONTH_DAY)
+
+    weekday = None
+    week_offset = _week_offset(text)
+    match = _KO_WEEKDAY.search(text)
+    if match:
+        weekday = WEEKDAYS_KO[match.group(1)]
+    else:
+        match = _EN_WEEKDAY.search(text)
+        if match:
+            weekday = WEEKDAYS_EN[match.group(2).lower()]
+            modifier = (match.group(1) or "").lower()
+            if modifier == "next":
+                week_offset = 1
+            elif modifier == "last":
+                week_offset = -1
+            elif modifier == "this":
+                week_offset = 0
+    if weekday is not None:
+        if week_offset is None:
+            # 주 지정이 없으면 오늘 이후 가장 가까운 해당 요일
+            return today + timedelta(days=(weekday - today.weekday()) % 7), DATE_WEEKDAY
+        monday = today - timedelta(days=today.weekday()) + timedelta(weeks=week_offset)
+        return monday + timedelta(days=weekday), DATE_THIS_WEEK_WEEKDAY if week_offset == 0 else DATE_RELATIVE
+
+    for pattern, days in RELATIVE_DAYS:
+        if pattern.search(text):
+            return today + timedelta(days=days), DATE_RELATIVE
+
+    match = _KO_DAY.search(text)
+    if match:
+        return dated(_safe_date(now, now.year, now.month, int(match.group(1))), DATE_DAY)
+
+    return None
+
+
+def parse_date(text: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    텍스트에서 하루 단위 날짜를 찾아 해당 날짜 00:00 을 반환합니다.
+    (절대 날짜 → 요일 → 상대 날짜 순으로 확인)
+    """
+    found = _match_date(text, now_in_calendar_tz(now))
+    return found[0] if found else None
+
+
+def _next_month_day(today: datetime, day: int) -> Optional[datetime]:
+    """오늘 이후 처음 오는 해당 일 (이번 달에 지났거나 없는 날이면 다음 달부터 확인)"""
+    for offset in range(1, 4):
+        month_index = today.year * 12 + (today.month - 1) + offset
+        candidate = _safe_date(today, month_index // 12, month_index % 12 + 1, day)
+        if candidate is not None:
+            return candidate
+    return None
+
+
+def parse_time_window(text: str, now: Optional[datetime] = None) -> Optional[TimeWindow]:
+    """
+    요청 문장에서 조회 기간을 추출합니다.
+
+    Args:
+        text: 사용자 요청 (예: "다음주 화요일 일정 알려줘", "this weekend")
+        now: 기준 시각 (기본값: 현재 시각, 사용자 시간대)
+
+    Returns:
+        Optional[TimeWindow]: (시작, 끝) - 끝은 포함하지 않음. 기간 표현이 없으면 None
+    """
+    if not text:
+        return None
+    now = now_in_calendar_tz(now)
+    today = start_of_day(now)
+
+    day = parse_date(text, now)
+    if day is not None:
+        return _day_window(day)
+
+    week_offset = _week_offset(text)
+    if _WEEKEND.search(text):
+        saturday = today - timedelta(days=today.weekday()) + timedelta(weeks=week_offset or 0, days=5)
+        return saturday, saturday + timedelta(days=2)
+
+    if week_offset is not None:
+        monday = today - timedelta(days=today.weekday()) + timedelta(weeks=week_offset)
+        return monday, monday + timedelta(days=7)
+
+    for pattern, offset in MONTH_OFFSETS:
+        if pattern.search(text):
+            month_index = now.year * 12 + (now.month - 1) + offset
+            start = today.replace(year=month_index // 12, month=month_index % 12 + 1, day=1)
+            next_index = month_index + 1
+            end = today.replace(year=next_index // 12, month=next_index % 12 + 1, day=1)
+            return start, end
+
+    return None
+
+
+def parse_event_datetime(value: str) -> Optional[datetime]:
+    """일정의 dateTime / date 문자열을 사용자 시간대 datetime 으로 변환합니다."""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    return now_in_calendar_tz(parsed)
+
+
+################################################ 일정 시각 파싱 (일정 추가용)
+# 시각이 없을 때 사용하는 기본 시작 시각 / 기본 일정 길이 (분)
+CALENDAR_DEFAULT_START_HOUR = int(os.getenv("CALENDAR_DEFAULT_START_HOUR", "9"))
+CALENDAR_DEFAULT_DURATION_MINUTES = int(os.getenv("CALENDAR_DEFAULT_DURATION_MINUTES", "60"))
+
+_AM_WORDS = {"오전", "아침", "새벽", "am", "a.m."}
+_PM_WORDS = {"오후", "점심", "낮", "저녁", "밤", "pm", "p.m."}
+
+# 시각 없이 시간대만 말한 경우의 기본 시각
+PERIOD_HOURS = {
+    "새벽": 6, "아침": 9, "오전": 10, "점심": 12, "낮": 13, "오후": 14, "저녁": 18, "밤": 20,
+    "morning": 9, "noon": 12, "afternoon": 14, "evening": 18, "tonight": 20, "night": 20,
+}
+
+_MERIDIEM_KO = r"(?:(오전|오후|아침|점심|저녁|밤|새벽|낮)\s*)?"
+_KO_TIME = re.compile(_MERIDIEM_KO + r"(\d{1,2})\s*시(?!간)(?:\s*(\d{1,2})\s*분|\s*(반))?")
+_CLOCK_TIME = re.compile(_MERIDIEM_KO + r"(?<![\d:+])(\d{1,2}):(\d{2})(?::\d{2})?(?:\s*(am|pm|a\.m\.|p\.m\.))?", re.IGNORECASE)
+_EN_TIME = re.compile(r"\b(\d{1,2})\s*(am|pm|a\.m\.|p\.m\.)", re.IGNORECASE)
+_NOON = re.compile(r"정오|\bnoon\b", re.IGNORECASE)
+_PERIOD = re.compile(r"(새벽|아침|오전|점심|낮|오후|저녁|밤)|\b(morning|afternoon|evening|tonight|night)\b", re.IGNORECASE)
+
+# 일정 제목에서 제거할 날짜/시각 표현
+_ISO_DATETIME = re.compile(r"\d{4}-\d{1,2}-\d{1,2}[T ]\d{1,2}:\d{2}(?::\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?)?")
+_ISO_DATETIME_TZ = re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:\d{2})")
+_ADVERBIAL_PERIOD = re.compile(r"(?:새벽|아침|오전|점심|낮|오후|저녁|밤)(?=\s*에)|\b(?:in the |this )?(?:morning|afternoon|evening)\b|\btonight\b", re.IGNORECASE)
+_KO_WEEK_WEEKDAY = re.compile(r"(?:(?:다다음|다음|지난|저번|이번)\s*주\s*|금주\s*)?[월화수목금토일]요일")
+_TEMPORAL_PATTERNS = [
+    _ISO_DATETIME, _ISO_DATE, _KO_MONTH_DAY, _EN_MONTH_DAY, _EN_DAY_MONTH, _SLASH_DATE,
+    _KO_WEEK_WEEKDAY, _EN_WEEKDAY,
+    *[pattern for pattern, _ in RELATIVE_DAYS], *[pattern for pattern, _ in WEEK_OFFSETS],
+    re.compile(r"(?:이번|다음)?\s*주말|(?:this|next)?\s*weekend", re.IGNORECASE),
+    _KO_TIME, _CLOCK_TIME, _EN_TIME, _NOON, _ADVERBIAL_PERIOD, _KO_DAY,
+]
+# 반복 일정 표현 (매주 월요일, 매일, 2주마다, every Monday ...)
+_RECURRENCE = re.compile(r"매\s*(?:일|주|달|월|년|[월화수목금토일]요일)|마다|격주|\bevery\b|\b(?:daily|weekly|biweekly|monthly|yearly|annually)\b", re.IGNORECASE)
+# 날짜/시각 표현을 제거한 뒤에도 남아 있으면 규칙으로 다 해석하지 못한 것 (숫자, 기간, 서수 날짜)
+_UNPARSED_TOKENS = re.compile(
+    r"\d|동안|\b(?:hours?|hrs?|minutes?|mins?)\b"
+    r"|\bthe\s+(?:first|second|third|fourth|fifth|sixth|seventh|eighth|ninth|tenth|eleventh|twelfth|\w+teenth|twentieth|thirtieth|twenty[- ]?\w+|thirty[- ]?first)\b",
+    re.IGNORECASE
+)
+_ISO_OFFSET = re.compile(r"(?<=:\d{2}:\d{2})(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})")
+_MARKER = "\x00"
+
+
+def _hour_of(hour: int, meridiem: Optional[str], korean_bare: bool = False) -> Optional[int]:
+    """오전/오후 표현을 반영한 24시간제 시각 (범위를 벗어나면 None)"""
+    meridiem = (meridiem or "").lower()
+    if meridiem in _PM_WORDS and hour < 12:
+        hour += 12
+    elif meridiem in _AM_WORDS and hour == 12:
+        hour = 0
+    elif not meridiem and korean_bare and 1 <= hour <= 7:
+        # "3시", "7시" 처럼 오전/오후 없이 말하면 보통 오후 약속
+        hour += 12
+    return hour if 0 <= hour <= 23 else None
+
+
+def find_times(text: str) -> list:
+    """텍스트에 나오는 시각을 등장 순서대로 (시, 분) 목록으로 반환합니다."""
+    # ISO 시각의 시간대 오프셋(-05:00 등)은 시각으로 보지 않음
+    text = _ISO_OFFSET.sub("", text)
+    found = []
+    for match in _KO_TIME.finditer(text):
+        hour = _hour_of(int(match.group(2)), match.group(1), korean_bare=True)
+        minute = 30 if match.group(4) else int(match.group(3) or 0)
+        found.append((match.start(), match.end(), hour, minute))
+    for match in _CLOCK_TIME.finditer(text):
+        hour = _hour_of(int(match.group(2)), match.group(4) or match.group(1))
+        found.append((match.start(), match.end(), hour, int(match.group(3))))
+    for match in _EN_TIME.finditer(text):
+        found.append((match.start(), match.end(), _hour_of(int(match.group(1)), match.group(2)), 0))
+    for match in _NOON.finditer(text):
+        found.append((match.start(), match.end(), 12, 0))
+
+    times = []
+    last_end = -1
+    for start, end, hour, minute in sorted(found, key=lambda item: (item[0], -item[1])):
+        if start < last_end:
+            continue
+        last_end = end
+        if hour is not None and 0 <= minute < 60:
+            times.append((hour, minute))
+    return times
+
+
+def _period_hour(text: str) -> Optional[int]:
+    match = _PERIOD.search(text)
+    if not match:
+        return None
+    return PERIOD_HOURS[(match.group(1) or match.group(2)).lower()]
+
+
+def parse_event_time(text: str, now: Optional[datetime] = None) -> Optional[TimeWindow]:
+    """
+    일정 추가 요청에서 시작/종료 시각을 추출합니다. (LLM 없이 규칙 기반)
+
+    - 날짜: parse_date() 와 동일 (오늘/내일/모레, 이번 주/다음주 + 요일, N월 M일, ISO, 영어 표현) + 주말
+      연도 없는 월/일, 일만 있는 날짜가 이미 지났으면 내년 / 다음 달
+    - 반복 일정, 이미 지난 "이번 주 + 요일" 처럼 날짜가 모호하면 None (LLM 으로 처리)
+    - 해석하지 못한 숫자 / 기간 / 서수 날짜가 남아 있으면 None ("at 5", "for 3 hours", "the 13th")
+    - 시각: 오전/오후 N시 M분, N시 반, HH:MM, 9am, 정오 / 시각이 없으면 시간대(아침/저녁 ...) 또는 기본 시각
+    - 종료: 두 번째 시각 (N시부터 M시까지) 또는 기본 일정 길이
+
+    Args:
+        text: 사용자 요청 (예: "내일 오전 9시에 회의")
+        now: 기준 시각 (기본값: 현재 시각, 사용자 시간대)
+
+    Returns:
+        Optional[TimeWindow]: (시작, 종료). 날짜와 시각을 모두 찾지 못하면 None
+    """
+    if not text or has_unparsed_tokens(text):
+        return None
+    now = now_in_calendar_tz(now)
+    today = start_of_day(now)
+
+    iso_times = [parse_event_datetime(match.group(0).replace(" ", "T")) for match in _ISO_DATETIME_TZ.finditer(text)]
+    iso_times = [value for value in iso_times if value is not None]
+    if iso_times:
+        # 시간대가 포함된 ISO 시각은 그대로 사용
+        start = iso_times[0]
+        end = iso_times[1] if len(iso_times) > 1 and iso_times[1] > start else start + timedelta(minutes=CALENDAR_DEFAULT_DURATION_MINUTES)
+        return start, end
+
+    if _RECURRENCE.search(text):
+        # 반복 일정은 규칙 기반으로 만들지 않음 (LLM 으로 처리)
+        return None
+
+    day = None
+    found = _match_date(text, now)
+    if found is not None:
+        day, kind = found
+        if day < today:
+            # 연도 / 달을 생략한 날짜가 이미 지났으면 다음에 오는 날짜로
+            if kind == DATE_MONTH_DAY:
+                day = _safe_date(day, day.year + 1, day.month, day.day)
+            elif kind == DATE_DAY:
+                day = _next_month_day(today, day.day)
+            elif kind == DATE_THIS_WEEK_WEEKDAY:
+                # "이번 주 금요일" 이 이미 지난 경우 (지난 날짜 / 다음 주 중 어느 뜻인지 모호)
+                return None
+            if day is None:
+                return None
+
+    if day is None and _WEEKEND.search(text):
+        week_offset = _week_offset(text) or 0
+        day = today - timedelta(days=today.weekday()) + timedelta(weeks=week_offset, days=5)
+        if day < today:
+            day += timedelta(weeks=1)
+
+    times = find_times(text)
+    if times:
+        hour, minute = times[0]
+    else:
+        hour, minute = _period_hour(text), 0
+        if hour is None:
+            if day is None:
+                return None
+            hour = CALENDAR_DEFAULT_START_HOUR
+
+    start = (day or today).replace(hour=hour, minute=minute)
+    if day is None and start < now:
+        # 날짜 없이 이미 지난 시각이면 다음 날
+        start += timedelta(days=1)
+
+    end = start + timedelta(minutes=CALENDAR_DEFAULT_DURATION_MINUTES)
+    if len(times) > 1:
+        end_hour, end_minute = times[1]
+        end = start.replace(hour=end_hour, minute=end_minute)
+        if end <= start and end_hour < 12:
+            end += timedelta(hours=12)
+        if end <= start:
+            end += timedelta(days=1)
+    return start, end
+
+
+def strip_temporal_expressions(text: str) -> str:
+    """
+    날짜/시각 표현을 제거한 나머지 문장을 반환합니다. (일정 제목 추출용)
+    - "저녁 약속" 처럼 명사로 쓰인 시간대는 유지하고 "저녁에" 처럼 부사로 쓰인 것만 제거
+    """
+    for pattern in _TEMPORAL_PATTERNS:
+        text = pattern.sub(_MARKER, text)
+    # 날짜/시각 바로 앞뒤의 조사 / 전치사 제거
+    text = re.sub(r"\b(?:at|on|from|to|until|by)\s*(?=" + _MARKER + ")", "", text, flags=re.IGNORECASE)
+    text = re.sub(_MARKER + r"\s*(?:에서|부터|까지|에|~|-)?", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def has_unparsed_tokens(text: str) -> bool:
+    """날짜/시각 표현을 제거한 나머지에 규칙으로 해석하지 못한 숫자 / 기간 / 서수 날짜가 남아 있는지 확인합니다."""
+    return bool(_UNPARSED_TOKENS.search(strip_temporal_expressions(text)))
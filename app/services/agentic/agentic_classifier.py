@@ -1,8 +1,12 @@
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Tuple
 from enum import Enum
 from loguru import logger
-from app.core.llm_client import get_llm_client
-from app.models.agentic_response import AgentType
+from app.config.app_config import settings
+from app.core.llm_client import get_llm_client, get_langchain_llm, get_chain
+from app.core.metrics import metrics
+from app.models.agentic_response import AgentType, SubIntent
+from app.services.agentic.agentic_kakao_category import KAKAO_CATEGORY_CODES
+from app.services.agentic.agentic_intent_classifier import classify_intent
 
 from langchain_groq import ChatGroq
 from langchain_core.output_parsers import JsonOutputParser
@@ -10,6 +14,7 @@ from langchain_core.prompts import ChatPromptTemplate
 
 from dotenv import load_dotenv
 from app.core.llm_post_prompt import Prompt
+from app.services.common.postprocessor import LANGUAGE_CODE_MAP
 load_dotenv()  # .env 파일 자동 로딩
 import os
 import json
@@ -21,6 +26,90 @@ load_dotenv(dotenv_path)
 # ✅ 환경변수 읽기
 groq_api_key = os.getenv("GROQ_API_KEY")
 
+# 분류 프롬프트에서 공통으로 사용하는 에이전트 유형 설명
+AGENT_TYPE_GUIDE = """
+        ## Available agent types:
+        - calendar : managing schedule, event, or etc.
+        - resume : making resumé which is related to job search. (ex_ 이력서 만들어줘)
+        - job_search : Looking for a job. 
+        - cover_letter : Write a self-introduction. , (ex_ 자소서 만들어줘)
+        - post :  making post in community board.
+        - location : find a location.
+        - weather : When asking about the weather
+        - event : Find an event
+        - dog : Find dog
+        - cat : Find cat information.
+        - general : Any questions not included above
+"""
+
+# 분류와 함께 추출하는 하위 의도 설명 (해당 에이전트의 후속 분류 호출을 대체)
+SUB_INTENT_GUIDE = """
+        ## Sub-intent: fill "sub_intent" ONLY with the fields of the chosen agent type (use an empty object otherwise)
+        - calendar :
+            "calendar_action": "add" (new schedule) | "delete" (remove schedule) | "edit" (modify schedule) | "check" (check schedule)
+        - location :
+            "location_tag": "Find" if a specific place or type of place is mentioned, "None" if only vague (ex_ "nearby", "around here")
+            "location_intention": the place the user is looking for, in Korean (ex_ 족발, 스타벅스, 약국)
+            "kakao_category": one of MT1(대형마트) CS2(편의점) FD6(음식점) CE7(카페) AT4(관광명소) AD5(숙박) OL7(주유소,충전소) PK6(주차장) SW8(지하철역) SC4(학교) AC5(학원) HP8(병원) PM9(약국) AG2(중개업소) PO3(공공기관)
+        - job_search :
+            "job_role": "yes" if a specific job title or role is mentioned, otherwise "no"
+        - cover_letter :
+            "job_role": "yes" if a specific job or field is mentioned, otherwise "no"
+            "desired_field": the cover letter the user wants (ex_ "Developer cover-letter"), or "None"
+"""
+
+# 캘린더 하위 의도 (Input_analysis 출력과 동일)
+CALENDAR_ACTIONS = ("add", "delete", "edit", "check")
+
+
+def to_agent_type(value: Any) -> AgentType:
+    """LLM이 반환한 값을 AgentType으로 변환합니다. (유효하지 않으면 GENERAL)"""
+    value = str(value or "").strip().lower()
+    for agentic_type in AgentType:
+        if agentic_type.value == value:
+            return agentic_type
+    return AgentType.GENERAL
+
+
+def to_sub_intent(agent_type: AgentType, value: Any) -> Optional[SubIntent]:
+    """LLM이 반환한 하위 의도를 검증합니다. (유효하지 않은 항목은 None → 에이전트가 후속 호출로 판단)"""
+    if not isinstance(value, dict):
+        return None
+
+    fields = {}
+    if agent_type == AgentType.CALENDAR:
+        action = str(value.get("calendar_action") or "").strip().lower()
+        if action in CALENDAR_ACTIONS:
+            fields["calendar_action"] = action
+    elif agent_type == AgentType.LOCATION:
+        tag = str(value.get("location_tag") or "").strip().capitalize()
+        if tag in ("Find", "None"):
+            fields["location_tag"] = tag
+        intention = str(value.get("location_intention") or "").strip()
+        if intention and intention.lower() != "none":
+            fields["location_intention"] = intention
+        code = str(value.get("kakao_category") or "").strip().upper()
+        if code in KAKAO_CATEGORY_CODES:
+            fields["kakao_category"] = code
+    elif agent_type in (AgentType.JOB_SEARCH, AgentType.COVER_LETTER):
+        job_role = str(value.get("job_role") or "").strip().lower()
+        if job_role in ("yes", "no"):
+            fields["job_role"] = job_role == "yes"
+        desired_field = str(value.get("desired_field") or "").strip()
+        if agent_type == AgentType.COVER_LETTER and desired_field and desired_field.lower() != "none":
+            fields["desired_field"] = desired_field
+
+    return SubIntent(**fields) if fields else None
+
+
+def _strip_json_markdown(response: str) -> str:
+    """markdown 스타일(```json)로 감싼 JSON 응답에서 본문만 꺼냅니다."""
+    response = response.strip()
+    if "```json" in response:
+        response = response.split("```json")[-1]
+        response = response.split("```")[0]
+    return response.strip()
+
 
 class AgenticClassifier:
     """에이전트 분류기"""
@@ -42,7 +131,7 @@ class AgenticClassifier:
         logger.info(f"[CLASSIFIER] 질의 분류 시작: {query}")
         
         # 에이전트 유형 분류
-        agent_type = await self._classify_agent_type(query)
+        agent_type, _ = await self._classify_agent_type(query)
         logger.info(f"[CLASSIFIER] 에이전트 유형: {agent_type.value}")
         
         # 도메인 분류(RAG 사용시 활성화)
@@ -55,8 +144,39 @@ class AgenticClassifier:
         logger.info(f"[CLASSIFIER] 분류 완료: {result}")
         return result
     
-    async def _classify_agent_type(self, query: str) -> AgentType:
-        """에이전트 유형을 분류합니다."""
+    async def classify_hierarchical(self, query: str) -> Dict[str, Any]:
+        """
+        에이전트 유형과 하위 의도를 함께 분류합니다.
+        (LLM 분류가 필요하면 하위 의도까지 한 번의 호출로 추출해 에이전트의 후속 분류 호출을 생략)
+
+        Returns:
+            Dict[str, Any]: agent_type, sub_intent (Optional[SubIntent])
+        """
+        logger.info(f"[CLASSIFIER] 계층 분류 시작: {query}")
+        agent_type, sub_intent = await self._classify_agent_type(query, with_sub_intent=settings.HIERARCHICAL_CLASSIFICATION_ENABLED)
+        logger.info(f"[CLASSIFIER] 분류 완료: {agent_type.value}, 하위 의도: {sub_intent}")
+        return {
+            "agent_type": agent_type.value,
+            "sub_intent": sub_intent
+        }
+
+    async def _classify_agent_type(self, query: str, with_sub_intent: bool = False) -> Tuple[AgentType, Optional[SubIntent]]:
+        """에이전트 유형을 분류합니다. (임베딩 분류기가 확신하면 LLM 호출 생략)"""
+        prediction = await classify_intent(query)
+        if prediction is not None and prediction.confident:
+            metrics.incr("classifier.embedding")
+            logger.info(f"[CLASSIFIER] 임베딩 분류 결과: {prediction.agent_type.value} (score {prediction.score:.3f}, margin {prediction.margin:.3f})")
+            return prediction.agent_type, None
+
+        if prediction is not None:
+            logger.info(f"[CLASSIFIER] 임베딩 분류 불확실 ({prediction.agent_type.value}, margin {prediction.margin:.3f}), LLM 분류 사용")
+        metrics.incr("classifier.llm")
+        if with_sub_intent:
+            return await self._classify_hierarchical_llm(query)
+        return await self._classify_agent_type_llm(query), None
+
+    async def _classify_agent_type_llm(self, query: str) -> AgentType:
+        """LLM 으로 에이전트 유형을 분류합니다."""
         # JSON 형식 예시를 별도 변수로 분리
         json_format = '''
         {
@@ -71,45 +191,22 @@ class AgenticClassifier:
         Return the result ONLY in this JSON format:
         {json_format}
         
-        ## Available agent types:
-        - calendar : managing schedule, event, or etc.
-        - resume : making resumé which is related to job search. (ex_ 이력서 만들어줘)
-        - job_search : Looking for a job. 
-        - cover_letter : Write a self-introduction. , (ex_ 자소서 만들어줘)
-        - post :  making post in community board.
-        - location : find a location.
-        - weather : When asking about the weather
-        - event : Find an event
-        - dog : Find dog
-        - cat : Find cat information.
-        - general : Any questions not included above
-
+        {AGENT_TYPE_GUIDE}
         """
         
         try:
             logger.info("[CLASSIFIER] 에이전트 유형 분류 시작")
             response = await self.llm_client.generate(prompt)
-            response = response.strip()
             
             # markdown 스타일의 JSON 응답 처리
-            if "```json" in response:
-                response = response.split("```json")[-1]
-                response = response.split("```")[0]
-            
-            response = response.strip().lower()
+            response = _strip_json_markdown(response).lower()
             logger.info(f"[CLASSIFIER] 에이전트 유형 분류 결과: {response}")
             
             # JSON 파싱 시도
             try:
                 response_json = json.loads(response)
-                agent_type = response_json.get("agent_type", "general").strip()
-                
                 # 유효한 에이전트 타입인지 확인
-                for agentic_type in AgentType:
-                    if agentic_type.value == agent_type:
-                        return agentic_type
-                        
-                return AgentType.GENERAL
+                return to_agent_type(response_json.get("agent_type", "general"))
                 
             except json.JSONDecodeError as e:
                 logger.error(f"[CLASSIFIER] JSON 파싱 실패: {str(e)}, 텍스트 기반으로 분류 시도")
@@ -122,3 +219,142 @@ class AgenticClassifier:
         except Exception as e:
             logger.error(f"에이전트 유형 분류 중 오류 발생: {str(e)}")
             return AgentType.GENERAL
+
+    async def _classify_hierarchical_llm(self, query: str) -> Tuple[AgentType, Optional[SubIntent]]:
+        """LLM 으로 에이전트 유형과 하위 의도를 한 번에 분류합니다."""
+        json_format = '''
+        {
+            "agent_type": "...",
+            "sub_intent": {...}
+        }
+        '''
+
+        prompt = f"""
+        Determine which type of agent is needed to process the following query, and its sub-intent.
+        query: {query}
+        
+        Return the result ONLY in this JSON format:
+        {json_format}
+        
+        {AGENT_TYPE_GUIDE}
+        {SUB_INTENT_GUIDE}
+        """
+
+        try:
+            logger.info("[CLASSIFIER] 계층 분류 시작")
+            response = _strip_json_markdown(await self.llm_client.generate(prompt))
+            logger.info(f"[CLASSIFIER] 계층 분류 결과: {response}")
+
+            try:
+                response_json = json.loads(response)
+            except json.JSONDecodeError as e:
+                logger.error(f"[CLASSIFIER] JSON 파싱 실패: {str(e)}, 텍스트 기반으로 분류 시도")
+                lowered = response.lower()
+                for agentic_type in AgentType:
+                    if agentic_type.value in lowered:
+                        return agentic_type, None
+                return AgentType.GENERAL, None
+
+            if not isinstance(response_json, dict):
+                return AgentType.GENERAL, None
+            agent_type = to_agent_type(response_json.get("agent_type", "general"))
+            sub_intent = to_sub_intent(agent_type, response_json.get("sub_intent"))
+            if sub_intent is not None:
+                metrics.incr("classifier.sub_intent")
+            return agent_type, sub_intent
+
+        except Exception as e:
+            logger.error(f"에이전트 계층 분류 중 오류 발생: {str(e)}")
+            return AgentType.GENERAL, None
+
+    async def understand(self, query: str) -> Dict[str, Any]:
+        """
+        언어 감지, 영어 번역, 에이전트 유형 분류를 한 번의 LLM 호출로 처리합니다.
+        (translate_query + classify 를 대체하는 fused 파이프라인용)
+        
+        Args:
+            query: 사용자 원문 질의
+            
+        Returns:
+            Dict[str, Any]: lang_code, translated_query, agent_type, sub_intent
+        """
+        logger.info(f"[CLASSIFIER] 통합 이해 단계 시작: {query}")
+        with_sub_intent = settings.HIERARCHICAL_CLASSIFICATION_ENABLED
+
+        def build_chain():
+            llm = get_langchain_llm(is_lightweight=True)
+
+            parser = JsonOutputParser(pydantic_object={
+                "type": "object",
+                "properties": {
+                    "lang_code": {"type": "string"},
+                    "translated_query": {"type": "string"},
+                    "agent_type": {"type": "string"},
+                    "sub_intent": {"type": "object"}
+                }
+            })
+
+            sub_intent_format = ',\n            "sub_intent": {{<fields for the chosen agent type>}}' if with_sub_intent else ""
+            sub_intent_guide = SUB_INTENT_GUIDE if with_sub_intent else ""
+
+            supported_languages = "\n".join(
+                f"        - \"{code}\": {name}" for code, name in LANGUAGE_CODE_MAP.items()
+            )
+
+            system_prompt = f"""
+            You are an AI assistant that understands a user's query in a single step.
+
+            Your task is to:
+            1. Detect the original language of the input query.
+            2. Translate the input accurately into English.
+            3. Determine which type of agent is needed to process the query.
+            4. Return the result strictly in this JSON format:
+
+            {{{{
+            "lang_code": "<language code of the original input>",
+            "translated_query": "<English translation of the input>",
+            "agent_type": "<one of the agent types below>"{sub_intent_format}
+            }}}}
+
+            Supported language codes for "lang_code" are:
+    {supported_languages}
+            {AGENT_TYPE_GUIDE}{sub_intent_guide}
+            ⚠️ Do not include any explanation, markdown, or comments. Return **only** the JSON object above.
+            """
+
+            prompt = ChatPromptTemplate.from_messages([
+                ("system", system_prompt),
+                ("user", "{input}")
+            ])
+
+            return prompt | llm | parser
+
+        chain = get_chain("classifier.understand.sub_intent" if with_sub_intent else "classifier.understand", build_chain)
+
+        try:
+            result = await chain.ainvoke({"input": query})
+            logger.info(f"[CLASSIFIER] 통합 이해 단계 결과: {result}")
+        except Exception as e:
+            logger.error(f"[CLASSIFIER] 통합 이해 단계 중 오류 발생: {str(e)}")
+            result = {}
+
+        if not isinstance(result, dict):
+            result = {}
+
+        # 단계별 기본값 처리 (translate_query / classify 와 동일한 fallback)
+        lang_code = str(result.get("lang_code") or "").strip().lower()
+        if lang_code not in LANGUAGE_CODE_MAP:
+            lang_code = "en"
+
+        translated_query = str(result.get("translated_query") or "").strip() or query
+        agent_type = to_agent_type(result.get("agent_type"))
+        sub_intent = to_sub_intent(agent_type, result.get("sub_intent")) if with_sub_intent else None
+        if sub_intent is not None:
+            metrics.incr("classifier.sub_intent")
+
+        return {
+            "lang_code": lang_code,
+            "translated_query": translated_query,
+            "agent_type": agent_type.value,
+            "sub_intent": sub_intent
+        }
@@ -0,0 +1,110 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, Optional, Set
+from loguru import logger
+from app.core.metrics import metrics
+from app.services.common.search_location import search_location
+from app.services.common.user_information import User_Api
+
+# 요청 컨텍스트가 조회하는 외부 입력 (에이전트는 DEPENDENCIES 로 필요한 항목을 선언)
+PROFILE = "profile"              # 사용자 프로필 (users/profile)
+PREFERENCE = "preference"        # 사용자 선호 정보 (users/preference)
+LOCATION_INFO = "location_info"  # 실시간 위치 → 주소 변환
+
+
+class RequestContext:
+    """
+    요청 단위 컨텍스트
+    - 에이전트 싱글턴은 요청 데이터를 self 에 저장하지 않고 이 객체로 전달받음 (동시 요청 간 데이터 섞임 방지)
+    - uid, token, 실시간 위치, 사용자 언어
+    - 사용자 프로필 / 선호 정보 / 위치 주소는 요청 중 처음 필요할 때 한 번만 조회해서 공유
+    - prefetch 로 분류가 끝나기 전에 미리 조회를 시작할 수 있음 (라우팅 후 쓰이지 않는 조회는 cancel_prefetch 로 취소)
+    """
+
+    def __init__(self, uid: str, token: Optional[str] = None, location: Any = None, source_lang: Optional[str] = None, user_api: Optional[User_Api] = None):
+        self.uid = uid
+        self.token = token
+        self.location = location
+        self.source_lang = source_lang
+        self._user_api = user_api or User_Api()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._prefetched: Set[str] = set()
+
+    def _fetcher(self, key: str) -> Callable[[], Awaitable[Any]]:
+        if key == PROFILE:
+            return lambda: self._user_api.user_api(self.token)
+        if key == PREFERENCE:
+            return lambda: self._user_api.user_prefer_api(self.token)
+        return lambda: search_location().search(self.location)
+
+    def _once(self, key: str) -> Awaitable[Any]:
+        """같은 항목을 동시에 요청해도 조회는 한 번만 수행합니다."""
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(self._fetcher(key)())
+        elif key in self._prefetched:
+            self._prefetched.discard(key)
+            metrics.incr("prefetch.used")
+        return task
+
+    @property
+    def has_live_location(self) -> bool:
+        """요청에 유효한 실시간 위치(위도 / 경도)가 포함되어 있는지 여부"""
+        return bool(getattr(self.location, "latitude", None) and getattr(self.location, "longitude", None))
+
+    def available_dependencies(self) -> FrozenSet[str]:
+        """요청 정보만으로 조회할 수 있는 항목 (토큰 → 사용자 정보, 실시간 위치 → 주소)"""
+        available = set()
+        if self.token:
+            available.update((PROFILE, PREFERENCE))
+        if self.has_live_location:
+            available.add(LOCATION_INFO)
+        return frozenset(available)
+
+    def prefetch(self, dependencies: Iterable[str]) -> None:
+        """필요할 것으로 예상되는 항목의 조회를 미리 시작합니다."""
+        for key in self.available_dependencies().intersection(dependencies):
+            if key not in self._tasks:
+                self._tasks[key] = asyncio.ensure_future(self._fetcher(key)())
+                self._prefetched.add(key)
+                metrics.incr("prefetch.started")
+        if self._prefetched:
+            logger.info(f"[PREFETCH] 미리 조회 시작: {sorted(self._prefetched)}")
+
+    def cancel_prefetch(self, keep: Iterable[str] = ()) -> None:
+        """
+        아직 쓰이지 않은 미리 조회 중 keep 에 없는 항목을 취소합니다.
+        (keep 없이 호출하면 요청 종료 시 남은 조회를 모두 정리)
+        """
+        for key in self._prefetched - set(keep):
+            task = self._tasks.pop(key)
+            self._prefetched.discard(key)
+            if task.done():
+                if not task.cancelled():
+                    task.exception()  # 쓰이지 않은 조회의 예외는 무시
+            else:
+                task.cancel()
+            metrics.incr("prefetch.cancelled")
+            logger.info(f"[PREFETCH] 사용하지 않는 조회 취소: {key}")
+
+    async def user_profile(self) -> Dict[str, Any]:
+        """사용자 프로필 (users/profile). 반환값은 요청 내에서 공유되므로 수정하지 말 것"""
+        return await self._once(PROFILE)
+
+    async def user_preference(self) -> Dict[str, Any]:
+        """사용자 선호 정보 (users/preference). 반환값은 요청 내에서 공유되므로 수정하지 말 것"""
+        return await self._once(PREFERENCE)
+
+    async def location_info(self, default_address: str) -> Dict[str, Any]:
+        """
+        사용자 위치 정보를 반환합니다.
+        - 실시간 위치가 있으면 좌표 → 주소 변환 결과
+        - 없으면 사용자 프로필 (주소가 비어 있으면 default_address 사용)
+        """
+        if self.has_live_location:
+            return await self._once(LOCATION_INFO)
+
+        logger.warning("[WARNING] live_location이 유효하지 않아 사용자 정보 기반으로 fallback 처리합니다.")
+        profile = await self.user_profile()
+        if profile.get("address"):
+            return profile
+        return {**profile, "address": default_address}
@@ -10,7 +10,7 @@ from langchain_groq import ChatGroq
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from typing import Dict, Optional, List, Any, Tuple
-from app.core.llm_client import get_llm_client,get_langchain_llm
+from app.core.llm_client import get_llm_client,get_langchain_llm,get_chain
 from loguru import logger
 from pydantic import BaseModel
 from langchain_community.chat_models import ChatOllama
@@ -28,6 +28,7 @@ from app.services.common.user_coverletter_information import UserCoverLetterInfo
 from app.services.common.user_coverletter_pdf import UserCoverLetterPDF
 from app.services.common.user_coverletter_s3 import UserCoverLetterS3
 from app.services.common.user_information import User_Api
+from app.services.agentic.agentic_context import PROFILE
 
 class CategoryOutput(BaseModel):
     tag: str
@@ -47,6 +48,9 @@ class CoverLetterConversationState(BaseModel):
     s3_url: Optional[str] = None
 
 class AgenticCoverLetter:
+    # 자소서 단계마다 사용하는 사용자 프로필 (미리 조회하면 user_profile_service 캐시로 재사용)
+    DEPENDENCIES = frozenset({PROFILE})
+
     def __init__(self):
         self.user_information = UserCoverLetterInformation()
         self.user_pdf = UserCoverLetterPDF()
@@ -60,66 +64,69 @@ class AgenticCoverLetter:
     async def ask_job_category(self, query: str):
         logger.info("[서치 태그 만드는중...]")
 
-        llm = get_langchain_llm(is_lightweight=False)
+        def build_chain():
+            llm = get_langchain_llm(is_lightweight=False)
 
-        parser = JsonOutputParser(pydantic_object=CategoryOutput)
+            parser = JsonOutputParser(pydantic_object=CategoryOutput)
     
-        system_prompt=f"""
-        [ROLE]  
-        You are an AI that analyzes user input and determines whether a specific job role is mentioned, in order to create appropriate tags.
-
-        [INSTRUCTION]  
-        1. Analyze the user's input to understand their intent.  
-        2. If a specific job (e.g., developer, designer, marketer) is explicitly mentioned, return:  
-        - "tag": "yes"  
-        - "want": "< ex_ Developer cover-letter >"  
-        3. If the job is not mentioned or unclear, return:  
-        - "tag": "no"  
-        - "want": "None"  
-        4. If it's ambiguous but likely a job-related request, return your best guess (e.g., "want": "Developer cover-letter").  
-        5. Your output must follow the format below and include no extra text or explanation.
-
-        [FORMAT]  
-        "tag": "yes" | "no",
-        "want": "<string or 'None'>"
+            system_prompt=f"""
+            [ROLE]  
+            You are an AI that analyzes user input and determines whether a specific job role is mentioned, in order to create appropriate tags.
+
+            [INSTRUCTION]  
+            1. Analyze the user's input to understand their intent.  
+            2. If a specific job (e.g., developer, designer, marketer) is explicitly mentioned, return:  
+            - "tag": "yes"  
+            - "want": "< ex_ Developer cover-letter >"  
+            3. If the job is not mentioned or unclear, return:  
+            - "tag": "no"  
+            - "want": "None"  
+            4. If it's ambiguous but likely a job-related request, return your best guess (e.g., "want": "Developer cover-letter").  
+            5. Your output must follow the format below and include no extra text or explanation.
+
+            [FORMAT]  
+            "tag": "yes" | "no",
+            "want": "<string or 'None'>"
         
 
-        [EXAMPLES]  
+            [EXAMPLES]  
 
-        "input": Please write a developer cover-letter.  
-        "output":  
-            "tag": "yes",
-            "want": "Developer cover-letter"
+            "input": Please write a developer cover-letter.  
+            "output":  
+                "tag": "yes",
+                "want": "Developer cover-letter"
         
 
-        "input": Please write a personal statement.  
-        "output":  
-            "tag": "no",
-            "want": "None"
+            "input": Please write a personal statement.  
+            "output":  
+                "tag": "no",
+                "want": "None"
             
 
-        "input": Can you help me prepare something for a design job?  
-        "output":  
-            "tag": "yes",
-            "want": "Designer cover-letter"
+            "input": Can you help me prepare something for a design job?  
+            "output":  
+                "tag": "yes",
+                "want": "Designer cover-letter"
             
-        """
+            """
+
+            prompt = ChatPromptTemplate.from_messages([
+                ("system", system_prompt ),
+                ("user", "{input}")
+            ])
 
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_prompt ),
-            ("user", "{input}")
-        ])
+            return prompt | llm | parser
 
-        chain = prompt | llm | parser
+        chain = get_chain("cover_letter.job_category", build_chain)
 
-        def parse_product(description: str) -> dict:
-            result = chain.invoke({"input": description})
+        async def parse_product(description: str) -> dict:
+            result = await chain.ainvoke({"input": description})
             
             return result
 
         description = query
 
-        response = parse_product(description)
+        response = await parse_product(description)
         print("[response] :",response)
 
         return response
@@ -143,6 +150,7 @@ class AgenticCoverLetter:
                 "response": "성장 과정 및 가치관에 대해 말씀해 주세요.",
                 "metadata": {"source": "default","state":state},
                 "state": state,
+                "output_lang": "ko",  # 자소서 질문은 한국어 고정 문구
                 "url": None
             }
         
@@ -182,6 +190,7 @@ class AgenticCoverLetter:
                 "response": "지원 동기 및 포부에 대해 말씀해 주세요.",
                 "metadata": {"source": "default","state":state},
                 "state": state,
+                "output_lang": "ko",
                 "url": None
             }
         
@@ -221,6 +230,7 @@ class AgenticCoverLetter:
                 "response": "역량 및 경험에 대해 말씀해 주세요.",
                 "metadata": {"source": "default","state":state},
                 "state": state,
+                "output_lang": "ko",
                 "url": None
             }
         
@@ -260,6 +270,7 @@ class AgenticCoverLetter:
                 "response": "입사 후 계획에대해 말해주세요.",
                 "metadata": {"source": "default","state":state},
                 "state": state,
+                "output_lang": "ko",
                 "url": None
             }
         
@@ -322,6 +333,7 @@ class AgenticCoverLetter:
                 "response": "자소서 작성 완료.",
                 "metadata": {"source": "default","state":state},
                 "state": state,
+                "output_lang": "ko",
                 "url": url
             }
         
@@ -331,6 +343,7 @@ class AgenticCoverLetter:
                 "response": " 알 수 없는 state",
                 "metadata": {"source": "default","state":state},
                 "state": state,
+                "output_lang": "ko",
                 "url": None
             }
 
@@ -1,6 +1,6 @@
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from app.core.llm_client import get_langchain_llm
+from app.core.llm_client import get_langchain_llm, get_chain
 from app.services.common.user_s3 import UserS3 
 from loguru import logger
 import os
@@ -24,62 +24,65 @@ class agentic_eum_image():
         self.upload_s3 = UserS3()
 
     async def select_image(self,query):
-        llm = get_langchain_llm(is_lightweight=False)  # 고성능 모델 사용
-
-        parser = JsonOutputParser(pydantic_object={
-            "type": "object",
-            "properties": {
-                "input": {"type": "string"},
-                "output": {"type": "string"},
-            }
-        })
-
-        # 프롬프트 문자열 구성
-        system_prompt_template = f"""
-        1. You are an AI that selects images that suit the user's needs.
-        2. Please choose one of them.
-        [
-            "eum_default.png",
-            "eum_default_2.png",
-            "eum_fighting.png",
-            "eum_fighting_hard.png",
-            "eum_fist_cheering.png",
-            "eum_greeting.png",
-            "eum_happy.png",
-            "eum_happy_run.png",
-            "eum_jump.png",
-            "eum_light_jump.png",
-            "eum_point.png",
-            "eum_run.png",
-            "eum_catch_fairy_tale_style.png"
-            "There_is_no_image "
-        ]
-        default. !! return type is json !! 
-
-        [format]
-        "output" : "..."
-
-        [few-shot] : 
-        "input" : "EUM's smiling face"
-        "output" : "eum_happy.png"
-
-        """
-
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_prompt_template ),
-            ("user", "{input}")
-        ])
-
-        chain = prompt | llm | parser
-
-        def parse_product(description: str) -> dict:
-            result = chain.invoke({"input": description})
+        def build_chain():
+            llm = get_langchain_llm(is_lightweight=False)  # 고성능 모델 사용
+
+            parser = JsonOutputParser(pydantic_object={
+                "type": "object",
+                "properties": {
+                    "input": {"type": "string"},
+                    "output": {"type": "string"},
+                }
+            })
+
+            # 프롬프트 문자열 구성
+            system_prompt_template = f"""
+            1. You are an AI that selects images that suit the user's needs.
+            2. Please choose one of them.
+            [
+                "eum_default.png",
+                "eum_default_2.png",
+                "eum_fighting.png",
+                "eum_fighting_hard.png",
+                "eum_fist_cheering.png",
+                "eum_greeting.png",
+                "eum_happy.png",
+                "eum_happy_run.png",
+                "eum_jump.png",
+                "eum_light_jump.png",
+                "eum_point.png",
+                "eum_run.png",
+                "eum_catch_fairy_tale_style.png"
+                "There_is_no_image "
+            ]
+            default. !! return type is json !! 
+
+            [format]
+            "output" : "..."
+
+            [few-shot] : 
+            "input" : "EUM's smiling face"
+            "output" : "eum_happy.png"
+
+            """
+
+            prompt = ChatPromptTemplate.from_messages([
+                ("system", system_prompt_template ),
+                ("user", "{input}")
+            ])
+
+            return prompt | llm | parser
+
+        chain = get_chain("eum_image.select_image", build_chain)
+
+        async def parse_product(description: str) -> dict:
+            result = await chain.ainvoke({"input": description})
             print(f"[AI_OUTPUT] : {json.dumps(result, indent=2, ensure_ascii=False)}")
             return result
 
         description = query
 
-        response = parse_product(description)
+        response = await parse_product(description)
 
         return response["output"]
     
@@ -1,14 +1,16 @@
+import asyncio
 import json
-import requests
-import aiohttp
-from geopy.geocoders import Nominatim
 from loguru import logger
-from app.core.llm_client import get_langchain_llm,get_llm_client
+from app.core.llm_client import get_langchain_llm,get_llm_client,get_chain,get_http_client
 from langchain_groq import ChatGroq
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain.prompts import ChatPromptTemplate
-from app.services.common.user_information import User_Api
+from app.core.metrics import metrics
+from app.services.agentic.agentic_context import RequestContext, PROFILE, PREFERENCE
+from app.services.agentic.agentic_kakao_category import KAKAO_CATEGORY_CODES, resolve_kakao_category
+from app.services.agentic.agentic_place_cache import place_search_cache
+from app.services.common.geocoder import DEFAULT_ADDRESS, default_city_coordinates, geocoder
 import os
 from pydantic import BaseModel
 
@@ -18,92 +20,94 @@ class CategoryOutput(BaseModel):
 
 # ✅ API 기본 설정
 url = os.getenv("MAPS_API_URL","https://dapi.kakao.com/v2/local/search/category.json")
+KAKAO_API_URL = "https://dapi.kakao.com"
 
 class foodstore():
-    
+    # 요청 컨텍스트에서 사용하는 외부 입력 (실시간 위치는 좌표 그대로 사용하므로 주소 변환 불필요)
+    DEPENDENCIES = frozenset({PROFILE, PREFERENCE})
+
     def __init__(self):
-        self.user_api=User_Api()
-        self.user = ""
-        self.user_prefer = ""
         self.url = "https://dapi.kakao.com/v2/local/search/keyword.json"
         self.headers = {
             "Authorization": "KakaoAK 5d96c7a6ef9ac4662396eafc9c44f63e"
         }
 
-    async def load_user_data(self, token: str):
-        # ✅ user_api는 비동기이므로 await로 호출
+    async def load_user_data(self, context: RequestContext):
+        # 요청 컨텍스트에 사용자 정보를 미리 불러옴 (location / ai_match 에서 재사용)
         logger.info("[사용자 정보 불러오는중...]")
-        self.user = await self.user_api.user_api(token)
-        self.user_prefer = await self.user_api.user_prefer_api(token)
-        logger.info(f"[사용자 정보]: {self.user} | {self.user_prefer}")
+        user, user_prefer = await asyncio.gather(context.user_profile(), context.user_preference())
+        logger.info(f"[사용자 정보]: {user} | {user_prefer}")
 
     async def query_analyze(self,query):
         
         logger.info("[query_analyze...]")
 
-        llm = get_langchain_llm(is_lightweight=False)  # 고성능 모델 사용
+        def build_chain():
+            llm = get_langchain_llm(is_lightweight=False)  # 고성능 모델 사용
 
-        parser = JsonOutputParser(pydantic_object={
-            "type": "object",
-            "properties": {
-                "input": {"type": "string"},
-                "output": {"type": "string"},
-            }
-        })
+            parser = JsonOutputParser(pydantic_object={
+                "type": "object",
+                "properties": {
+                    "input": {"type": "string"},
+                    "output": {"type": "string"},
+                }
+            })
 
-        # 프롬프트 문자열 구성
-        system_prompt_template = f"""
-        [Role]
-        You are an AI that analyzes user input and determines the user's search intention related to location.
+            # 프롬프트 문자열 구성
+            system_prompt_template = f"""
+            [Role]
+            You are an AI that analyzes user input and determines the user's search intention related to location.
 
-        [Format]
-        "intention": "...",
-        "tag": "Find" | "None"
+            [Format]
+            "intention": "...",
+            "tag": "Find" | "None"
     
-        [Instructions]
-        1. Check if the user is asking about a specific place or type of location (e.g., a restaurant, hospital, subway station).
-        2. If the user clearly mentions a specific place or category they are looking for, set `"tag"` to `"Find"`.
-        3. If the user is asking vaguely or only mentions "nearby" without a clear place or category, set `"tag"` to `"None"`.
-        4. Always respond in JSON format.
-
-        [Examples]
-        "Input": "Find a icecream store near me"
-        "output": 
-            "intention": "아이스크림",
-            "tag": "Find"
-
-        "Input": "Find a starbucks near me"
-        "output": 
-            "intention": "스타벅스",
-            "tag": "Find"
-
-        "Input": "Find a Jockbal restaurant near me"
-        "output": 
-            "intention": "족발",
-            "tag": "Find"
-
-        "Input": "Find nearby amenities"
-        "output": 
-            "intention": "기념품점",
-            "tag": "None"
-
-        """
+            [Instructions]
+            1. Check if the user is asking about a specific place or type of location (e.g., a restaurant, hospital, subway station).
+            2. If the user clearly mentions a specific place or category they are looking for, set `"tag"` to `"Find"`.
+            3. If the user is asking vaguely or only mentions "nearby" without a clear place or category, set `"tag"` to `"None"`.
+            4. Always respond in JSON format.
+
+            [Examples]
+            "Input": "Find a icecream store near me"
+            "output": 
+                "intention": "아이스크림",
+                "tag": "Find"
+
+            "Input": "Find a starbucks near me"
+            "output": 
+                "intention": "스타벅스",
+                "tag": "Find"
+
+            "Input": "Find a Jockbal restaurant near me"
+            "output": 
+                "intention": "족발",
+                "tag": "Find"
+
+            "Input": "Find nearby amenities"
+            "output": 
+                "intention": "기념품점",
+                "tag": "None"
+
+            """
         
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_prompt_template ),
-            ("user", "{input}")
-        ])
+            prompt = ChatPromptTemplate.from_messages([
+                ("system", system_prompt_template ),
+                ("user", "{input}")
+            ])
 
-        chain = prompt | llm | parser
+            return prompt | llm | parser
 
-        def parse_product(description: str) -> dict:
-            result = chain.invoke({"input": description})
+        chain = get_chain("foodstore.query_analyze", build_chain)
+
+        async def parse_product(description: str) -> dict:
+            result = await chain.ainvoke({"input": description})
             
             return result
 
         description = query
 
-        response = parse_product(description)
+        response = await parse_product(description)
         # 예외 처리: 누락된 키에 기본값 설정
         if 'intention' not in response or not response['intention']:
             response['intention'] = "기념품점"
@@ -132,168 +136,153 @@ class foodstore():
     async def Category_extraction(self,query):
         logger.info("[카테고리 추출 하는중 만드는중...]")
 
+        # 키워드 / 메뉴 번호로 바로 판단되면 LLM 호출 생략
+        category_code = resolve_kakao_category(query)
+        if category_code is not None:
+            return {"input": query, "output": category_code}
+        metrics.incr("kakao_category.llm_fallback")
+
        
-        llm = get_langchain_llm(is_lightweight=False)
+        def build_chain():
+            llm = get_langchain_llm(is_lightweight=False)
 
-        parser = JsonOutputParser(pydantic_object=CategoryOutput)
+            parser = JsonOutputParser(pydantic_object=CategoryOutput)
        
 
-        system_prompt=f"""
-        1. Choose **exactly one** category code that best matches the input.
-        2. You **must** choose one — do not skip or leave it blank.
-        3. You must choose **from the following list only**:
-        MT1, CS2, FD6, CE7, AT4, AD5, OL7, PK6, SW8, SC4, AC5, HP8, PM9, AG2, PO3
-        4. Your response must be **strictly in JSON format**.
-        5. Do **not** include any extra text, comments, or explanations. Return **only** the JSON.
+            system_prompt=f"""
+            1. Choose **exactly one** category code that best matches the input.
+            2. You **must** choose one — do not skip or leave it blank.
+            3. You must choose **from the following list only**:
+            MT1, CS2, FD6, CE7, AT4, AD5, OL7, PK6, SW8, SC4, AC5, HP8, PM9, AG2, PO3
+            4. Your response must be **strictly in JSON format**.
+            5. Do **not** include any extra text, comments, or explanations. Return **only** the JSON.
 
-        [Format]
-        "output" : "<CATEGORY_CODE>"
+            [Format]
+            "output" : "<CATEGORY_CODE>"
         
-        [few-shot]
-        input : 대형마트 
-        output : MT1
+            [few-shot]
+            input : 대형마트 
+            output : MT1
 
-        input : 편의점 
-        output : CS2
+            input : 편의점 
+            output : CS2
 
-        input : 음식점 
-        output : FD6
+            input : 음식점 
+            output : FD6
 
-        input : 카페 
-        output : CE7
+            input : 카페 
+            output : CE7
 
-        input : 관광명소 
-        output : AT4
+            input : 관광명소 
+            output : AT4
 
-        input : 숙박 
-        output : AD5
+            input : 숙박 
+            output : AD5
 
-        input : 주유소, 충전소 
-        output : OL7
+            input : 주유소, 충전소 
+            output : OL7
 
-        input : 주차장
-        output : PK6
+            input : 주차장
+            output : PK6
 
-        input : 지하철역 
-        output : SW8
+            input : 지하철역 
+            output : SW8
 
-        input : 학교 
-        output : SC4
+            input : 학교 
+            output : SC4
 
-        input : 학원
-        output : AC5
+            input : 학원
+            output : AC5
 
-        input : 병원
-        output : HP8
+            input : 병원
+            output : HP8
 
-        input : 약국
-        output : PM9
+            input : 약국
+            output : PM9
 
-        input : 중개업소
-        output : AG2
+            input : 중개업소
+            output : AG2
 
-        input : 공공기관
-        output : PO3
+            input : 공공기관
+            output : PO3
  
-        """
+            """
 
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_prompt ),
-            ("user", "{input}")
-        ])
+            prompt = ChatPromptTemplate.from_messages([
+                ("system", system_prompt ),
+                ("user", "{input}")
+            ])
 
 
-        chain = prompt | llm | parser
+            return prompt | llm | parser
 
-        def parse_product(description: str) -> dict:
-            result = chain.invoke({"input": description})
+        chain = get_chain("foodstore.category_extraction", build_chain)
+
+        async def parse_product(description: str) -> dict:
+            result = await chain.ainvoke({"input": description})
             print(f"[Category] : {json.dumps(result, indent=2, ensure_ascii=False)}")
             return result
 
-        response = parse_product(query)
+        response = await parse_product(query)
         # 예외처리
         # 예외 처리: 'output' 키가 없거나 유효하지 않은 값일 경우 기본값 설정
-        valid_codes = {
-            "MT1", "CS2", "FD6", "CE7", "AT4", "AD5",
-            "OL7", "PK6", "SW8", "SC4", "AC5", "HP8",
-            "PM9", "AG2", "PO3"
-        }
-
-        if 'output' not in response or response['output'] not in valid_codes:
+        if 'output' not in response or response['output'] not in KAKAO_CATEGORY_CODES:
             response['output'] = "MT1"  # 기본값 (예: 대형마트)
     
         return response
     
-    async def location(self):
+    async def location(self, context: RequestContext):
         logger.info("[사용자 위치 조회중...]")
-        
-        try:
-            # ✅ 사용자 주소 조회
-            user_address = self.user['address']
-            
-            if not user_address:
-                logger.warning("[사용자 주소 없음] 기본 주소 사용")
-                user_address = "서울 강남"
-                self.user['address'] = user_address
-            
-            ## 실제 이메일 사용해야함!
-            geolocator = Nominatim(user_agent="jwontiger@gmail.com")
-            location = geolocator.geocode(user_address)
-            
-            if location is None:
-                logger.warning(f"[위치 조회 실패] 주소 '{user_address}'에 대한 위치 정보를 찾을 수 없음. 기본 주소 사용")
-                user_address = "서울 강남"
-                location = geolocator.geocode(user_address)
-            
-            logger.info(f"[위치 조회 성공] 위도: {location.latitude}, 경도: {location.longitude}")
-            return {
-                "latitude": location.latitude,
-                "longitude": location.longitude
-            }
-            
-        except Exception as e:
-            logger.error(f"[위치 조회 오류] {str(e)}. 기본 주소 사용")
-            # 기본 주소로 재시도
-            try:
-                user_address = "서울 강남"
-                geolocator = Nominatim(user_agent="jwontiger@gmail.com")
-                location = geolocator.geocode(user_address)
-                
-                return {
-                    "latitude": location.latitude,
-                    "longitude": location.longitude
-                }
-            except Exception as e:
-                logger.error(f"[기본 주소 조회 실패] {str(e)}")
-                # 강남역 좌표 하드코딩 (최후의 수단)
-                return {
-                    "latitude": 37.498095,
-                    "longitude": 127.027610
-                }
-            
-    async def kakao_search(self, keyword: str, latitude:str,longitude:str,location_category) -> list:
-        params = {
-            "query": keyword,
-            "x": longitude,
-            "y": latitude,
-            "radius": 3000,
-            "size": 15
+
+        # ✅ 사용자 주소 조회
+        user = await context.user_profile()
+        user_address = user.get('address')
+
+        if not user_address:
+            logger.warning("[사용자 주소 없음] 기본 주소 사용")
+            user_address = DEFAULT_ADDRESS
+            coordinates = default_city_coordinates(user_address)
+        else:
+            coordinates = await geocoder.geocode(user_address)
+
+        if coordinates is None:
+            # 주소에 포함된 지역의 기본 좌표 사용 (기본 주소 재조회 없음)
+            coordinates = default_city_coordinates(user_address)
+            logger.warning(f"[위치 조회 실패] 주소 '{user_address}'에 대한 위치 정보를 찾을 수 없음. 기본 좌표 사용: {coordinates}")
+
+        latitude, longitude = coordinates
+        logger.info(f"[위치 조회 성공] 위도: {latitude}, 경도: {longitude}")
+        return {
+            "latitude": latitude,
+            "longitude": longitude
         }
+
+    async def kakao_search(self, keyword: str, latitude:str,longitude:str,location_category) -> list:
         logger.info(f"[kakao_search_location] : {longitude} , {latitude}")
         logger.info(f"[kakao_search_keyword] : {keyword}")
         logger.info(f"[kakao_search_url] : {self.url}")
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.url, headers=self.headers, params=params) as response:
-                if response.status != 200:
-                    raise Exception(f"Kakao API Error: {response.status}")
-                
-                data = await response.json()
-                places = data.get("documents", [])
-                # 음식점만 필터링
-                return [place["place_name"] for place in places if place.get("category_group_code") == location_category]
+        async def fetch(center_latitude: float, center_longitude: float, radius: int, page: int) -> tuple:
+            params = {
+                "query": keyword,
+                "x": center_longitude,
+                "y": center_latitude,
+                "radius": radius,
+                "sort": "distance",
+                "page": page,
+                "size": 15
+            }
+            response = await get_http_client(KAKAO_API_URL).get(self.url, headers=self.headers, params=params)
+            if response.status_code != 200:
+                raise Exception(f"Kakao API Error: {response.status_code}")
+            data = response.json()
+            return data.get("documents", []), data.get("meta", {}).get("is_end", True)
+
+        # 같은 격자 / 키워드의 검색 결과를 재사용 (사용자 위치 기준 거리순 15곳)
+        places = await place_search_cache.search(fetch, float(latitude), float(longitude), location_category, keyword, limit=15)
+        # 음식점만 필터링
+        return [place["place_name"] for place in places if place.get("category_group_code") == location_category]
 
-    
     async def kakao_api_foodstore(self,latitude:str,longitude:str,location_category:str):
         logger.info(f"[주변 {location_category} 데이터 불러오는중...]")
         logger.info(f"[kakao_api_foodstore] : {location_category}")
@@ -302,132 +291,134 @@ class foodstore():
             "Authorization": "KakaoAK 5d96c7a6ef9ac4662396eafc9c44f63e"  # ← 본인의 REST API 키로 교체
         }
 
-        params = {
-            "category_group_code": location_category,       # 위치
-            "x": longitude,                  # 경도
-            "y": latitude,                   # 위도
-            "radius": 3000,                 # 반경 3km
-            "sort": "distance",                # 거리순 정렬
-            "page": 1,
-            "size": 10                         # 1페이지당 10개
-        }
-
-        # ✅ GET 요청
-        response = requests.get(url, headers=headers, params=params)
-
-        # ✅ 결과 확인
-        if response.status_code == 200:
+        async def fetch(center_latitude: float, center_longitude: float, radius: int, page: int) -> tuple:
+            params = {
+                "category_group_code": location_category,       # 위치
+                "x": center_longitude,           # 경도
+                "y": center_latitude,            # 위도
+                "radius": radius,                # 반경
+                "sort": "distance",                # 거리순 정렬
+                "page": page,
+                "size": 15                         # 페이지당 최대 개수
+            }
+            response = await get_http_client(KAKAO_API_URL).get(url, headers=headers, params=params)
+            if response.status_code != 200:
+                raise Exception(f"Kakao API Error: {response.status_code} {response.text}")
             data = response.json()
-            for place in data['documents']:
-                print(f"{place['place_name']} - {place['address_name']} ({place['distance']}m)")
-        else:
-            print("❌ 요청 실패:", response.status_code, response.text)
+            return data["documents"], data.get("meta", {}).get("is_end", True)
 
-        data = response.json()
+        # 같은 격자 / 카테고리의 검색 결과를 재사용 (사용자 위치 기준 거리순 10곳)
+        places = await place_search_cache.search(fetch, float(latitude), float(longitude), location_category, limit=10)
+        for place in places:
+            logger.info(f"{place['place_name']} - {place['address_name']} ({place['distance']}m)")
 
-        logger.info(f"[반환할 데이터...]: {data}")
+        logger.info(f"[반환할 데이터...]: {places}")
 
-        return data['documents']
+        return places
 
-    async def ai_match(self,food_store,intention):
+    async def ai_match(self,food_store,intention,context: RequestContext):
         logger.info("[ai가 주변식당 찾아주는중...]")
         
-        llm = get_langchain_llm(is_lightweight=True)
-
-        parser = JsonOutputParser(pydantic_object={
-            "type": "object",
-            "properties": {
-                "input": {"type": "string"},
-                "output": {"type": "string"},
-            }
-        })
+        def build_chain():
+            llm = get_langchain_llm(is_lightweight=True)
+
+            parser = JsonOutputParser(pydantic_object={
+                "type": "object",
+                "properties": {
+                    "input": {"type": "string"},
+                    "output": {"type": "string"},
+                }
+            })
        
 
-        system_prompt="""
-        [Role]
-        - You are a personalized location recommendation AI assistant.
-        - Your goal is to select and return at least 3 locations from a provided list, considering the user's personal profile.
-
-        [user_info]
-        - country_born: (ex. ko)
-        - birthday: (ex. 1555-05-05)
-        - visit_purpose: (ex. Study)
-        - gender: (ex. male)
-
-        [place_list]
-        1. 대형마트 (Large Mart)
-        2. 편의점 (Convenience Store)
-        3. 음식점 (Restaurant)
-        4. 카페 (Café)
-        5. 관광명소 (Tourist Spot)
-        6. 숙박 (Accommodation)
-        7. 주유소, 충전소 (Gas Station / EV Charging Station)
-        8. 주차장 (Parking Lot)
-        9. 지하철역 (Subway Station)
-        10. 학교 (School)
-        11. 학원 (Academy)
-        12. 병원 (Hospital)
-        13. 약국 (Pharmacy)
-        14. 중개업소 (Real Estate)
-        15. 공공기관 (Government Office)
-
-        [instructions]
-        Please recommend 3~5 places from the list that best fit the user's lifestyle and context, based on:
-        - National background, age, gender and general taste
-        - Visit purpose (e.g., Study → Cafés, libraries, affordable restaurants, pharmacies)
-        - If user intention is provided, please take the user's stated intent into consideration when selecting the recommendations.
-
-        [format]
-        "output": [...] 
-
-        [Example]
-        "output": [
-            "place_name": "서울구로구청",
-            "category_group_name": "공공기관",
-            "address_name": "서울 구로구 가마산로 245",
-            "road_address_name": "서울 구로구 가마산로 245",
-            "phone": "02-860-2114",
-            "distance": "320",
-            "x": "126.889145",
-            "y": "37.494682"
-        ,
-        ...
-        ]
-
-        Return only the JSON output. No extra commentary.
-        """
-
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_prompt ),
-            ("user", "{input}")
-        ])
-
-
-        chain = prompt | llm | parser
-
-        def parse_product(description: str) -> dict:
-            result = chain.invoke({"input": description})
+            system_prompt="""
+            [Role]
+            - You are a personalized location recommendation AI assistant.
+            - Your goal is to select and return at least 3 locations from a provided list, considering the user's personal profile.
+
+            [user_info]
+            - country_born: (ex. ko)
+            - birthday: (ex. 1555-05-05)
+            - visit_purpose: (ex. Study)
+            - gender: (ex. male)
+
+            [place_list]
+            1. 대형마트 (Large Mart)
+            2. 편의점 (Convenience Store)
+            3. 음식점 (Restaurant)
+            4. 카페 (Café)
+            5. 관광명소 (Tourist Spot)
+            6. 숙박 (Accommodation)
+            7. 주유소, 충전소 (Gas Station / EV Charging Station)
+            8. 주차장 (Parking Lot)
+            9. 지하철역 (Subway Station)
+            10. 학교 (School)
+            11. 학원 (Academy)
+            12. 병원 (Hospital)
+            13. 약국 (Pharmacy)
+            14. 중개업소 (Real Estate)
+            15. 공공기관 (Government Office)
+
+            [instructions]
+            Please recommend 3~5 places from the list that best fit the user's lifestyle and context, based on:
+            - National background, age, gender and general taste
+            - Visit purpose (e.g., Study → Cafés, libraries, affordable restaurants, pharmacies)
+            - If user intention is provided, please take the user's stated intent into consideration when selecting the recommendations.
+
+            [format]
+            "output": [...] 
+
+            [Example]
+            "output": [
+                "place_name": "서울구로구청",
+                "category_group_name": "공공기관",
+                "address_name": "서울 구로구 가마산로 245",
+                "road_address_name": "서울 구로구 가마산로 245",
+                "phone": "02-860-2114",
+                "distance": "320",
+                "x": "126.889145",
+                "y": "37.494682"
+            ,
+            ...
+            ]
+
+            Return only the JSON output. No extra commentary.
+            """
+
+            prompt = ChatPromptTemplate.from_messages([
+                ("system", system_prompt ),
+                ("user", "{input}")
+            ])
+
+
+            return prompt | llm | parser
+
+        chain = get_chain("foodstore.ai_match", build_chain)
+
+        async def parse_product(description: str) -> dict:
+            result = await chain.ainvoke({"input": description})
             print(f"[ai_match] : {json.dumps(result, indent=2, ensure_ascii=False)}")
             return result
             
+        user, user_prefer = await asyncio.gather(context.user_profile(), context.user_preference())
         description = f"""
         [user_intention]
         {intention}
 
         [user_data]
-        country born: {self.user_prefer['nation']}
-        birthday : {self.user['birthday']}
-        visitpurpose : {self.user_prefer['visitPurpose']}
-        gender : {self.user_prefer['gender']}
+        country born: {user_prefer['nation']}
+        birthday : {user['birthday']}
+        visitpurpose : {user_prefer['visitPurpose']}
+        gender : {user_prefer['gender']}
 
         [Food_store]
         {food_store}
         """
 
-        logger.info(f"[SYSTEM PROMPT] : {system_prompt}")
+        logger.info(f"[SYSTEM PROMPT] : {chain.first.messages[0].prompt.template}")
         logger.info(f"[USER PROMPT] : {description}")
 
-        response = parse_product(description)
+        response = await parse_product(description)
         # 예외 처리: 'output' 키가 없거나 형식이 잘못된 경우 빈 리스트로 대체
         if "output" not in response or not isinstance(response["output"], list):
             logger.warning("[WARNING] 'output' key is missing or not a list. Defaulting to empty list.")
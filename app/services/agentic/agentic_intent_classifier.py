@@ -0,0 +1,259 @@
+import argparse
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+from loguru import logger
+from app.config.app_config import settings
+from app.config.rag_config import RAGConfig
+from app.core.metrics import metrics
+from app.models.agentic_response import AgentType
+
+# 학습용 / 평가용 예시 문장 (에이전트 유형별)
+INTENT_EXAMPLES_PATH = Path(__file__).parent / "data" / "agentic_intent_examples.json"
+
+# 문장 목록 → (N, D) 임베딩
+Encoder = Callable[[List[str]], np.ndarray]
+
+
+class IntentPrediction(NamedTuple):
+    """임베딩 분류 결과"""
+    agent_type: AgentType
+    score: float
+    margin: float
+    confident: bool
+
+
+def load_examples(path: Path = INTENT_EXAMPLES_PATH) -> Dict[str, Any]:
+    """예시 파일을 읽습니다. ({"train": {유형: [문장]}, "eval": [{"query", "agent_type"}]})"""
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def sentence_transformer_encoder(model_name: str = RAGConfig.EMBEDDING_MODEL) -> Optional[Encoder]:
+    """RAG 와 같은 다국어 임베딩 모델 인코더 (sentence-transformers 미설치 시 None)"""
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        logger.warning("[INTENT] sentence-transformers 가 설치되지 않아 임베딩 분류기를 사용하지 않습니다.")
+        return None
+
+    model = SentenceTransformer(model_name)
+    logger.info(f"[INTENT] 임베딩 모델 로드: {model_name}")
+    return lambda texts: model.encode(texts, convert_to_numpy=True)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class EmbeddingIntentClassifier:
+    """
+    다국어 임베딩 nearest-centroid 분류기
+    - 유형별 예시 문장 임베딩의 평균(centroid)과 코사인 유사도 비교
+    - 1위 유사도가 min_score 이상이고 2위와의 차이가 margin 이상일 때만 확신(confident)
+    """
+
+    def __init__(self, encoder: Encoder, margin: float = None, min_score: float = None):
+        self.encoder = encoder
+        self.margin = settings.INTENT_CLASSIFIER_MARGIN if margin is None else margin
+        self.min_score = settings.INTENT_CLASSIFIER_MIN_SCORE if min_score is None else min_score
+        self.labels: List[AgentType] = []
+        self.centroids: Optional[np.ndarray] = None
+
+    def fit(self, train: Dict[str, List[str]]) -> "EmbeddingIntentClassifier":
+        """유형별 예시 문장으로 centroid 를 계산합니다."""
+        labels, centroids = [], []
+        for agent_type, texts in train.items():
+            if not texts:
+                continue
+            labels.append(AgentType(agent_type))
+            centroids.append(_normalize(self.encoder(list(texts))).mean(axis=0))
+        self.labels = labels
+        self.centroids = _normalize(np.stack(centroids))
+        logger.info(f"[INTENT] 분류기 학습 완료 - 유형 {len(labels)}개, 예시 {sum(len(texts) for texts in train.values())}개")
+        return self
+
+    def predict(self, query: str) -> IntentPrediction:
+        if self.centroids is None:
+            raise RuntimeError("분류기가 학습되지 않았습니다.")
+        scores = self.centroids @ _normalize(self.encoder([query]))[0]
+        order = np.argsort(scores)[::-1]
+        score = float(scores[order[0]])
+        margin = score - float(scores[order[1]]) if len(order) > 1 else score
+        return IntentPrediction(
+            agent_type=self.labels[order[0]],
+            score=score,
+            margin=margin,
+            confident=score >= self.min_score and margin >= self.margin
+        )
+
+
+# 전역 분류기 (최초 사용 시 로드, 사용 불가하면 None)
+_intent_classifier: Optional[EmbeddingIntentClassifier] = None
+_intent_classifier_loaded = False
+_intent_classifier_lock = threading.Lock()
+
+
+def get_intent_classifier() -> Optional[EmbeddingIntentClassifier]:
+    """임베딩 모델을 로드하고 예시 문장으로 학습한 분류기를 반환합니다. (한 번만 수행)"""
+    global _intent_classifier, _intent_classifier_loaded
+    with _intent_classifier_lock:
+        if not _intent_classifier_loaded:
+            try:
+                encoder = sentence_transformer_encoder()
+                if encoder is not None:
+                    _intent_classifier = EmbeddingIntentClassifier(encoder).fit(load_examples()["train"])
+            except Exception as e:
+                logger.error(f"[INTENT] 임베딩 분류기 초기화 실패: {str(e)}")
+                _intent_classifier = None
+            _intent_classifier_loaded = True
+        return _intent_classifier
+
+
+async def warm_intent_classifier() -> None:
+    """서버 시작 시 임베딩 모델을 미리 로드합니다. (첫 요청이 모델 다운로드 / 로드를 기다리지 않도록)"""
+    if not settings.INTENT_CLASSIFIER_ENABLED:
+        return
+    start = time.perf_counter()
+    classifier = await asyncio.to_thread(get_intent_classifier)
+    logger.info(f"[INTENT] 임베딩 분류기 준비 {'완료' if classifier is not None else '실패 (LLM 분류만 사용)'} ({time.perf_counter() - start:.2f}초)")
+
+
+async def classify_intent(query: str) -> Optional[IntentPrediction]:
+    """
+    임베딩 분류기로 에이전트 유형을 예측합니다. (모델 로드 / 인코딩은 스레드에서 실행)
+
+    Returns:
+        Optional[IntentPrediction]: 분류기를 사용할 수 없으면 None
+    """
+    if not settings.INTENT_CLASSIFIER_ENABLED:
+        return None
+    classifier = _intent_classifier if _intent_classifier_loaded else await asyncio.to_thread(get_intent_classifier)
+    if classifier is None:
+        return None
+    try:
+        return await asyncio.to_thread(classifier.predict, query)
+    except Exception as e:
+        logger.error(f"[INTENT] 임베딩 분류 중 오류 발생: {str(e)}")
+        return None
+
+
+################################################ CLI (재학습 / 평가)
+def _latency_summary(latencies: List[float]) -> str:
+    if not latencies:
+        return "-"
+    values = np.array(latencies) * 1000
+    return f"mean {values.mean():.1f}ms / p95 {np.percentile(values, 95):.1f}ms"
+
+
+async def _evaluate(classifier: EmbeddingIntentClassifier, eval_set: List[Dict[str, str]], with_llm: bool) -> None:
+    from app.services.agentic.agentic_classifier import AgenticClassifier
+
+    llm_classifier = AgenticClassifier() if with_llm else None
+    rows = []
+    for item in eval_set:
+        expected = AgentType(item["agent_type"])
+        start = time.perf_counter()
+        prediction = classifier.predict(item["query"])
+        embedding_latency = time.perf_counter() - start
+
+        llm_type, llm_latency = None, None
+        if llm_classifier is not None:
+            start = time.perf_counter()
+            llm_type = await llm_classifier._classify_agent_type_llm(item["query"])
+            llm_latency = time.perf_counter() - start
+        rows.append((item["query"], expected, prediction, embedding_latency, llm_type, llm_latency))
+
+    total = len(rows)
+    confident = [row for row in rows if row[2].confident]
+    print(f"{'query':<40} {'expected':<13} {'embedding':<13} {'score':>6} {'margin':>7} {'llm':<13}")
+    for query, expected, prediction, _, llm_type, _ in rows:
+        flag = "" if prediction.confident else " (fallback)"
+        print(f"{query[:40]:<40} {expected.value:<13} {prediction.agent_type.value:<13} {prediction.score:>6.3f} {prediction.margin:>7.3f} {(llm_type.value if llm_type else '-'):<13}{flag}")
+
+    print()
+    print(f"embedding accuracy : {sum(row[2].agent_type == row[1] for row in rows) / total:.1%} ({_latency_summary([row[3] for row in rows])})")
+    print(f"confident coverage : {len(confident) / total:.1%} (accuracy {sum(row[2].agent_type == row[1] for row in confident) / max(len(confident), 1):.1%})")
+    if with_llm:
+        llm_latencies = [row[5] for row in rows]
+        hybrid_correct = sum((row[2].agent_type if row[2].confident else row[4]) == row[1] for row in rows)
+        hybrid_latencies = [row[3] if row[2].confident else row[3] + row[5] for row in rows]
+        print(f"llm accuracy       : {sum(row[4] == row[1] for row in rows) / total:.1%} ({_latency_summary(llm_latencies)})")
+        print(f"hybrid accuracy    : {hybrid_correct / total:.1%} ({_latency_summary(hybrid_latencies)})")
+
+
+def load_corpus_eval(path: Path, exclude: List[str]) -> List[Dict[str, str]]:
+    """라우팅 벤치마크 코퍼스의 agent_type 질의를 평가용으로 읽습니다. (학습 예시와 겹치는 질의 제외)"""
+    with open(path, "r", encoding="utf-8") as file:
+        corpus = json.load(file)
+    excluded = set(exclude)
+    return [{"query": item["query"], "agent_type": item["expected"]} for item in corpus.get("agent_type", []) if item["query"] not in excluded]
+
+
+def calibrate(predictions: List[Tuple[AgentType, IntentPrediction]], target_accuracy: float) -> List[Dict[str, float]]:
+    """
+    (정답, 예측) 목록으로 min_score / margin 조합별 확신 비율(coverage)과 확신 예측 정확도를 계산합니다.
+
+    Returns:
+        List[Dict[str, float]]: 확신 예측 정확도가 target_accuracy 이상인 조합, coverage 높은 순
+    """
+    results = []
+    for min_score in np.arange(0.2, 0.91, 0.05):
+        for margin in np.arange(0.0, 0.21, 0.01):
+            confident = [(expected, prediction) for expected, prediction in predictions
+                         if prediction.score >= min_score and prediction.margin >= margin]
+            if not confident:
+                continue
+            accuracy = sum(prediction.agent_type == expected for expected, prediction in confident) / len(confident)
+            if accuracy >= target_accuracy:
+                results.append({"min_score": round(float(min_score), 2), "margin": round(float(margin), 2),
+                                "coverage": len(confident) / len(predictions), "accuracy": accuracy})
+    # coverage 가 같으면 더 엄격한 조합 우선
+    return sorted(results, key=lambda row: (-row["coverage"], -row["min_score"], -row["margin"]))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="에이전트 유형 임베딩 분류기 재학습 / 평가")
+    parser.add_argument("--examples", default=str(INTENT_EXAMPLES_PATH), help="예시 파일 경로")
+    parser.add_argument("--llm", action="store_true", help="LLM 분류 결과 / 지연 시간과 비교")
+    parser.add_argument("--corpus", help="평가에 추가할 라우팅 벤치마크 코퍼스 (tests/app/services/agentic/data/routing_corpus.json)")
+    parser.add_argument("--calibrate", action="store_true", help="min_score / margin 조합별 확신 비율과 정확도 계산")
+    parser.add_argument("--target-accuracy", type=float, default=0.98, help="--calibrate 시 확신 예측의 최소 정확도")
+    args = parser.parse_args(argv)
+
+    encoder = sentence_transformer_encoder()
+    if encoder is None:
+        raise SystemExit("sentence-transformers 가 필요합니다.")
+
+    examples = load_examples(Path(args.examples))
+    start = time.perf_counter()
+    classifier = EmbeddingIntentClassifier(encoder).fit(examples["train"])
+    print(f"trained on {sum(len(texts) for texts in examples['train'].values())} examples in {time.perf_counter() - start:.2f}s "
+          f"(margin {classifier.margin}, min score {classifier.min_score})\n")
+    eval_set = list(examples.get("eval", []))
+    if args.corpus:
+        train_texts = [text for texts in examples["train"].values() for text in texts]
+        eval_set += load_corpus_eval(Path(args.corpus), exclude=train_texts + [item["query"] for item in eval_set])
+    print(f"evaluating on {len(eval_set)} queries\n")
+
+    if args.calibrate:
+        predictions = [(AgentType(item["agent_type"]), classifier.predict(item["query"])) for item in eval_set]
+        candidates = calibrate(predictions, args.target_accuracy)
+        print(f"{'min_score':>9} {'margin':>7} {'coverage':>9} {'accuracy':>9}  (confident accuracy >= {args.target_accuracy:.0%})")
+        for row in candidates[:10]:
+            print(f"{row['min_score']:>9.2f} {row['margin']:>7.2f} {row['coverage']:>9.1%} {row['accuracy']:>9.1%}")
+        if not candidates:
+            print("목표 정확도를 만족하는 조합이 없습니다. (임베딩 분류 비활성화 권장)")
+        print()
+
+    asyncio.run(_evaluate(classifier, eval_set, args.llm))
+
+
+if __name__ == "__main__":
+    main()
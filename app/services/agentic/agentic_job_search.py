@@ -5,9 +5,7 @@ from app.core.llm_client import get_llm_client
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
-from app.core.llm_client import get_langchain_llm
-from app.services.common.user_information import User_Api
-from app.services.common.search_location import search_location
+from app.core.llm_client import get_langchain_llm, get_chain
 from pydantic import BaseModel
 import json
 import os
@@ -21,64 +19,62 @@ class agentic_job_search():
     def __init__(self):
         self.api_key = os.getenv("GOOGLE_SEARCH_WEATHER_API_KEY")
         self.search_engine_id = os.getenv("GOOGLE_SEARCH_ENGINE_ID")
-        self.user_information=User_Api()
-        self.user=""
-        self.user_prefer=""
-        self.user_information_data=""
-        self.search_live_location = search_location()
         self.llm = get_llm_client()
 
     async def search_tag(self,query):
         logger.info("[서치 태그 만드는중...]")
 
-        llm = get_langchain_llm(is_lightweight=False)
+        def build_chain():
+            llm = get_langchain_llm(is_lightweight=False)
 
-        parser = JsonOutputParser(pydantic_object=CategoryOutput)
+            parser = JsonOutputParser(pydantic_object=CategoryOutput)
     
-        system_prompt=f"""
+            system_prompt=f"""
 
-        [Role]  
-        - You are an AI assistant that analyzes user queries related to job search.  
-        - Your task is to determine whether the user has specified a clear **desired job role**.
+            [Role]  
+            - You are an AI assistant that analyzes user queries related to job search.  
+            - Your task is to determine whether the user has specified a clear **desired job role**.
 
-        [Instruction]  
-        1. If the user clearly mentions a **specific job title or role**, output `"yes"`.  
-        2. If the user speaks only in general terms (e.g., "looking for a job" without a specific role), output `"no"`.
-        3. You **must** return the result strictly in **valid JSON format** as shown below.
+            [Instruction]  
+            1. If the user clearly mentions a **specific job title or role**, output `"yes"`.  
+            2. If the user speaks only in general terms (e.g., "looking for a job" without a specific role), output `"no"`.
+            3. You **must** return the result strictly in **valid JSON format** as shown below.
 
-        [Output Format]  
-        "output": "..."
+            [Output Format]  
+            "output": "..."
 
-        [Examples]  
-        "input": "I am looking for a developer job."  
-        "output": "yes"
+            [Examples]  
+            "input": "I am looking for a developer job."  
+            "output": "yes"
 
-        "input": "I am looking for a job."  
-        "output": "no"
+            "input": "I am looking for a job."  
+            "output": "no"
 
-        "input": "I want to work in marketing."  
-        "output": "yes"
+            "input": "I want to work in marketing."  
+            "output": "yes"
 
-        "input": "I need employment."  
-        "output": "no"
+            "input": "I need employment."  
+            "output": "no"
 
-        """
+            """
+
+            prompt = ChatPromptTemplate.from_messages([
+                ("system", system_prompt ),
+                ("user", "{input}")
+            ])
 
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_prompt ),
-            ("user", "{input}")
-        ])
+            return prompt | llm | parser
 
-        chain = prompt | llm | parser
+        chain = get_chain("job_search.search_tag", build_chain)
 
-        def parse_product(description: str) -> dict:
-            result = chain.invoke({"input": description})
+        async def parse_product(description: str) -> dict:
+            result = await chain.ainvoke({"input": description})
             
             return result
 
         description = query
 
-        response = parse_product(description)
+        response = await parse_product(description)
     
         # 예외처리: 'output' 키가 없거나 값이 유효하지 않은 경우 기본값 설정
         if 'output' not in response or response['output'] not in ['yes', 'no']:
@@ -111,6 +107,7 @@ class agentic_job_search():
                     "state": "job_search",        # ✅ metadata 안에 포함
                     "results": "default"
                 },
+            "output_lang": source_lang,
             "url": None
             }
 
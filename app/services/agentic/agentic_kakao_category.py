@@ -0,0 +1,96 @@
+import re
+from typing import Dict, List, Optional, Tuple
+from loguru import logger
+from app.core.metrics import metrics
+
+# 카카오 로컬 API 카테고리 그룹 코드 (category_query 메뉴 순서)
+KAKAO_CATEGORY_CODES = (
+    "MT1", "CS2", "FD6", "CE7", "AT4", "AD5",
+    "OL7", "PK6", "SW8", "SC4", "AC5", "HP8",
+    "PM9", "AG2", "PO3"
+)
+
+# 카테고리 코드 → 키워드 / 동의어 (한국어, 영어, 일본어, 중국어)
+KAKAO_CATEGORY_KEYWORDS: Dict[str, List[str]] = {
+    "MT1": ["대형마트", "이마트", "홈플러스", "롯데마트", "코스트코", "슈퍼마켓", "supermarket", "hypermarket", "grocery store", "mart",
+            "スーパー", "超市", "大型超市"],
+    "CS2": ["편의점", "gs25", "cu", "세븐일레븐", "이마트24", "convenience store", "7-eleven", "コンビニ", "便利店"],
+    "FD6": ["음식점", "식당", "맛집", "밥집", "레스토랑", "restaurant", "food", "eatery", "diner", "レストラン", "飲食店", "食堂", "餐厅", "饭店", "美食"],
+    "CE7": ["카페", "커피숍", "커피", "스타벅스", "cafe", "café", "coffee", "starbucks", "カフェ", "喫茶店", "咖啡"],
+    "AT4": ["관광명소", "관광지", "명소", "가볼만한 곳", "tourist attraction", "attraction", "sightseeing", "landmark", "観光地", "名所", "景点", "旅游景点"],
+    "AD5": ["숙박", "숙소", "호텔", "모텔", "게스트하우스", "펜션", "hotel", "motel", "hostel", "accommodation", "lodging", "guesthouse",
+            "ホテル", "宿泊", "酒店", "宾馆", "住宿"],
+    "OL7": ["주유소", "충전소", "gas station", "petrol station", "charging station", "ev charger", "ガソリンスタンド", "充電", "加油站", "充电站"],
+    "PK6": ["주차장", "주차", "parking", "駐車場", "停车场"],
+    "SW8": ["지하철역", "지하철", "전철역", "subway", "metro", "subway station", "駅", "地下鉄", "地铁", "地铁站"],
+    "SC4": ["학교", "초등학교", "중학교", "고등학교", "대학교", "대학", "school", "university", "学校", "大学"],
+    "AC5": ["학원", "academy", "cram school", "tutoring", "塾", "补习班", "培训班"],
+    "HP8": ["병원", "의원", "치과", "한의원", "응급실", "hospital", "clinic", "dentist", "病院", "クリニック", "医院", "诊所"],
+    "PM9": ["약국", "pharmacy", "drugstore", "薬局", "ドラッグストア", "药店", "药房"],
+    "AG2": ["중개업소", "부동산", "공인중개사", "real estate", "realtor", "不動産", "房地产中介", "中介"],
+    "PO3": ["공공기관", "주민센터", "구청", "시청", "행정복지센터", "출입국", "우체국", "경찰서", "government office", "public office",
+            "city hall", "community center", "immigration office", "post office", "police station", "役所", "区役所", "政府机关", "公共机关"],
+}
+
+# category_query 메뉴 번호만 답한 경우 (예: "2", "1번", "10번이요", "no. 3")
+_MENU_NUMBER = re.compile(
+    r"^\s*(?:no\.?|number|#)?\s*(\d{1,2})\s*(?:번째|번|\.|\)|番|号)?\s*(?:이요|요|으로|으로요|해줘|해\s*주세요|please)?\s*[.!?~]*\s*$",
+    re.IGNORECASE
+)
+
+
+def _build_index() -> List[Tuple[re.Pattern, str]]:
+    """(패턴, 코드) 목록. 영문 키워드는 단어 경계로, 나머지는 부분 문자열로 매칭"""
+    index = []
+    for code, keywords in KAKAO_CATEGORY_KEYWORDS.items():
+        for keyword in keywords:
+            escaped = re.escape(keyword.lower())
+            pattern = rf"(?<![a-z0-9]){escaped}(?![a-z0-9])" if keyword.isascii() else escaped
+            index.append((re.compile(pattern), code))
+    return index
+
+
+_KEYWORD_INDEX = _build_index()
+
+
+def menu_number_category(text: str) -> Optional[str]:
+    """메뉴 번호(1~15)만 입력한 경우 해당 카테고리 코드를 반환합니다."""
+    match = _MENU_NUMBER.match(text)
+    if not match:
+        return None
+    number = int(match.group(1))
+    return KAKAO_CATEGORY_CODES[number - 1] if 1 <= number <= len(KAKAO_CATEGORY_CODES) else None
+
+
+def keyword_category(text: str) -> Optional[str]:
+    """
+    키워드 / 동의어 사전으로 카테고리 코드를 찾습니다.
+    - 더 긴 키워드 안에 포함된 매칭은 무시 (예: "이마트24" 안의 "이마트")
+    - 남은 매칭이 서로 다른 코드를 가리키면 None
+      ("지하철역 근처 약국" 처럼 다른 장소를 기준점으로 언급한 경우는 LLM 이 판단)
+    """
+    text = " ".join(text.lower().split())
+    matches = [(match.start(), match.end(), code) for pattern, code in _KEYWORD_INDEX for match in pattern.finditer(text)]
+    codes = {
+        code for start, end, code in matches
+        if not any(other_start <= start and end <= other_end and other_end - other_start > end - start
+                   for other_start, other_end, _ in matches)
+    }
+    return next(iter(codes)) if len(codes) == 1 else None
+
+
+def resolve_kakao_category(text: str) -> Optional[str]:
+    """
+    사용자 입력을 카카오 카테고리 코드로 바로 변환합니다. (메뉴 번호 → 키워드 순)
+
+    Returns:
+        Optional[str]: 카테고리 코드, 사전으로 판단할 수 없으면 None (LLM 분류 필요)
+    """
+    text = str(text or "").strip()
+    code = (menu_number_category(text) or keyword_category(text)) if text else None
+
+    metrics.incr("kakao_category.dictionary.hit" if code else "kakao_category.dictionary.miss")
+    hits = metrics.get("kakao_category.dictionary.hit")
+    total = hits + metrics.get("kakao_category.dictionary.miss")
+    logger.info(f"[KAKAO_CATEGORY] 사전 분류: {text} → {code} (적중률 {hits / total:.1%}, {hits}/{total})")
+    return code
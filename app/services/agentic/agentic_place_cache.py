@@ -0,0 +1,214 @@
+import asyncio
+import copy
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from loguru import logger
+from app.core.metrics import metrics
+
+# 사용자 위치 기준 검색 반경 (m)
+KAKAO_SEARCH_RADIUS = int(os.getenv("KAKAO_SEARCH_RADIUS", "3000"))
+# geohash 격자 정밀도 (6자리 ≈ 1.2km x 0.6km) / 격자별 결과 유지 시간 (초) / 최대 보관 격자 수
+PLACE_CACHE_GEOHASH_PRECISION = int(os.getenv("PLACE_CACHE_GEOHASH_PRECISION", "6"))
+PLACE_CACHE_TTL = float(os.getenv("PLACE_CACHE_TTL", "21600"))
+PLACE_CACHE_MAX_TILES = int(os.getenv("PLACE_CACHE_MAX_TILES", "2048"))
+# 격자를 채울 때 조회할 최대 페이지 수 (카카오 페이지당 최대 15곳)
+PLACE_CACHE_MAX_PAGES = int(os.getenv("PLACE_CACHE_MAX_PAGES", "3"))
+
+# 카카오 로컬 API 최대 검색 반경 (m)
+KAKAO_MAX_RADIUS = 20000
+EARTH_RADIUS_M = 6371008.8
+_GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# 카카오 검색 함수: (중심 위도, 중심 경도, 반경 m, 페이지) → (거리순 documents, 마지막 페이지 여부)
+PlaceFetch = Callable[[float, float, int, int], Awaitable[Tuple[List[Dict[str, Any]], bool]]]
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int) -> str:
+    """좌표를 geohash 문자열로 변환합니다."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    cell, bits, value, even = [], 0, 0, True
+    while len(cell) < precision:
+        target, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (target[0] + target[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            target[0] = middle
+        else:
+            target[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            cell.append(_GEOHASH_BASE32[value])
+            bits, value = 0, 0
+    return "".join(cell)
+
+
+def geohash_bounds(cell: str) -> Tuple[float, float, float, float]:
+    """geohash 격자의 (최소 위도, 최대 위도, 최소 경도, 최대 경도)를 반환합니다."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in cell:
+        value = _GEOHASH_BASE32.index(char)
+        for shift in range(4, -1, -1):
+            target = lon_range if even else lat_range
+            middle = (target[0] + target[1]) / 2
+            if value >> shift & 1:
+                target[0] = middle
+            else:
+                target[1] = middle
+            even = not even
+    return lat_range[0], lat_range[1], lon_range[0], lon_range[1]
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """두 좌표 사이의 거리 (m)"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi, d_lambda = phi2 - phi1, math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+class PlaceTile:
+    """한 격자의 검색 결과"""
+
+    def __init__(self, center: Tuple[float, float], documents: List[Dict[str, Any]], complete: bool):
+        self.center = center
+        self.documents = documents
+        # 마지막 페이지까지 받았으면 반경 안의 장소가 모두 포함됨
+        self.complete = complete
+        # 거리순으로 받았으므로 격자 중심에서 이 거리 안의 장소는 모두 포함됨
+        self.coverage = max((_distance_to(document, *center) for document in documents), default=0.0)
+        self.fetched_at = time.monotonic()
+
+
+def _distance_to(document: Dict[str, Any], latitude: float, longitude: float) -> float:
+    try:
+        return haversine_m(latitude, longitude, float(document["y"]), float(document["x"]))
+    except (KeyError, TypeError, ValueError):
+        return math.inf
+
+
+class PlaceSearchCache:
+    """
+    카카오 로컬 검색 결과 공간 캐시
+    - (geohash 격자, 카테고리 코드, 키워드) 단위로 격자 중심 기준 검색 결과를 보관
+    - 격자 중심에서 (검색 반경 + 격자 반대각선) 으로 거리순 검색, 최대 PLACE_CACHE_MAX_PAGES 페이지까지 조회
+    - 반환 시 실제 사용자 위치와의 거리로 다시 계산 / 필터링 / 정렬
+    - 마지막 페이지까지 받지 못한 격자는 사용자에게 가까운 장소가 빠졌을 수 있으므로,
+      받은 범위로 사용자 기준 상위 결과가 확정될 때만 사용하고 아니면 사용자 위치에서 직접 검색
+    - TTL / LRU 로 보관 격자 수 제한, 같은 격자를 동시에 조회하면 요청 하나로 합침
+    """
+
+    def __init__(self, precision: int = PLACE_CACHE_GEOHASH_PRECISION, ttl: float = PLACE_CACHE_TTL, max_tiles: int = PLACE_CACHE_MAX_TILES, radius: int = KAKAO_SEARCH_RADIUS, max_pages: int = PLACE_CACHE_MAX_PAGES):
+        self.precision = precision
+        self.ttl = ttl
+        self.max_tiles = max_tiles
+        self.radius = radius
+        self.max_pages = max_pages
+        self._tiles: "OrderedDict[Tuple[str, str, str], PlaceTile]" = OrderedDict()
+        self._pending: Dict[Tuple[str, str, str], asyncio.Future] = {}
+
+    @property
+    def tile_count(self) -> int:
+        return len(self._tiles)
+
+    def _store(self, key: Tuple[str, str, str], tile: PlaceTile) -> None:
+        if key not in self._tiles:
+            metrics.incr("place_cache.tiles")
+        self._tiles[key] = tile
+        self._tiles.move_to_end(key)
+        while len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+            metrics.incr("place_cache.tiles", -1)
+            metrics.incr("place_cache.evicted")
+
+    async def _fetch_pages(self, fetch: PlaceFetch, latitude: float, longitude: float, radius: int, max_pages: int) -> Tuple[List[Dict[str, Any]], bool]:
+        documents, is_end = [], False
+        for page in range(1, max_pages + 1):
+            page_documents, is_end = await fetch(latitude, longitude, radius, page)
+            documents.extend(page_documents)
+            if is_end or not page_documents:
+                return documents, True
+        return documents, is_end
+
+    async def _fetch_tile(self, key: Tuple[str, str, str], fetch: PlaceFetch) -> PlaceTile:
+        lat_min, lat_max, lon_min, lon_max = geohash_bounds(key[0])
+        center_lat, center_lon = (lat_min + lat_max) / 2, (lon_min + lon_max) / 2
+        radius = min(KAKAO_MAX_RADIUS, math.ceil(self.radius + haversine_m(center_lat, center_lon, lat_max, lon_max)))
+        documents, complete = await self._fetch_pages(fetch, center_lat, center_lon, radius, self.max_pages)
+        tile = PlaceTile((center_lat, center_lon), documents, complete)
+        self._store(key, tile)
+        return tile
+
+    def _nearby(self, documents: List[Dict[str, Any]], latitude: float, longitude: float, within: Optional[float] = None) -> List[Dict[str, Any]]:
+        """사용자 위치 기준 반경 내 장소를 거리순으로 반환합니다. (distance 는 카카오 응답과 같은 m 단위 문자열)"""
+        within = self.radius if within is None else min(self.radius, within)
+        places = []
+        for document in documents:
+            distance = _distance_to(document, latitude, longitude)
+            if distance <= within:
+                places.append((distance, {**copy.deepcopy(document), "distance": str(round(distance))}))
+        places.sort(key=lambda place: place[0])
+        return [place for _, place in places]
+
+    def _from_tile(self, tile: PlaceTile, latitude: float, longitude: float, limit: Optional[int]) -> Optional[List[Dict[str, Any]]]:
+        """격자 결과로 사용자 기준 상위 limit 곳이 확정되면 반환하고, 아니면 None"""
+        if tile.complete:
+            return self._nearby(tile.documents, latitude, longitude)[:limit]
+        # 받지 못한 장소는 격자 중심에서 coverage 보다 멀리 있으므로 사용자에게서 safe 보다 멂
+        safe = tile.coverage - haversine_m(latitude, longitude, *tile.center)
+        places = self._nearby(tile.documents, latitude, longitude, within=safe)
+        if safe >= self.radius or (limit is not None and len(places) >= limit):
+            return places[:limit]
+        return None
+
+    async def search(self, fetch: PlaceFetch, latitude: float, longitude: float, category: str, keyword: str = "", limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        사용자 위치 주변 장소를 거리순으로 반환합니다.
+
+        Args:
+            fetch: 카카오 검색 함수 (중심 위도, 중심 경도, 반경 m, 페이지) → (거리순 documents, 마지막 페이지 여부)
+            category: 카카오 카테고리 그룹 코드
+            keyword: 키워드 검색어 (카테고리 검색이면 빈 문자열)
+            limit: 반환할 최대 장소 수 (None 이면 반경 안 전체)
+        """
+        key = (geohash_encode(latitude, longitude, self.precision), category, " ".join(keyword.lower().split()))
+        tile = self._tiles.get(key)
+        if tile is not None and time.monotonic() - tile.fetched_at < self.ttl:
+            self._tiles.move_to_end(key)
+            metrics.incr("place_cache.hit")
+        else:
+            pending = self._pending.get(key)
+            if pending is None:
+                metrics.incr("place_cache.miss")
+                pending = self._pending[key] = asyncio.ensure_future(self._fetch_tile(key, fetch))
+                pending.add_done_callback(lambda future: self._pending.pop(key, None) if self._pending.get(key) is future else None)
+            else:
+                metrics.incr("place_cache.coalesced")
+            tile = await asyncio.shield(pending)
+
+        hits = metrics.get("place_cache.hit")
+        total = hits + metrics.get("place_cache.miss")
+        logger.info(f"[PLACE_CACHE] {key} → {len(tile.documents)}곳 (완전: {tile.complete}, 적중률 {hits / total:.1%}, 격자 {self.tile_count}개)")
+
+        places = self._from_tile(tile, latitude, longitude, limit)
+        if places is not None:
+            return places
+
+        # 격자 결과로 확정할 수 없으면 사용자 위치에서 직접 검색 (캐시하지 않음)
+        metrics.incr("place_cache.user_point_fallback")
+        documents, _ = await self._fetch_pages(fetch, latitude, longitude, self.radius, 1)
+        return self._nearby(documents, latitude, longitude)[:limit]
+
+    def clear(self) -> None:
+        metrics.incr("place_cache.tiles", -len(self._tiles))
+        self._tiles.clear()
+        self._pending.clear()
+
+
+# 전역 장소 검색 캐시 인스턴스
+place_search_cache = PlaceSearchCache()
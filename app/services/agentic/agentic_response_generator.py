@@ -1,7 +1,9 @@
-from typing import Dict, Any
+from typing import Dict, Any, FrozenSet, Optional, AsyncIterator
 from loguru import logger
 from app.core.llm_client import get_llm_client
 from app.services.agentic.agentic_classifier import AgentType
+from app.models.agentic_response import SubIntent
+from app.services.agentic.agentic_context import RequestContext
 from app.services.agentic.agentic_calendar import AgenticCalendar
 from app.services.agentic.agentic_post import AgenticPost
 from app.services.agentic.agentic_find_foodstore import foodstore
@@ -16,6 +18,66 @@ from app.services.agentic.agentic_eum_image import agentic_eum_image
 from types import SimpleNamespace
 import json
 
+# 멀티턴 진행 중인 state → 담당 에이전트 (state 만으로 라우팅되므로 분류가 필요 없음)
+STATE_ROUTES: Dict[str, AgentType] = {
+    # 이력서 (답변을 LLM 으로 한국어로 번역해 저장하므로 원문 언어와 무관)
+    "education": AgentType.RESUME,
+    "certifications": AgentType.RESUME,
+    "career": AgentType.RESUME,
+    "complete": AgentType.RESUME,
+    # 자소서 (답변을 LLM 이 한국어 문단으로 다시 작성하므로 원문 언어와 무관)
+    "growth": AgentType.COVER_LETTER,
+    "motivation": AgentType.COVER_LETTER,
+    "experience": AgentType.COVER_LETTER,
+    "plan": AgentType.COVER_LETTER,
+    "complete_letter": AgentType.COVER_LETTER,
+    # 잡서치 (LLM 이 한국어 검색어로 다시 작성하므로 원문 언어와 무관)
+    "job_search": AgentType.JOB_SEARCH,
+    # 위치 찾기 (카테고리 사전 / 카카오 키워드 검색에 원문을 그대로 사용 → TRANSLATED_STATES)
+    "location_category": AgentType.LOCATION,
+}
+
+# 원문을 그대로 쓸 수 없어 영어 번역이 필요한 state
+# (카카오 키워드 검색은 한국어 / 영어 외의 키워드를 찾지 못함)
+TRANSLATED_STATES = frozenset({"location_category"})
+# TRANSLATED_STATES 에서도 번역 없이 원문을 사용하는 언어
+STATE_ROUTE_NATIVE_LANGS = frozenset({"ko", "en"})
+
+
+def resolve_state_route(state: Optional[str]) -> Optional[AgentType]:
+    """state 만으로 라우팅되는 턴이면 담당 에이전트 유형을, 아니면 None 을 반환합니다."""
+    return STATE_ROUTES.get(state) if state else None
+
+
+def state_route_needs_translation(state: Optional[str], source_lang: Optional[str]) -> bool:
+    """state 로 라우팅되는 턴의 원문을 영어로 번역해서 전달해야 하는지 반환합니다."""
+    return state in TRANSLATED_STATES and source_lang not in STATE_ROUTE_NATIVE_LANGS
+
+
+# 에이전트 유형 → 요청 컨텍스트에서 사용하는 외부 입력 (각 에이전트의 DEPENDENCIES 선언)
+AGENT_DEPENDENCIES: Dict[AgentType, FrozenSet[str]] = {
+    AgentType.RESUME: AgenticResume.DEPENDENCIES,
+    AgentType.COVER_LETTER: AgenticCoverLetter.DEPENDENCIES,
+    AgentType.POST: AgenticPost.DEPENDENCIES,
+    AgentType.LOCATION: foodstore.DEPENDENCIES,
+    AgentType.WEATHER: Weather.DEPENDENCIES,
+    AgentType.EVENT: EVENT.DEPENDENCIES,
+}
+
+# 분류 전에 미리 조회할 항목 (위치 / 날씨 / 이벤트 / 게시글 에이전트가 공통으로 사용)
+SPECULATIVE_DEPENDENCIES: FrozenSet[str] = frozenset().union(
+    *(AGENT_DEPENDENCIES[agent_type] for agent_type in (AgentType.LOCATION, AgentType.WEATHER, AgentType.EVENT, AgentType.POST))
+)
+
+
+def agent_dependencies(agentic_type: Optional[str]) -> FrozenSet[str]:
+    """에이전트 유형이 사용하는 외부 입력 목록을 반환합니다. (없거나 알 수 없는 유형이면 빈 집합)"""
+    try:
+        return AGENT_DEPENDENCIES.get(AgentType(agentic_type), frozenset())
+    except ValueError:
+        return frozenset()
+
+
 class AgenticResponseGenerator:
     """에이전틱 응답 생성기"""
     
@@ -33,16 +95,23 @@ class AgenticResponseGenerator:
         self.dog_search = RandomDog()
         self.cat_information = Cat_Infromation()
         self.eum_image = agentic_eum_image()
-        # 사용자별 상태 관리
-        self.user_states = {}
+        # 에이전트 인스턴스는 모든 요청이 공유하므로 요청별 데이터는 RequestContext 로만 전달
         logger.info(f"[에이전틱 응답] 고성능 모델 사용: {self.llm_client.model}")
     
 
-    async def generate_response(self, original_query:str, query: str, agentic_type: AgentType, uid: str, token: str, state: str, source_lang: str, live_location: str) -> Dict[str, Any]:
-        """응답을 생성합니다."""
+    async def generate_response(self, original_query:str, query: str, agentic_type: AgentType, state: str, context: RequestContext, sub_intent: Optional[SubIntent] = None) -> Dict[str, Any]:
+        """
+        응답을 생성합니다.
+
+        Args:
+            context: 요청 컨텍스트 (uid, token, 실시간 위치, 사용자 언어, 사용자 정보)
+            sub_intent: 분류 단계에서 함께 추출한 하위 의도 (있는 항목은 에이전트의 후속 분류 호출을 생략)
+        """
+        uid, token, source_lang, live_location = context.uid, context.token, context.source_lang, context.location
+        sub_intent = sub_intent or SubIntent()
         try:
             logger.info(f"[live_location] : {live_location}")
-            if state not in ["education", "certifications", "career", "complete","growth", "motivation", "experience", "plan","complete_letter","job_search","location_category"]:
+            if resolve_state_route(state) is None:
                 state = "initial"
 
             # 이력서 기능 즉시 라우팅
@@ -65,11 +134,11 @@ class AgenticResponseGenerator:
                 # 1. 카테고리추출
                 category_code = await self.TEST.Category_extraction(query)
                 # 2. 사용자정보불러오는중
-                await self.TEST.load_user_data(token)
+                await self.TEST.load_user_data(context)
 
                 # 3. 사용자 위치 확인
                 if not live_location:
-                    location = await self.TEST.location()
+                    location = await self.TEST.location(context)
                 else:
                     location = live_location   
 
@@ -99,7 +168,7 @@ class AgenticResponseGenerator:
                     )
                 
                 # 6. AI 매칭 (예정)
-                location_ai = await self.TEST.ai_match(food_store,query)
+                location_ai = await self.TEST.ai_match(food_store,query,context)
                     
                 # 7. 응답 반환
                 return {
@@ -118,7 +187,7 @@ class AgenticResponseGenerator:
             # 캘린더 응답 > 수정 완료
             if agentic_type == AgentType.CALENDAR:
                 logger.info(f"[CALENDAR 기능 초기화중...]")
-                agentic_calendar = self._generate_calendar_response(query,uid,token)
+                agentic_calendar = self._generate_calendar_response(query,uid,token,sub_intent.calendar_action,original_query)
                 return await agentic_calendar
             
             # EUM 이미지
@@ -199,19 +268,22 @@ class AgenticResponseGenerator:
             # 행사 서치
             elif agentic_type == AgentType.EVENT:
                 logger.info(f"[EVENTSEARCH]")
-                response = await self.event_search.google_search(query,source_lang,token,live_location)
+                response = await self.event_search.google_search(query,context)
                 logger.info(f"[EVENTSEARCH_statecheck] : {response}")
                 return response
             
             # 날씨 서치
             elif agentic_type == AgentType.WEATHER:
                 logger.info(f"[WEATHERSEARCH]")
-                response = await self.weather_search.weather_google_search(query,token,live_location)
+                response = await self.weather_search.weather_google_search(query,context)
                 return response
             
             # 잡서치
             elif agentic_type == AgentType.JOB_SEARCH:
-                tag = await self.job_search.search_tag(query)
+                if sub_intent.job_role is not None:
+                    tag = "yes" if sub_intent.job_role else "no"
+                else:
+                    tag = await self.job_search.search_tag(query)
                 if tag == "yes":
                     result = await self.job_search.google_search(query,source_lang)                
                     return result
@@ -224,7 +296,7 @@ class AgenticResponseGenerator:
             # 게시판 응답 > 수정 완료 
             elif agentic_type == AgentType.POST:
                 logger.info("[1. 사용자 질문 받음]")  
-                Post_Response = await self._generate_post_response(token, original_query, query,live_location)
+                Post_Response = await self._generate_post_response(context, original_query, query)
                 Post_Response = json.loads(Post_Response)
                 return {
                     "response": f""" 
@@ -239,6 +311,7 @@ class AgenticResponseGenerator:
                         "state": "post_state"
                     },
                     "state": "post_state",
+                    "output_lang": "ko",  # 게시글은 한국어로 작성됨
                     "url": None  # null → None (Python 문법)
                 }
                 
@@ -251,7 +324,10 @@ class AgenticResponseGenerator:
             # 자소서 응답
             elif agentic_type == AgentType.COVER_LETTER:
                 # 0. 태그 생성
-                cover_letter_tag = await self.cover_letter.ask_job_category(query)
+                if sub_intent.job_role is not None:
+                    cover_letter_tag = {"tag": "yes" if sub_intent.job_role else "no", "want": sub_intent.desired_field or query}
+                else:
+                    cover_letter_tag = await self.cover_letter.ask_job_category(query)
                 if cover_letter_tag['tag']== "yes" : 
                     # 1. 질문 & 이력서 생성
                     result = await self.cover_letter.first_query(query, uid, token, state, source_lang, cover_letter_tag['want'])
@@ -261,6 +337,7 @@ class AgenticResponseGenerator:
                     "response": "원하시는 직업이나 분야가 있을까요? 그에 맞춰 자기소개서를 도와드릴게요.",
                     "metadata": {"source": "default","state":"growth"},
                     "state": "growth",
+                    "output_lang": "ko",
                     "url": None
                 }
                 
@@ -269,19 +346,25 @@ class AgenticResponseGenerator:
             elif agentic_type == AgentType.LOCATION:
                 logger.info("[위치찾기 실행중...]")
 
-                # 0 즉시 라우팅이 필요한지 체크
-                check = await self.TEST.query_analyze(query)
+                # 0 즉시 라우팅이 필요한지 체크 (분류 결과에 태그와 의도가 모두 있을 때만 재사용)
+                if sub_intent.location_tag is not None and sub_intent.location_intention:
+                    check = {"intention": sub_intent.location_intention, "tag": sub_intent.location_tag}
+                else:
+                    check = await self.TEST.query_analyze(query)
                 
                 logger.info(f"[check] : {check}")
                 if check['tag'] == "Find" : 
                     # 1. 카테고리추출
-                    category_code = await self.TEST.Category_extraction(query)
+                    if sub_intent.kakao_category is not None:
+                        category_code = {"input": query, "output": sub_intent.kakao_category}
+                    else:
+                        category_code = await self.TEST.Category_extraction(query)
                     # 2. 사용자정보불러오는중
-                    await self.TEST.load_user_data(token)
+                    await self.TEST.load_user_data(context)
 
                     # 3. 사용자 위치 확인
                     if not live_location:
-                        location = await self.TEST.location()
+                        location = await self.TEST.location(context)
                     else:
                         location = live_location   
                     
@@ -313,7 +396,7 @@ class AgenticResponseGenerator:
                         )
 
                     # 6. AI 매칭 (예정)
-                    location_ai = await self.TEST.ai_match(food_store,check['intention'])
+                    location_ai = await self.TEST.ai_match(food_store,check['intention'],context)
                     
                     # 7. 응답 반환
                     return {
@@ -344,6 +427,7 @@ class AgenticResponseGenerator:
                             "location": "default",
                             "results": "default"
                         },
+                        "output_lang": source_lang,  # 카테고리 질문은 사용자 언어로 생성됨
                         "url": None
                     }
                     
@@ -384,11 +468,16 @@ class AgenticResponseGenerator:
                 }
             }
     
-    async def _generate_calendar_response(self, query: str, uid: str, token: str) -> Dict[str, Any]:
+    async def stream_general_response(self, query: str) -> AsyncIterator[str]:
+        """일반 응답을 생성되는 대로 조각 단위로 반환합니다. (SSE 스트리밍용)"""
+        async for chunk in self.llm_client.generate_stream(query):
+            yield chunk
+    
+    async def _generate_calendar_response(self, query: str, uid: str, token: str, classification: Optional[str] = None, original_query: Optional[str] = None) -> Dict[str, Any]:
         """캘린더 관리 응답을 생성합니다."""
         try:
             logger.info(f"[CALENDAR 응답] : CALENDAR")
-            response = self.calendar_agent.Calendar_function(query,token)
+            response = await self.calendar_agent.Calendar_function(query,token,classification,original_query)
             logger.info(f"[CALENDAR response]  { response }")
             return response
         except Exception as e:
@@ -403,13 +492,13 @@ class AgenticResponseGenerator:
             }
 ############################################################################# 게시판 생성 기능  
 
-    async def _generate_post_response(self, token, original_query, query,live_location) -> Dict[str,Any]:
+    async def _generate_post_response(self, context: RequestContext, original_query, query) -> Dict[str,Any]:
         """ 게시판 생성 기능 """
         
         # 1. 카테고리 반환 단계
         logger.info("[1. 카테고리 반환 단계]: 대분류, 소분류 추출 시도")
         logger.info(f"[1. 카테고리 반환 단계]: {query}")
-        post_first_response = await self.post_agent.first_query(token, query)
+        post_first_response = await self.post_agent.first_query(context.token, query)
         
         category = post_first_response['category']
         tags = post_first_response['tags']
@@ -417,7 +506,7 @@ class AgenticResponseGenerator:
         
         # 2. 게시판 생성 단계
         logger.info(f"[게시판 생성 단계] : {category} {tags}")
-        post_second_response = await self.post_agent.second_query(token, original_query, category, tags,live_location)
+        post_second_response = await self.post_agent.second_query(context, original_query, category, tags)
         logger.info(f"[post_second_response] : {post_second_response}")
         
         
@@ -1,13 +1,15 @@
 
+import asyncio
 from loguru import logger
 import json
 import os
-from app.core.llm_client import get_llm_client,get_langchain_llm
+from app.core.llm_client import get_llm_client,get_langchain_llm,get_chain
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from app.core.llm_post_prompt import Prompt
 from app.services.common.user_information_resume import User_Information_Resume
-from app.services.common.user_information import User_Api
+from app.services.agentic.agentic_context import PROFILE, PREFERENCE
+from app.services.common.user_profile_service import user_profile_service
 from app.services.common.user_pdf import UserPDF
 from app.services.common.user_s3 import UserS3
 
@@ -26,11 +28,13 @@ from app.services.common.user_s3 import UserS3
 
 
 class AgenticResume():
+    # 이력서 생성 시 사용하는 사용자 정보 (미리 조회하면 user_profile_service 캐시로 재사용)
+    DEPENDENCIES = frozenset({PROFILE, PREFERENCE})
+
     def __init__(self):
         self.prompt = Prompt()  # ✅ 여기서 선언
         self.user_information = User_Information_Resume()
         self.llm = get_llm_client()
-        self.user_api = User_Api()
         self.user_pdf = UserPDF()
         self.user_s3 = UserS3()
 
@@ -60,6 +64,7 @@ class AgenticResume():
                     "source": "default",
                     "state": state         # ✅ metadata 안에 포함
                 },
+                "output_lang": source_lang,  # 질문은 사용자 언어로 생성됨
                 "url": None
             }
 
@@ -83,6 +88,7 @@ class AgenticResume():
                     "source": "default",
                     "state": state         # ✅ metadata 안에 포함
                 },
+                "output_lang": source_lang,
                 "url": None
             }
         
@@ -105,6 +111,7 @@ class AgenticResume():
                     "source": "default",
                     "state": state         # ✅ metadata 안에 포함
                 },
+                "output_lang": source_lang,
                 "url": None
             }
         
@@ -144,6 +151,7 @@ class AgenticResume():
                     "source": "default",
                     "state": "resume_service_state"         # ✅ metadata 안에 포함
                 },
+                "output_lang": source_lang,
                 "url": url
             }
 
@@ -155,38 +163,43 @@ class AgenticResume():
                     "source": "default",
                     "state": "initial"         # ✅ metadata 안에 포함
                 },
+                "output_lang": "ko",
                 "url": url
             }
         
     async def make_html_ai(self,token,uid):
 
-        llm = get_langchain_llm(is_lightweight = False)
+        def build_chain():
+            llm = get_langchain_llm(is_lightweight = False)
+
+            parser = JsonOutputParser(pydantic_object={
+                "type": "object",
+                "properties": {
+                    "title": {"type":"string"},
+                }
+            })
 
-        parser = JsonOutputParser(pydantic_object={
-            "type": "object",
-            "properties": {
-                "title": {"type":"string"},
-            }
-        })
 
+            system_prompt = Prompt.make_html_ai_prompt()
 
-        system_prompt = Prompt.make_html_ai_prompt()
+            prompt = ChatPromptTemplate.from_messages([
+                ("system", system_prompt),
+                ("user", "{collected_user_data}")
+            ])
 
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_prompt),
-            ("user", "{collected_user_data}")
-        ])
+            return prompt | llm | parser
 
-        chain = prompt | llm | parser
+        chain = get_chain("resume.make_html", build_chain)
 
-        def parse_product(description: str) -> dict:
-            result = chain.invoke({"collected_user_data": description})  # ✅ 이름 일치
+        async def parse_product(description: str) -> dict:
+            result = await chain.ainvoke({"collected_user_data": description})  # ✅ 이름 일치
             logger.info(f"[AI가 반환한값] {json.dumps(result, indent=2, ensure_ascii=False)}")
             return result
         
-        collected_user_data = await self.user_information.all(uid)
-        user_info= await self.user_api.user_api(token)
-        preference_info=await self.user_api.user_prefer_api(token)
+        collected_user_data, (user_info, preference_info) = await asyncio.gather(
+            self.user_information.all(uid),
+            user_profile_service.profile_and_preference(token)
+        )
 
         description = f"""
         Collected user information : {collected_user_data} 
@@ -194,38 +207,42 @@ class AgenticResume():
         Saved user information_2 : {preference_info} """ # +  토큰 새로받으면 추가할로직
         logger.info(f"[수집한 정보] {description}")
 
-        response = parse_product(description)
+        response = await parse_product(description)
 
         return response["html"]
     
     async def make_user_data(self,uid,token):
 
-        llm = get_langchain_llm(is_lightweight = False)
+        def build_chain():
+            llm = get_langchain_llm(is_lightweight = False)
 
-        parser = JsonOutputParser(pydantic_object={
-            "type": "object",
-            "properties": {
-                "title": {"type":"string"},
-            }
-        })
+            parser = JsonOutputParser(pydantic_object={
+                "type": "object",
+                "properties": {
+                    "title": {"type":"string"},
+                }
+            })
+
+            system_prompt = Prompt.make_user_data()
 
-        system_prompt = Prompt.make_user_data()
+            prompt = ChatPromptTemplate.from_messages([
+                ("system", system_prompt),
+                ("user", "{input}")
+            ])
 
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_prompt),
-            ("user", "{input}")
-        ])
+            return prompt | llm | parser
 
-        chain = prompt | llm | parser
+        chain = get_chain("resume.make_user_data", build_chain)
 
-        def parse_product(description: str) -> dict:
-            result = chain.invoke({"input": description})  # ✅ 이름 일치
+        async def parse_product(description: str) -> dict:
+            result = await chain.ainvoke({"input": description})  # ✅ 이름 일치
             logger.info(f"[AI가 반환한값] {json.dumps(result, indent=2, ensure_ascii=False)}")
             return result
         
-        collected_user_data = await self.user_information.all(uid)
-        user_info= await self.user_api.user_api(token)
-        preference_info=await self.user_api.user_prefer_api(token)
+        collected_user_data, (user_info, preference_info) = await asyncio.gather(
+            self.user_information.all(uid),
+            user_profile_service.profile_and_preference(token)
+        )
 
         description = f"""
         Collected user information : {collected_user_data} 
@@ -234,7 +251,7 @@ class AgenticResume():
         
         logger.info(f"[수집한 정보] {description}")
         
-        response = parse_product(description)
+        response = await parse_product(description)
 
         return response
 
@@ -1,102 +1,95 @@
 from googleapiclient.discovery import build
 from dotenv import load_dotenv
 from loguru import logger
-from app.core.llm_client import get_llm_client,get_langchain_llm
-from app.services.common.user_information import User_Api
+from app.core.llm_client import get_llm_client,get_langchain_llm,get_chain
+from app.services.agentic.agentic_context import RequestContext, PROFILE, PREFERENCE, LOCATION_INFO
+import asyncio
 import os
 import requests
 from bs4 import BeautifulSoup
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
-from app.services.common.search_location import search_location
 import json
 load_dotenv()  # .env 파일을 읽어서 환경변수로 등록
 
 
 class Weather():
+    # 요청 컨텍스트에서 사용하는 외부 입력 (분류와 동시에 미리 조회)
+    DEPENDENCIES = frozenset({PROFILE, PREFERENCE, LOCATION_INFO})
+
     def __init__(self):
         self.api_key = os.getenv("GOOGLE_SEARCH_WEATHER_API_KEY")
         self.search_engine_id = os.getenv("GOOGLE_SEARCH_WEATHER_ENGINE_ID")
-        self.user_information = User_Api()
-        self.user_information_data = ""
-        self.user = ""
-        self.user_prefer = ""
         self.llm = get_llm_client(is_lightweight=True)  # ✅ 추가된 부분
-        self.search_live_location = search_location()
 
-    async def weather_google_search(self, query,token,live_location):
+    async def weather_google_search(self, query, context: RequestContext):
         logger.info("[구글 서치중...]")
         service = build("customsearch", "v1", developerKey=self.api_key)
 
         # 사용자 정보불러옴
         logger.info("[사용자 정보 불러오는중...]")
-        self.user = await self.user_information.user_api(token)
-        self.user_prefer = await self.user_information.user_prefer_api(token)
+        user, user_prefer = await asyncio.gather(context.user_profile(), context.user_preference())
         
         # 유저 위치 정보 수집
         logger.info("[유저 위치 정보 수집...]")
-        logger.info(f"[live_location] : {live_location}")
-
-        if live_location is None or not (getattr(live_location, "latitude", None) and getattr(live_location, "longitude", None)):
-            logger.warning("[WARNING] live_location이 유효하지 않아 사용자 정보 기반으로 fallback 처리합니다.")
-            self.user_information_data = await self.user_information.user_api(token)
-            if not self.user_information_data.get("address"):
-                self.user_information_data["address"] = "서울 중구"
-        else:
-            self.user_information_data = self.search_live_location.search(live_location)
+        logger.info(f"[live_location] : {context.location}")
+        user_information_data = await context.location_info(default_address="서울 중구")
 
-        logger.info(f"[user_information_location] : {self.user_information_data}")
+        logger.info(f"[user_information_location] : {user_information_data}")
 
     
         
         # self.user_information_data['address']
 
-        llm = get_langchain_llm(is_lightweight=False)  # 고성능 모델 사용
-
-        parser = JsonOutputParser(pydantic_object={
-            "type": "object",
-            "properties": {
-                "input": {"type": "string"},
-                "output": {"type": "string"},
-            }
-        })
-        prompt = ChatPromptTemplate.from_messages([
-        ("system",f"""
-        Extract the region name from the user's input and match it to one of the following values:
-        [서울, 부산, 대구, 인천, 광주, 대전, 울산, 세종, 경기도, 강원도, 충청북도, 충청남도, 전라북도, 전라남도, 경상북도, 경상남도, 제주도]
-
-        1. If the user's input contains a region, return the matching region name.
-        2. PRIORTIZE FIRST INSTRUCTION.
-        3. RESPONSE MUST BE VALUE, NOT NATURAL LANGUAGE.
-        default. If there is no location information in user_input, use the location of default_location. 
+        def build_chain():
+            llm = get_langchain_llm(is_lightweight=False)  # 고성능 모델 사용
+
+            parser = JsonOutputParser(pydantic_object={
+                "type": "object",
+                "properties": {
+                    "input": {"type": "string"},
+                    "output": {"type": "string"},
+                }
+            })
+            prompt = ChatPromptTemplate.from_messages([
+            ("system",f"""
+            Extract the region name from the user's input and match it to one of the following values:
+            [서울, 부산, 대구, 인천, 광주, 대전, 울산, 세종, 경기도, 강원도, 충청북도, 충청남도, 전라북도, 전라남도, 경상북도, 경상남도, 제주도]
+
+            1. If the user's input contains a region, return the matching region name.
+            2. PRIORTIZE FIRST INSTRUCTION.
+            3. RESPONSE MUST BE VALUE, NOT NATURAL LANGUAGE.
+            default. If there is no location information in user_input, use the location of default_location. 
          
-        [format]
-        "output":"str"
+            [format]
+            "output":"str"
         
-        [one-shot-example]
-        input : 
-            user_input : <query>  + default_location : <user_information['address']>
-        output : 
-            <region>
+            [one-shot-example]
+            input : 
+                user_input : <query>  + default_location : <user_information['address']>
+            output : 
+                <region>
+
 
+            """),
+                ("user", "{input}")
+            ])
 
-        """),
-            ("user", "{input}")
-        ])
+            return prompt | llm | parser
 
-        chain = prompt | llm | parser
+        chain = get_chain("weather.region", build_chain)
 
-        def parse_product(description: str) -> dict:
-            result = chain.invoke({"input": description})
+        async def parse_product(description: str) -> dict:
+            result = await chain.ainvoke({"input": description})
             logger.info(f"[json.dumps] : {json.dumps(result, indent=2, ensure_ascii=False)}")
             return result
             
-        description = f"user_input : {query}  + default_location : {self.user_information_data['address']} "
+        description = f"user_input : {query}  + default_location : {user_information_data['address']} "
 
         logger.info(f"[description] : {description} ")
 
-        response = parse_product(description)
+        response = await parse_product(description)
         
         # 추출 및 보정
         if not response or 'output' not in response or not response['output'].strip():
@@ -125,8 +118,8 @@ class Weather():
 
         query=f""" 
         [user data]  
-        {self.user}
-        {self.user_prefer}
+        {user}
+        {user_prefer}
 
         [html_data]
         {html_data}
@@ -0,0 +1,205 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from loguru import logger
+from app.core.llm_client import get_http_client
+from app.core.metrics import metrics
+
+NOMINATIM_URL = os.getenv("NOMINATIM_URL", "https://nominatim.openstreetmap.org")
+## 실제 이메일 사용해야함!
+NOMINATIM_USER_AGENT = os.getenv("NOMINATIM_USER_AGENT", "jwontiger@gmail.com")
+# Nominatim 이용 정책: 초당 1회 이하
+NOMINATIM_MIN_INTERVAL = float(os.getenv("NOMINATIM_MIN_INTERVAL", "1.0"))
+NOMINATIM_TIMEOUT = float(os.getenv("NOMINATIM_TIMEOUT", "3.0"))
+
+# 주소 → 좌표 영구 캐시 (재시작 후에도 유지, 기본값은 소스 트리 밖 사용자 캐시 디렉토리)
+GEOCODE_CACHE_PATH = os.getenv("GEOCODE_CACHE_PATH", os.path.join(os.path.expanduser("~"), ".cache", "eum", "geocode_cache.sqlite3"))
+# 좌표를 찾지 못한 주소를 다시 조회하기까지의 시간 (초)
+GEOCODE_NEGATIVE_TTL = float(os.getenv("GEOCODE_NEGATIVE_TTL", "86400"))
+
+# 주소가 없거나 좌표를 찾지 못했을 때 사용하는 기본 주소
+DEFAULT_ADDRESS = "서울 강남"
+
+# 기본 도시 좌표 (주소에 포함된 지역명 → 위도, 경도). 긴 이름이 우선
+DEFAULT_CITY_COORDINATES: Dict[str, Tuple[float, float]] = {
+    "서울 강남": (37.498095, 127.027610),
+    "서울 중구": (37.563843, 126.997602),
+    "서울 종로": (37.573050, 126.979189),
+    "서울 마포": (37.566324, 126.901636),
+    "서울 송파": (37.514543, 127.105872),
+    "서울 용산": (37.532527, 126.990490),
+    "부산 동구": (35.129245, 129.045381),
+    "부산 해운대": (35.163177, 129.163634),
+    "서울": (37.566535, 126.977969),
+    "부산": (35.179554, 129.075642),
+    "대구": (35.871435, 128.601445),
+    "인천": (37.456256, 126.705206),
+    "광주": (35.159545, 126.852601),
+    "대전": (36.350412, 127.384548),
+    "울산": (35.538377, 129.311360),
+    "세종": (36.480132, 127.289021),
+    "수원": (37.263573, 127.028601),
+    "경기": (37.275119, 127.009466),
+    "강원": (37.885399, 127.729829),
+    "충북": (36.635684, 127.491384),
+    "충남": (36.658812, 126.672791),
+    "전북": (35.820433, 127.108758),
+    "전남": (34.816213, 126.463051),
+    "경북": (36.576032, 128.505599),
+    "경남": (35.238294, 128.692397),
+    "제주": (33.499621, 126.531188),
+}
+
+
+def default_city_coordinates(address: Optional[str]) -> Tuple[float, float]:
+    """주소에 포함된 지역명으로 기본 좌표를 반환합니다. (없으면 DEFAULT_ADDRESS 좌표)"""
+    address = " ".join(str(address or "").split())
+    matches = [name for name in DEFAULT_CITY_COORDINATES if name in address]
+    return DEFAULT_CITY_COORDINATES[max(matches, key=len) if matches else DEFAULT_ADDRESS]
+
+
+class GeocodeStore:
+    """SQLite 주소 → 좌표 저장소 (좌표를 찾지 못한 주소는 좌표 없이 기록)"""
+
+    def __init__(self, path: str = GEOCODE_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS geocode ("
+                "address TEXT PRIMARY KEY, latitude REAL, longitude REAL, updated_at REAL NOT NULL)"
+            )
+            self._connection.commit()
+        return self._connection
+
+    def get(self, address: str) -> Optional[Tuple[Optional[float], Optional[float], float]]:
+        with self._lock:
+            return self._connect().execute(
+                "SELECT latitude, longitude, updated_at FROM geocode WHERE address = ?", (address,)
+            ).fetchone()
+
+    def put(self, address: str, coordinates: Optional[Tuple[float, float]]) -> None:
+        latitude, longitude = coordinates or (None, None)
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO geocode (address, latitude, longitude, updated_at) VALUES (?, ?, ?, ?)",
+                (address, latitude, longitude, time.time())
+            )
+            connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class Geocoder:
+    """
+    주소 → 좌표 변환
+    - SQLite 영구 캐시 우선, 없으면 Nominatim 을 공유 HTTP 클라이언트로 비동기 호출
+    - 같은 주소를 동시에 조회하면 요청 하나로 합침
+    - Nominatim 이용 정책에 맞춰 호출 간격 유지
+    - 호출 대기가 max_wait 보다 길어지면 기본 도시 좌표로 바로 응답하고 조회는 백그라운드에서 계속
+    """
+
+    def __init__(self, store: Optional[GeocodeStore] = None, negative_ttl: float = GEOCODE_NEGATIVE_TTL, min_interval: float = NOMINATIM_MIN_INTERVAL, max_wait: float = NOMINATIM_TIMEOUT):
+        self.store = store or GeocodeStore()
+        self.negative_ttl = negative_ttl
+        self.min_interval = min_interval
+        self.max_wait = max_wait
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._background: Dict[str, asyncio.Future] = {}
+        self._next_request = 0.0
+
+    async def _nominatim(self, address: str) -> Optional[Tuple[float, float]]:
+        """Nominatim 검색 결과 좌표 (찾지 못하면 None, 요청 실패 시 예외)"""
+        # 호출 순서대로 min_interval 간격의 시작 시각을 배정
+        now = time.monotonic()
+        start = max(now, self._next_request)
+        self._next_request = start + self.min_interval
+        if start > now:
+            await asyncio.sleep(start - now)
+        response = await get_http_client(NOMINATIM_URL).get(
+            f"{NOMINATIM_URL}/search",
+            params={"q": address, "format": "json", "limit": 1},
+            headers={"User-Agent": NOMINATIM_USER_AGENT},
+            timeout=NOMINATIM_TIMEOUT
+        )
+        response.raise_for_status()
+        results = response.json()
+        if not results:
+            return None
+        return float(results[0]["lat"]), float(results[0]["lon"])
+
+    async def _resolve(self, address: str) -> Optional[Tuple[float, float]]:
+        row = await asyncio.to_thread(self.store.get, address)
+        if row is not None:
+            latitude, longitude, updated_at = row
+            if latitude is not None:
+                metrics.incr("geocode.hit")
+                return latitude, longitude
+            if time.time() - updated_at < self.negative_ttl:
+                metrics.incr("geocode.hit")
+                return None
+
+        metrics.incr("geocode.miss")
+        if address in self._background or self._next_request - time.monotonic() > self.max_wait:
+            # 대기열이 길면 기본 좌표로 응답 (조회 결과는 다음 요청부터 사용)
+            self._lookup_in_background(address)
+            return default_city_coordinates(address)
+        return await self._lookup(address)
+
+    async def _lookup(self, address: str) -> Optional[Tuple[float, float]]:
+        """Nominatim 으로 조회하고 결과를 저장합니다."""
+        try:
+            coordinates = await self._nominatim(address)
+        except Exception as e:
+            # 일시적인 오류는 기록하지 않음 (다음 요청에서 재시도)
+            logger.error(f"[지오코딩] Nominatim 요청 실패: {type(e).__name__} {e}")
+            metrics.incr("geocode.error")
+            return None
+        await asyncio.to_thread(self.store.put, address, coordinates)
+        return coordinates
+
+    def _lookup_in_background(self, address: str) -> None:
+        """주소당 하나의 백그라운드 조회를 시작합니다."""
+        if address in self._background:
+            return
+        metrics.incr("geocode.deferred")
+        logger.info(f"[지오코딩] Nominatim 대기열 초과, 기본 좌표 사용 후 백그라운드 조회: {address}")
+        task = self._background[address] = asyncio.ensure_future(self._lookup(address))
+        task.add_done_callback(lambda future: self._background.pop(address, None) if self._background.get(address) is future else None)
+
+    async def geocode(self, address: str) -> Optional[Tuple[float, float]]:
+        """
+        주소의 좌표를 반환합니다.
+
+        Returns:
+            Optional[Tuple[float, float]]: (위도, 경도), 찾지 못하면 None
+            (Nominatim 대기열이 길면 주소 지역의 기본 좌표)
+        """
+        address = " ".join(str(address or "").split())
+        if not address:
+            return None
+        pending = self._pending.get(address)
+        if pending is None:
+            pending = self._pending[address] = asyncio.ensure_future(self._resolve(address))
+            pending.add_done_callback(lambda future: self._pending.pop(address, None) if self._pending.get(address) is future else None)
+        else:
+            metrics.incr("geocode.coalesced")
+        return await asyncio.shield(pending)
+
+
+# 전역 지오코더 인스턴스
+geocoder = Geocoder()
@@ -0,0 +1,289 @@
+# app/services/common/language_detector.py
+import math
+import re
+from collections import Counter
+from typing import Dict, Any
+
+# 라틴 문자 언어 구분용 학습 문장 (챗봇 질의 도메인 위주)
+LATIN_TRAINING_TEXT = {
+    "en": """
+        what is the weather like in seoul today. find a cafe near me please.
+        i am looking for a job as a developer. can you help me write my resume.
+        add a meeting to my calendar tomorrow at nine in the morning.
+        where is the nearest pharmacy and hospital. tell me about events this weekend.
+        how do i get health insurance in korea. i want to write a post on the board.
+        show me my schedule for next week. what should i do to extend my visa.
+        the best restaurants around here. is there a subway station nearby.
+        thank you for your help. i would like to know the opening hours of the office.
+        """,
+    "es": """
+        qué tiempo hace hoy en seúl. busca una cafetería cerca de mí por favor.
+        estoy buscando un trabajo de desarrollador. puedes ayudarme a escribir mi currículum.
+        añade una reunión a mi calendario mañana a las nueve de la mañana.
+        dónde está la farmacia y el hospital más cercano. háblame de los eventos de este fin de semana.
+        cómo obtengo el seguro de salud en corea. quiero escribir una publicación en el foro.
+        muéstrame mi horario de la próxima semana. qué debo hacer para extender mi visado.
+        los mejores restaurantes de la zona. hay una estación de metro cerca.
+        gracias por tu ayuda. me gustaría saber el horario de la oficina.
+        """,
+    "fr": """
+        quel temps fait-il aujourd'hui à séoul. trouve un café près de chez moi s'il te plaît.
+        je cherche un travail de développeur. peux-tu m'aider à écrire mon curriculum vitae.
+        ajoute une réunion à mon calendrier demain à neuf heures du matin.
+        où est la pharmacie et l'hôpital le plus proche. parle-moi des événements de ce week-end.
+        comment obtenir l'assurance maladie en corée. je veux écrire un message sur le forum.
+        montre-moi mon emploi du temps de la semaine prochaine. que dois-je faire pour prolonger mon visa.
+        les meilleurs restaurants du quartier. est-ce qu'il y a une station de métro à côté.
+        merci pour ton aide. je voudrais connaître les horaires d'ouverture du bureau.
+        """,
+    "de": """
+        wie ist das wetter heute in seoul. finde bitte ein café in meiner nähe.
+        ich suche eine arbeit als entwickler. kannst du mir helfen, meinen lebenslauf zu schreiben.
+        füge morgen um neun uhr morgens ein treffen in meinen kalender ein.
+        wo ist die nächste apotheke und das nächste krankenhaus. erzähl mir von den veranstaltungen am wochenende.
+        wie bekomme ich eine krankenversicherung in korea. ich möchte einen beitrag im forum schreiben.
+        zeig mir meinen terminplan für nächste woche. was muss ich tun, um mein visum zu verlängern.
+        die besten restaurants in der umgebung. gibt es eine u-bahn-station in der nähe.
+        danke für deine hilfe. ich möchte die öffnungszeiten des büros wissen.
+        """,
+}
+
+# 지원하지 않는 라틴 문자 언어의 학습 문장 (이 언어로 판별되면 LLM 이 감지하도록 함)
+# en/es/fr/de 만으로 softmax 를 계산하면 이탈리아어 등이 가장 가까운 지원 언어로 높은 신뢰도를 받음
+LATIN_OUT_OF_SCOPE_TRAINING_TEXT = {
+    "it": """
+        che tempo fa oggi a seul. trova un bar vicino a me per favore.
+        sto cercando un lavoro come sviluppatore. puoi aiutarmi a scrivere il mio curriculum.
+        aggiungi una riunione al mio calendario domani alle nove di mattina.
+        dove si trova la farmacia e l'ospedale più vicino. parlami degli eventi di questo fine settimana.
+        come ottengo l'assicurazione sanitaria in corea. voglio scrivere un post sul forum.
+        mostrami il mio programma della prossima settimana. cosa devo fare per prolungare il mio visto.
+        i migliori ristoranti della zona. c'è una stazione della metropolitana qui vicino.
+        grazie per il tuo aiuto. ciao, vorrei sapere gli orari di apertura dell'ufficio.
+        """,
+    "pt": """
+        como está o tempo hoje em seul. encontre um café perto de mim por favor.
+        estou procurando um emprego de desenvolvedor. você pode me ajudar a escrever meu currículo.
+        adicione uma reunião ao meu calendário amanhã às nove da manhã.
+        onde fica a farmácia e o hospital mais próximo. fale-me dos eventos deste fim de semana.
+        como consigo o seguro de saúde na coreia. quero escrever uma publicação no fórum.
+        mostre-me minha agenda da próxima semana. o que devo fazer para prorrogar meu visto.
+        os melhores restaurantes da região. tem uma estação de metrô aqui perto.
+        obrigado pela sua ajuda. gostaria de saber o horário de funcionamento do escritório.
+        """,
+    "nl": """
+        wat voor weer is het vandaag in seoul. zoek een café bij mij in de buurt alsjeblieft.
+        ik zoek een baan als ontwikkelaar. kun je me helpen mijn cv te schrijven.
+        voeg morgen om negen uur 's ochtends een vergadering toe aan mijn agenda.
+        waar is de dichtstbijzijnde apotheek en het ziekenhuis. vertel me over de evenementen dit weekend.
+        hoe krijg ik een zorgverzekering in korea. ik wil een bericht op het forum schrijven.
+        laat mijn rooster voor volgende week zien. wat moet ik doen om mijn visum te verlengen.
+        de beste restaurants in de buurt. is er een metrostation in de buurt.
+        bedankt voor je hulp. ik wil graag de openingstijden van het kantoor weten.
+        """,
+    "pl": """
+        jaka jest dzisiaj pogoda w seulu. znajdź kawiarnię w pobliżu proszę.
+        szukam pracy jako programista. czy możesz mi pomóc napisać moje cv.
+        dodaj spotkanie do mojego kalendarza jutro o dziewiątej rano.
+        gdzie jest najbliższa apteka i szpital. opowiedz mi o wydarzeniach w ten weekend.
+        jak uzyskać ubezpieczenie zdrowotne w korei. chcę napisać post na forum.
+        pokaż mój plan na przyszły tydzień. co muszę zrobić, żeby przedłużyć wizę.
+        najlepsze restauracje w okolicy. czy jest w pobliżu stacja metra.
+        dziękuję za pomoc. chciałbym poznać godziny otwarcia biura.
+        """,
+    "tr": """
+        bugün seul'de hava nasıl. lütfen yakınımda bir kafe bul.
+        yazılımcı olarak iş arıyorum. özgeçmişimi yazmama yardım eder misin.
+        yarın sabah dokuzda takvimime bir toplantı ekle.
+        en yakın eczane ve hastane nerede. bana bu hafta sonunun etkinliklerini anlat.
+        kore'de sağlık sigortasını nasıl alırım. forumda bir gönderi yazmak istiyorum.
+        gelecek haftaki programımı göster. vizemi uzatmak için ne yapmalıyım.
+        bölgedeki en iyi restoranlar. yakında bir metro istasyonu var mı.
+        yardımın için teşekkürler. ofisin çalışma saatlerini öğrenmek istiyorum.
+        """,
+    "vi": """
+        hôm nay thời tiết ở seoul thế nào. làm ơn tìm quán cà phê gần tôi.
+        tôi đang tìm việc làm lập trình viên. bạn có thể giúp tôi viết sơ yếu lý lịch không.
+        thêm một cuộc họp vào lịch của tôi lúc chín giờ sáng mai.
+        hiệu thuốc và bệnh viện gần nhất ở đâu. cho tôi biết các sự kiện cuối tuần này.
+        làm sao để có bảo hiểm y tế ở hàn quốc. tôi muốn viết một bài trên diễn đàn.
+        cho tôi xem lịch trình tuần sau. tôi phải làm gì để gia hạn thị thực.
+        những nhà hàng ngon nhất quanh đây. có ga tàu điện ngầm nào gần đây không.
+        cảm ơn bạn đã giúp đỡ. tôi muốn biết giờ mở cửa của văn phòng.
+        """,
+    "id": """
+        bagaimana cuaca hari ini di seoul. tolong carikan kafe di dekat saya.
+        saya sedang mencari pekerjaan sebagai pengembang. bisakah kamu membantu saya menulis cv.
+        tambahkan rapat ke kalender saya besok jam sembilan pagi.
+        di mana apotek dan rumah sakit terdekat. ceritakan tentang acara akhir pekan ini.
+        bagaimana cara mendapatkan asuransi kesehatan di korea. saya ingin menulis postingan di forum.
+        tunjukkan jadwal saya minggu depan. apa yang harus saya lakukan untuk memperpanjang visa.
+        restoran terbaik di sekitar sini. apakah ada stasiun kereta bawah tanah di dekat sini.
+        terima kasih atas bantuannya. saya ingin tahu jam buka kantor.
+        """,
+    "tl": """
+        ano ang panahon ngayon sa seoul. pakihanap ng kapihan malapit sa akin.
+        naghahanap ako ng trabaho bilang developer. matutulungan mo ba akong isulat ang aking resume.
+        magdagdag ng pulong sa aking kalendaryo bukas ng alas nuwebe ng umaga.
+        saan ang pinakamalapit na botika at ospital. sabihin mo sa akin ang mga kaganapan ngayong katapusan ng linggo.
+        paano ako makakakuha ng health insurance sa korea. gusto kong magsulat ng post sa forum.
+        ipakita ang aking iskedyul sa susunod na linggo. ano ang dapat kong gawin para mapalawig ang aking visa.
+        ang pinakamagagandang kainan dito. may istasyon ba ng subway malapit dito.
+        salamat sa tulong mo. gusto kong malaman ang oras ng pagbubukas ng opisina.
+        """,
+}
+
+# 음절/표의 문자 1글자당 라틴 문자 환산 가중치
+SYLLABIC_WEIGHT = 3
+
+# 한자만으로 된 텍스트의 신뢰도 상한
+# 가나 없이 한자만 쓴 일본어(예: "今日天気")와 중국어를 스크립트만으로는 구분할 수 없으므로,
+# 감지 임계값(LANG_DETECT_CONFIDENCE_THRESHOLD)보다 낮게 두어 LLM 이 판별하도록 함
+HAN_ONLY_MAX_CONFIDENCE = 0.5
+
+# 입력 3-gram 중 판별된 언어의 학습 문장에 없는 비율이 이 값을 넘으면 학습되지 않은 언어일 수 있으므로
+# 신뢰도를 OUT_OF_PROFILE_MAX_CONFIDENCE 로 제한해 LLM 이 판별하도록 함
+LATIN_MAX_UNSEEN_RATIO = 0.7
+OUT_OF_PROFILE_MAX_CONFIDENCE = 0.5
+
+_WORD_PATTERN = re.compile(r"[^\W\d_]+", re.UNICODE)
+
+
+def _script_of(char: str) -> str:
+    """문자의 스크립트(문자 체계)를 반환합니다."""
+    code = ord(char)
+    if 0xAC00 <= code <= 0xD7A3 or 0x1100 <= code <= 0x11FF or 0x3130 <= code <= 0x318F:
+        return "hangul"
+    if 0x3040 <= code <= 0x30FF or 0x31F0 <= code <= 0x31FF or 0xFF66 <= code <= 0xFF9F:
+        return "kana"
+    if 0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF:
+        return "han"
+    if 0x0400 <= code <= 0x04FF:
+        return "cyrillic"
+    if char.isascii() and char.isalpha():
+        return "latin"
+    if 0x00C0 <= code <= 0x024F and char.isalpha():
+        return "latin"
+    if char.isalpha():
+        return "other"
+    return ""
+
+
+def _trigrams(text: str):
+    """단어 경계를 포함한 문자 3-gram 을 생성합니다."""
+    for word in _WORD_PATTERN.findall(text.lower()):
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            yield padded[i:i + 3]
+
+
+class LanguageDetector:
+    """
+    LLM 없이 동작하는 로컬 언어 감지기 (유니코드 스크립트 분포 + 문자 n-gram 모델)
+    LANGUAGE_CODE_MAP 의 8개 코드(ko, en, ja, zh, es, fr, de, ru)를 판별합니다.
+    """
+
+    def __init__(self):
+        # 라틴 문자 언어별 3-gram 로그 확률 테이블
+        self.latin_models: Dict[str, Dict[str, float]] = {}
+        self.latin_unseen: Dict[str, float] = {}
+        vocabulary = set()
+        counts = {}
+        for lang_code, text in {**LATIN_TRAINING_TEXT, **LATIN_OUT_OF_SCOPE_TRAINING_TEXT}.items():
+            counts[lang_code] = Counter(_trigrams(text))
+            vocabulary.update(counts[lang_code])
+
+        vocabulary_size = len(vocabulary) + 1
+        for lang_code, counter in counts.items():
+            total = sum(counter.values()) + vocabulary_size
+            self.latin_models[lang_code] = {
+                gram: math.log((count + 1) / total) for gram, count in counter.items()
+            }
+            self.latin_unseen[lang_code] = math.log(1 / total)
+
+    def script_histogram(self, text: str) -> Dict[str, int]:
+        """텍스트의 스크립트별 문자 수를 반환합니다."""
+        histogram = Counter(_script_of(char) for char in text)
+        histogram.pop("", None)
+        return dict(histogram)
+
+    def _detect_latin(self, text: str) -> Dict[str, Any]:
+        """라틴 문자 텍스트를 en/es/fr/de 중 하나로 분류합니다. (그 외 언어는 lang_code None)"""
+        grams = list(_trigrams(text))
+        if not grams:
+            return {"lang_code": None, "confidence": 0.0}
+
+        scores = {
+            lang_code: sum(model.get(gram, self.latin_unseen[lang_code]) for gram in grams)
+            for lang_code, model in self.latin_models.items()
+        }
+
+        # 로그 우도 → 사후 확률 (softmax)
+        best = max(scores.values())
+        weights = {lang_code: math.exp(score - best) for lang_code, score in scores.items()}
+        total = sum(weights.values())
+        lang_code = max(weights, key=weights.get)
+        if lang_code in LATIN_OUT_OF_SCOPE_TRAINING_TEXT:
+            # 지원하지 않는 언어 (예: 이탈리아어) → 감지 실패로 처리
+            return {"lang_code": None, "confidence": 0.0}
+
+        confidence = weights[lang_code] / total
+        unseen = sum(gram not in self.latin_models[lang_code] for gram in grams) / len(grams)
+        if unseen > LATIN_MAX_UNSEEN_RATIO:
+            confidence = min(confidence, OUT_OF_PROFILE_MAX_CONFIDENCE)
+        return {"lang_code": lang_code, "confidence": confidence}
+
+    def detect(self, text: str) -> Dict[str, Any]:
+        """
+        텍스트의 언어를 감지합니다.
+
+        Args:
+            text: 입력 텍스트
+
+        Returns:
+            Dict[str, Any]: lang_code (감지 실패 시 None), confidence (0.0 ~ 1.0)
+        """
+        histogram = self.script_histogram(text or "")
+
+        # 한글 음절 / 가나 / 한자 1글자는 라틴 문자 여러 글자 분량이므로 가중치 적용
+        hangul = histogram.get("hangul", 0) * SYLLABIC_WEIGHT
+        kana = histogram.get("kana", 0) * SYLLABIC_WEIGHT
+        han = histogram.get("han", 0) * SYLLABIC_WEIGHT
+        cyrillic = histogram.get("cyrillic", 0)
+        latin = histogram.get("latin", 0)
+        letters = hangul + kana + han + cyrillic + latin + histogram.get("other", 0)
+        if letters == 0:
+            return {"lang_code": None, "confidence": 0.0}
+
+        # 가장 많이 사용된 스크립트 기준으로 판별
+        dominant = max(
+            [("hangul", hangul), ("cjk", kana + han), ("cyrillic", cyrillic), ("latin", latin)],
+            key=lambda item: item[1]
+        )[0]
+
+        if dominant == "hangul":
+            return {"lang_code": "ko", "confidence": hangul / letters}
+
+        if dominant == "cjk":
+            share = (kana + han) / letters
+            if kana:
+                # 가나가 섞여 있으면 일본어
+                return {"lang_code": "ja", "confidence": share}
+            # 한자만 있는 경우 중국어로 추정하되, 일본어일 수 있으므로 신뢰도 상한 적용
+            return {"lang_code": "zh", "confidence": min(share, HAN_ONLY_MAX_CONFIDENCE)}
+
+        if dominant == "cyrillic":
+            return {"lang_code": "ru", "confidence": cyrillic / letters}
+
+        result = self._detect_latin(text)
+        result["confidence"] *= latin / letters
+        return result
+
+
+# 전역 감지기 인스턴스 (학습 테이블은 한 번만 생성)
+language_detector = LanguageDetector()
+
+
+def detect_language(text: str) -> Dict[str, Any]:
+    """로컬 감지기로 텍스트의 언어를 감지합니다."""
+    return language_detector.detect(text)
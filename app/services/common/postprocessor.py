@@ -1,6 +1,11 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional, List, Tuple, Union, AsyncIterator
 from loguru import logger
+import copy
+import json
+import re
 from app.core.llm_client import get_llm_client
+from app.config.app_config import settings
+from app.services.common.language_detector import detect_language
 
 # Language code to full language name mapping
 LANGUAGE_CODE_MAP = {
@@ -14,6 +19,52 @@ LANGUAGE_CODE_MAP = {
     "ru": "Russian"
 }
 
+# Human-readable fields of structured (list / dict) responses that get translated.
+# Everything else (links, ids, codes, coordinates, distances ...) is passed through untouched.
+TRANSLATABLE_FIELDS = {
+    "title",
+    "summary",
+    "description",
+    "content",
+    "snippet",
+    "category_group_name",
+}
+
+# Values that must never be sent to the translator even inside a translatable field
+_UNTRANSLATABLE_PATTERN = re.compile(
+    r"^(https?://|www\.)\S*$"           # URL
+    r"|^[\w.+-]+@[\w-]+\.[\w.]+$"       # e-mail
+    r"|^[\d\s:.,+\-/()%]+$"              # numbers, dates, times, phone numbers
+    r"|^[A-Z0-9_\-]{1,10}$"              # codes (e.g. FD6)
+)
+
+Path = Tuple[Union[str, int], ...]
+
+
+def _collect_translatable(node: Any, path: Path, key: Optional[str], out: List[Tuple[Path, str]]) -> None:
+    """Walks a structured response and collects (path, text) of translatable strings."""
+    if isinstance(node, dict):
+        for child_key, value in node.items():
+            _collect_translatable(value, path + (child_key,), str(child_key), out)
+    elif isinstance(node, list):
+        for index, value in enumerate(node):
+            # Plain strings inside a list are human-readable unless they look like a link/code
+            _collect_translatable(value, path + (index,), key, out)
+    elif isinstance(node, str):
+        text = node.strip()
+        if not text or _UNTRANSLATABLE_PATTERN.match(text):
+            return
+        if key is None or key in TRANSLATABLE_FIELDS:
+            out.append((path, node))
+
+
+def _assign(node: Any, path: Path, value: str) -> None:
+    """Sets value at path inside a structured response."""
+    for step in path[:-1]:
+        node = node[step]
+    node[path[-1]] = value
+
+
 class Postprocessor:
     """Post-processing service"""
     
@@ -21,6 +72,34 @@ class Postprocessor:
         self.llm_client = get_llm_client(is_lightweight=True)
         logger.info(f"[Postprocess] Using lightweight model: {self.llm_client.model}")
     
+    def should_translate(self, response: Any, source_lang: str, output_lang: Optional[str] = None) -> bool:
+        """
+        Decides whether the response needs to be translated back into source_lang.
+
+        Args:
+            response: Agent response
+            source_lang: Source language code
+            output_lang: Language the agent declared its response to be in (if any)
+
+        Returns:
+            bool: False if the response is already in source_lang
+        """
+        detected_lang = None
+        if isinstance(response, str) and response.strip():
+            detection = detect_language(response)
+            if detection["confidence"] >= settings.LANG_DETECT_CONFIDENCE_THRESHOLD:
+                detected_lang = detection["lang_code"]
+
+        if output_lang == source_lang:
+            # Safety net: the script clearly says otherwise (e.g. the LLM ignored the translation instruction)
+            if detected_lang and detected_lang != source_lang:
+                logger.warning(f"[Postprocess] Declared {output_lang} but detected {detected_lang}, translating anyway")
+                return True
+            return False
+
+        # No declaration: skip only when the response is confidently detected as source_lang
+        return detected_lang != source_lang
+
     async def postprocess(self, response: str, source_lang: str, rag_type: str) -> Dict[str, Any]:
         """
         Post-processes the response.
@@ -48,20 +127,18 @@ class Postprocessor:
             # Get full language name from code
             language_name = LANGUAGE_CODE_MAP.get(source_lang, source_lang)
             logger.info(f"[Postprocess] Translating to {language_name} (code: {source_lang})")
-            
-            prompt = f"""
-            [Role]
-            Please translate the following English text into {language_name}.
-
-            [Requirements]
-            1. Preserve the exact meaning and tone of the original text.
-            2. If the text contains JSON, do not modify the keys—only translate the values.
-            3. Return only the translated content. Do not add any explanations or extra formatting.
-            4. Ensure the translation sounds natural to a native speaker of {language_name}.
 
-            [Text]
-            {response}
-            """
+            if isinstance(response, (list, dict)):
+                # Structured response: translate only the human-readable fields
+                translated_response = await self._translate_structured(response, language_name)
+                used_rag = rag_type != "none"
+                return {
+                    "response": translated_response,
+                    "used_rag": used_rag,
+                    "rag_type": rag_type if used_rag else None
+                }
+            
+            prompt = self._translation_prompt(response, language_name)
             
             logger.debug(f"[POSTPROCESS] Translation prompt: {prompt}")
             
@@ -85,4 +162,103 @@ class Postprocessor:
                 "response": response,  # Return original response if translation fails
                 "used_rag": False,
                 "rag_type": None
-            } 
\ No newline at end of file
+            } 
+
+    async def postprocess_stream(self, response: str, source_lang: str) -> AsyncIterator[str]:
+        """
+        Streams the translation of a text response back into source_lang.
+        Falls back to the original response if the stream fails before producing any output.
+
+        Args:
+            response: Response in English
+            source_lang: Source language code
+
+        Yields:
+            str: Translated text chunks
+        """
+        language_name = LANGUAGE_CODE_MAP.get(source_lang, source_lang)
+        logger.info(f"[Postprocess] Streaming translation to {language_name} (code: {source_lang})")
+
+        produced = False
+        try:
+            async for chunk in self.llm_client.generate_stream(self._translation_prompt(response, language_name)):
+                produced = True
+                yield chunk
+        except Exception as e:
+            logger.error(f"[Postprocess] Error during streaming post-processing: {str(e)}")
+            if produced:
+                raise
+            logger.error(f"[POSTPROCESS] Returning original response due to error")
+            yield response
+
+    def _translation_prompt(self, response: str, language_name: str) -> str:
+        """Builds the prompt used to translate a text response."""
+        return f"""
+            [Role]
+            Please translate the following English text into {language_name}.
+
+            [Requirements]
+            1. Preserve the exact meaning and tone of the original text.
+            2. If the text contains JSON, do not modify the keys—only translate the values.
+            3. Return only the translated content. Do not add any explanations or extra formatting.
+            4. Ensure the translation sounds natural to a native speaker of {language_name}.
+
+            [Text]
+            {response}
+            """
+
+    async def _translate_structured(self, response: Union[List[Any], Dict[str, Any]], language_name: str) -> Union[List[Any], Dict[str, Any]]:
+        """
+        Translates the human-readable string fields of a structured response in one batch.
+        Links, codes and numbers are passed through untouched and the original structure is kept.
+
+        Args:
+            response: List / dict response (e.g. [{"title": ..., "link": ...}])
+            language_name: Target language name
+
+        Returns:
+            Same structure with translated text fields (original on failure)
+        """
+        fields: List[Tuple[Path, str]] = []
+        _collect_translatable(response, (), None, fields)
+        logger.info(f"[Postprocess] Structured response - {len(fields)} translatable fields")
+
+        if not fields:
+            return response
+
+        texts = [text for _, text in fields]
+        prompt = f"""
+            [Role]
+            Please translate each string of the following JSON array into {language_name}.
+
+            [Requirements]
+            1. Preserve the exact meaning and tone of each string.
+            2. Keep proper nouns, brand names and numbers as they are.
+            3. Return only a JSON array of strings with exactly {len(texts)} items, in the same order.
+            4. Do not add any explanations or extra formatting.
+
+            [Texts]
+            {json.dumps(texts, ensure_ascii=False)}
+            """
+
+        translated_text = await self.llm_client.generate(prompt)
+        translated_text = translated_text.strip()
+        if "```" in translated_text:
+            translated_text = translated_text.split("```")[1].removeprefix("json").strip()
+
+        try:
+            translations = json.loads(translated_text)
+        except json.JSONDecodeError:
+            logger.warning("[Postprocess] Structured translation is not a JSON array, keeping original response")
+            return response
+
+        if not isinstance(translations, list) or len(translations) != len(texts):
+            logger.warning("[Postprocess] Structured translation count mismatch, keeping original response")
+            return response
+
+        translated_response = copy.deepcopy(response)
+        for (path, original), translated in zip(fields, translations):
+            _assign(translated_response, path, translated if isinstance(translated, str) and translated.strip() else original)
+
+        logger.info(f"[POSTPROCESS] Translated structured response ({language_name}): {translated_response}")
+        return translated_response
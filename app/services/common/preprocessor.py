@@ -2,75 +2,116 @@
 from langchain_groq import ChatGroq
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import SystemMessage, HumanMessage
 import json
 from langchain_openai import ChatOpenAI
-from app.core.llm_client import get_langchain_llm
+from app.core.llm_client import get_langchain_llm, get_chain
+from app.core.metrics import metrics
+from app.config.app_config import settings
+from app.services.common.language_detector import detect_language
 from loguru import logger
+from typing import Optional
 
 
-def translate_query(query: str): 
-    llm = get_langchain_llm(is_lightweight=True)
+def detect_query_language(query: str) -> Optional[str]:
+    """
+    로컬 감지기로 질의 언어를 판별합니다. (LLM 호출 없음)
+    신뢰도가 LANG_DETECT_CONFIDENCE_THRESHOLD 이상일 때만 언어 코드를 반환합니다.
+    """
+    detection = detect_language(query)
+    logger.info("[LANG_DETECT] {} (confidence: {:.3f})", detection["lang_code"], detection["confidence"])
 
-    parser = JsonOutputParser(pydantic_object={
-        "type": "object",
-        "properties": {
-            "lang_code": {"type": "string"},
-            "translated_query": {"type": "string"}
-        }
-    })
-
-    # 시스템 프롬프트 구성
-    system_prompt = """
-    You are an AI assistant that detects the language of the input and translates it into English.
-
-    Your task is to:
-    1. Detect the original language of the input query.
-    2. Translate the input accurately into English.
-    3. Return the result strictly in this JSON format:
-
-    {{
-    "translated_query": "<English translation of the input>",
-    "lang_code": "<language code of the original input>"
-    }}
-
-    Supported language codes for "lang_code" are:
-    - "ko": Korean
-    - "en": English
-    - "ja": Japanese
-    - "zh": Chinese
-    - "es": Spanish
-    - "fr": French
-    - "de": German
-    - "ru": Russian
-
-    ⚠️ Do not include any explanation, markdown, or comments. Return **only** the JSON object above.
+    if detection["lang_code"] and detection["confidence"] >= settings.LANG_DETECT_CONFIDENCE_THRESHOLD:
+        metrics.incr("lang_detect.fast_path")
+        return detection["lang_code"]
+
+    metrics.incr("lang_detect.llm_path")
+    return None
+
+
+async def translate_query(query: str, lang_code: Optional[str] = None): 
     """
+    질의의 언어를 감지하고 영어로 번역합니다.
+
+    Args:
+        query: 사용자 원문 질의
+        lang_code: 로컬 감지기로 이미 감지된 언어 코드 (없으면 LLM 이 감지)
+    """
+    # 영어로 확실히 감지되면 번역 생략
+    if lang_code == "en":
+        metrics.incr("lang_detect.translation_skipped")
+        logger.info("[TRANSLATE] English query detected locally, translation skipped")
+        return {
+            "translated_query": query,
+            "lang_code": "en"
+        }
+
+    def build_chain():
+        llm = get_langchain_llm(is_lightweight=True)
+
+        parser = JsonOutputParser(pydantic_object={
+            "type": "object",
+            "properties": {
+                "lang_code": {"type": "string"},
+                "translated_query": {"type": "string"}
+            }
+        })
+
+        # 시스템 프롬프트 구성
+        system_prompt = """
+        You are an AI assistant that detects the language of the input and translates it into English.
+
+        Your task is to:
+        1. Detect the original language of the input query.
+        2. Translate the input accurately into English.
+        3. Return the result strictly in this JSON format:
+
+        {{
+        "translated_query": "<English translation of the input>",
+        "lang_code": "<language code of the original input>"
+        }}
+
+        Supported language codes for "lang_code" are:
+        - "ko": Korean
+        - "en": English
+        - "ja": Japanese
+        - "zh": Chinese
+        - "es": Spanish
+        - "fr": French
+        - "de": German
+        - "ru": Russian
+
+        ⚠️ Do not include any explanation, markdown, or comments. Return **only** the JSON object above.
+        """
 
 
 
     
-    logger.info("[TRANSLATE] System prompt: {}", system_prompt)
-    logger.info("[TRANSLATE] User query: {}", query)
+        logger.info("[TRANSLATE] System prompt: {}", system_prompt)
 
-    # ChatPromptTemplate 생성
-    prompt = ChatPromptTemplate.from_messages([
-        SystemMessage(content=system_prompt),
-        HumanMessage(content=query)
-    ])
+        # ChatPromptTemplate 생성 (질의는 템플릿 변수로 전달)
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", system_prompt),
+            ("user", "{input}")
+        ])
 
-    # Chain 구성
-    chain = prompt | llm | parser
+        # Chain 구성
+        return prompt | llm | parser
+
+    chain = get_chain("preprocessor.translate", build_chain)
+    logger.info("[TRANSLATE] User query: {}", query)
 
     try:
         # chain 실행
-        result = chain.invoke({})  # 입력이 이미 메시지에 포함되어 있으므로 빈 딕셔너리 전달
+        result = await chain.ainvoke({"input": query})
         logger.info("[TRANSLATE] Output: {}", result)
+        if lang_code:
+            # 로컬 감지 결과가 확실하면 LLM 감지 결과보다 우선
+            result["lang_code"] = lang_code
         return result
     except Exception as e:
         logger.error("[TRANSLATE] Error: {}", str(e))
         return {
             "translated_query": query,
-            "lang_code": "en"  # 에러 발생시 기본값으로 영어 설정
+            "lang_code": lang_code or "en"  # 에러 발생시 기본값으로 영어 설정
         }
 
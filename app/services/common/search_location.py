@@ -1,46 +1,148 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 import reverse_geocoder as rg
 from loguru import logger
-import requests
+from app.core.llm_client import get_http_client
+from app.core.metrics import metrics
 
-class search_location():
-    def __init__(self):
-        self.coordinates = ()
-        self.result = ""
+KAKAO_API_URL = "https://dapi.kakao.com"
+KAKAO_COORD2ADDRESS_URL = f"{KAKAO_API_URL}/v2/local/geo/coord2address.json"
+KAKAO_API_KEY = os.getenv("KAKAO_REST_API_KEY", "5d96c7a6ef9ac4662396eafc9c44f63e")
+
+# 카카오 응답 대기 시간 (초, 초과하면 오프라인 변환 결과 사용)
+REVERSE_GEOCODE_TIMEOUT = float(os.getenv("REVERSE_GEOCODE_TIMEOUT", "1.5"))
+# 주소 캐시 유지 시간 (초) / 최대 보관 항목 수
+REVERSE_GEOCODE_TTL = float(os.getenv("REVERSE_GEOCODE_TTL", "86400"))
+REVERSE_GEOCODE_MAX_ENTRIES = int(os.getenv("REVERSE_GEOCODE_MAX_ENTRIES", "4096"))
+# 캐시 키 좌표 반올림 자릿수 (소수점 3자리 ≈ 110m 격자, 격자 중심에서 최대 약 50m)
+REVERSE_GEOCODE_PRECISION = int(os.getenv("REVERSE_GEOCODE_PRECISION", "3"))
+
+
+def offline_reverse_geocode(latitude: float, longitude: float) -> dict:
+    """
+    reverse_geocoder(오프라인 GeoNames 데이터)로 가장 가까운 도시를 찾습니다.
+    카카오 coord2address 응답(documents[0])과 같은 형식으로 반환합니다.
+    """
+    place = rg.search([(latitude, longitude)], mode=1, verbose=False)[0]
+    regions = [place.get("admin1", ""), place.get("admin2", ""), place.get("name", "")]
+    return {
+        "road_address": None,
+        "address": {
+            "address_name": " ".join(dict.fromkeys(region for region in regions if region)),
+            "region_1depth_name": regions[0],
+            "region_2depth_name": regions[1],
+            "region_3depth_name": regions[2],
+        },
+        "source": "offline",
+    }
+
+
+class ReverseGeocoder:
+    """
+    좌표 → 주소 변환
+    - 카카오 coord2address 를 공유 HTTP 클라이언트로 비동기 호출
+    - 반올림한 좌표 기준 TTL / LRU 캐시, 같은 격자를 동시에 조회하면 요청 하나로 합침
+    - 카카오가 느리거나 실패하면 오프라인 변환 결과 사용 (캐시하지 않음 → 다음 요청에서 카카오 재시도)
+    """
+
+    def __init__(self, ttl: float = REVERSE_GEOCODE_TTL, max_entries: int = REVERSE_GEOCODE_MAX_ENTRIES, precision: int = REVERSE_GEOCODE_PRECISION, timeout: float = REVERSE_GEOCODE_TIMEOUT):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.precision = precision
+        self.timeout = timeout
+        self._entries: "OrderedDict[Tuple[float, float], Tuple[float, dict]]" = OrderedDict()
+        self._pending: Dict[Tuple[float, float], asyncio.Future] = {}
 
-    # def search(self, location):
-    #     # location.latitude, location.longitude 는 float 타입이어야 합니다.
-    #     self.coordinates = (float(location.latitude), float(location.longitude))
-    #     self.result = rg.search([self.coordinates])
-    #     logger.info(f"[location_result] : {self.result}")
-    #     return self.result
-    
-    def search(self, location) -> dict:
-        url = "https://dapi.kakao.com/v2/local/geo/coord2address.json"
+    def _key(self, latitude: float, longitude: float) -> Tuple[float, float]:
+        return round(latitude, self.precision), round(longitude, self.precision)
+
+    async def _kakao(self, latitude: float, longitude: float) -> Optional[dict]:
+        """카카오 변환 결과 (주소가 없으면 빈 dict, 실패하면 None)"""
         headers = {
-            "Authorization": f"KakaoAK 5d96c7a6ef9ac4662396eafc9c44f63e"
+            "Authorization": f"KakaoAK {KAKAO_API_KEY}"
         }
-        try:
-            x = float(location.longitude)
-            y = float(location.latitude)
-        except (AttributeError, ValueError, TypeError) as e:
-            logger.error(f"Invalid location data: {e}")
-            return {}
-
         params = {
-            "x": x,
-            "y": y,
+            "x": longitude,
+            "y": latitude,
             "input_coord": "WGS84"
         }
-
         try:
-            response = requests.get(url, headers=headers, params=params)
+            response = await get_http_client(KAKAO_API_URL).get(KAKAO_COORD2ADDRESS_URL, headers=headers, params=params)
             response.raise_for_status()
-            data = response.json()
-            if data.get('documents'):
-                return data['documents'][0]
-            else:
+            documents = response.json().get("documents")
+            if not documents:
                 logger.warning("No address information found for the given coordinates.")
                 return {}
-        except requests.RequestException as e:
-            logger.error(f"Request failed: {e}")
+            return documents[0]
+        except Exception as e:
+            logger.error(f"[역지오코딩] 카카오 요청 실패: {type(e).__name__} {e}")
+            return None
+
+    async def _resolve(self, key: Tuple[float, float], latitude: float, longitude: float) -> dict:
+        try:
+            # httpx 타임아웃은 단계(연결 / 읽기)별이므로 전체 대기 시간을 제한
+            document = await asyncio.wait_for(self._kakao(latitude, longitude), self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"[역지오코딩] 카카오 응답 지연 ({self.timeout}초 초과), 오프라인 변환 사용")
+            document = None
+        if document is not None:
+            self._entries[key] = (time.monotonic(), document)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return document
+
+        metrics.incr("reverse_geocode.fallback")
+        try:
+            # 첫 호출 시 데이터 로드가 있으므로 스레드에서 실행
+            return await asyncio.to_thread(offline_reverse_geocode, latitude, longitude)
+        except Exception as e:
+            logger.error(f"[역지오코딩] 오프라인 변환 실패: {str(e)}")
             return {}
+
+    async def reverse(self, latitude: float, longitude: float) -> dict:
+        """좌표에 해당하는 주소 정보를 반환합니다. (카카오 documents[0] 형식)"""
+        key = self._key(latitude, longitude)
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            self._entries.move_to_end(key)
+            metrics.incr("reverse_geocode.hit")
+            return entry[1]
+
+        pending = self._pending.get(key)
+        if pending is None:
+            metrics.incr("reverse_geocode.miss")
+            pending = self._pending[key] = asyncio.ensure_future(self._resolve(key, latitude, longitude))
+            pending.add_done_callback(lambda future: self._pending.pop(key, None) if self._pending.get(key) is future else None)
+        else:
+            metrics.incr("reverse_geocode.coalesced")
+        return await asyncio.shield(pending)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._pending.clear()
+
+
+# 전역 역지오코더 인스턴스
+reverse_geocoder = ReverseGeocoder()
+
+
+class search_location():
+    def __init__(self):
+        self.coordinates = ()
+        self.result = ""
+
+    async def search(self, location) -> dict:
+        """실시간 위치(latitude / longitude)를 주소 정보로 변환합니다. 반환값은 캐시와 공유되므로 수정하지 말 것"""
+        try:
+            self.coordinates = (float(location.latitude), float(location.longitude))
+        except (AttributeError, ValueError, TypeError) as e:
+            logger.error(f"Invalid location data: {e}")
+            return {}
+
+        self.result = await reverse_geocoder.reverse(*self.coordinates)
+        logger.info(f"[location_result] : {self.result}")
+        return self.result
@@ -1,47 +1,15 @@
-import httpx  # ✅ 비동기 요청 라이브러리
+from app.services.common.user_profile_service import USER_API_BASE_URL, user_profile_service
 
 class User_Api:
+    """
+    사용자 프로필 / 선호 정보 API
+    - 조회는 user_profile_service 로 위임 (공유 HTTP 클라이언트 + 토큰 해시 기준 TTL 캐시)
+    """
     def __init__(self):
-        self.base_url = "https://api.eum-friends.com"
+        self.base_url = USER_API_BASE_URL
 
     async def user_api(self, token: str):
-        url = f"{self.base_url}/users/profile"
-        headers = {
-            "Authorization": token,  # ✅ Bearer 붙이기
-            "Content-Type": "application/json"
-        }
-
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-                print("✅ 사용자 정보 가져오기 성공")
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                print(f"❌ 요청 실패: {e.response.status_code}")
-                print("💬 응답 내용:", e.response.text)
-                return {"error": e.response.text}
-            except Exception as e:
-                print(f"🚨 기타 오류: {str(e)}")
-                return {"error": str(e)}
+        return await user_profile_service.profile(token)
 
     async def user_prefer_api(self, token: str):
-        url = f"{self.base_url}/users/preference"
-        headers = {
-            "Authorization": token,  # ✅ Bearer 붙이기
-            "Content-Type": "application/json"
-        }
-
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-                print("✅ 사용자 정보 가져오기 성공")
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                print(f"❌ 요청 실패: {e.response.status_code}")
-                print("💬 응답 내용:", e.response.text)
-                return {"error": e.response.text}
-            except Exception as e:
-                print(f"🚨 기타 오류: {str(e)}")
-                return {"error": str(e)}
+        return await user_profile_service.preference(token)
@@ -0,0 +1,125 @@
+import asyncio
+import copy
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import httpx
+from loguru import logger
+from app.core.llm_client import get_http_client
+from app.core.metrics import metrics
+
+# 사용자 API 주소 / 프로필 캐시 유지 시간 (초) / 최대 보관 항목 수
+USER_API_BASE_URL = os.getenv("USER_API_BASE_URL", "https://api.eum-friends.com")
+USER_PROFILE_TTL = float(os.getenv("USER_PROFILE_TTL", "300"))
+USER_PROFILE_MAX_ENTRIES = int(os.getenv("USER_PROFILE_MAX_ENTRIES", "2048"))
+
+# 조회 항목 → API 경로
+PROFILE_PATHS = {
+    "profile": "/users/profile",
+    "preference": "/users/preference",
+}
+
+
+class UserProfileService:
+    """
+    사용자 프로필 / 선호 정보 조회 서비스
+    - 공유 HTTP 클라이언트 사용 (요청마다 AsyncClient 생성하지 않음)
+    - 토큰 해시 기준 TTL 캐시 (같은 세션의 다음 턴에서도 재사용)
+    - 같은 항목을 동시에 조회하면 백엔드 요청은 하나로 합침
+    - 오류 응답은 캐시하지 않음
+    """
+
+    def __init__(self, base_url: str = USER_API_BASE_URL, ttl: float = USER_PROFILE_TTL, max_entries: int = USER_PROFILE_MAX_ENTRIES, http_client: Optional[httpx.AsyncClient] = None):
+        self.base_url = base_url
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._http_client = http_client
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._pending: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    def _key(self, kind: str, token: Optional[str]) -> Tuple[str, str]:
+        # 토큰 원문을 키로 보관하지 않음
+        return kind, hashlib.sha256((token or "").encode("utf-8")).hexdigest()
+
+    def _client(self) -> httpx.AsyncClient:
+        return self._http_client or get_http_client(self.base_url)
+
+    async def _fetch(self, kind: str, token: Optional[str]) -> Dict[str, Any]:
+        headers = {
+            "Authorization": token,
+            "Content-Type": "application/json"
+        }
+        try:
+            response = await self._client().get(f"{self.base_url}{PROFILE_PATHS[kind]}", headers=headers)
+            response.raise_for_status()
+            logger.info(f"[사용자 정보] {kind} 조회 성공")
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            logger.error(f"[사용자 정보] {kind} 요청 실패: {e.response.status_code} {e.response.text}")
+            return {"error": e.response.text}
+        except Exception as e:
+            logger.error(f"[사용자 정보] {kind} 조회 오류: {str(e)}")
+            return {"error": str(e)}
+
+    async def get(self, kind: str, token: Optional[str]) -> Dict[str, Any]:
+        """
+        사용자 정보를 반환합니다. (캐시가 유효하면 백엔드 조회 생략)
+
+        Args:
+            kind: "profile" 또는 "preference"
+        """
+        key = self._key(kind, token)
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            self._entries.move_to_end(key)
+            metrics.incr(f"user_profile.{kind}.hit")
+            return copy.deepcopy(entry[1])
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            metrics.incr(f"user_profile.{kind}.coalesced")
+            return copy.deepcopy(await asyncio.shield(pending))
+
+        metrics.incr(f"user_profile.{kind}.miss")
+        pending = self._pending[key] = asyncio.ensure_future(self._fetch(kind, token))
+        # 호출자가 취소되어도 조회가 끝나면 캐시에 저장
+        pending.add_done_callback(lambda future: self._store(key, future))
+        return copy.deepcopy(await asyncio.shield(pending))
+
+    def _store(self, key: Tuple[str, str], future: asyncio.Future) -> None:
+        if self._pending.get(key) is future:
+            del self._pending[key]
+        if future.cancelled():
+            return
+        data = future.result()
+        if isinstance(data, dict) and "error" not in data:
+            self._entries[key] = (time.monotonic(), data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def profile(self, token: Optional[str]) -> Dict[str, Any]:
+        return await self.get("profile", token)
+
+    async def preference(self, token: Optional[str]) -> Dict[str, Any]:
+        return await self.get("preference", token)
+
+    async def profile_and_preference(self, token: Optional[str]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """프로필과 선호 정보를 동시에 조회합니다."""
+        profile, preference = await asyncio.gather(self.profile(token), self.preference(token))
+        return profile, preference
+
+    def invalidate(self, token: Optional[str]) -> None:
+        """사용자 정보가 변경된 경우 캐시를 비웁니다."""
+        for kind in PROFILE_PATHS:
+            self._entries.pop(self._key(kind, token), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._pending.clear()
+
+
+# 전역 프로필 서비스 인스턴스
+user_profile_service = UserProfileService()
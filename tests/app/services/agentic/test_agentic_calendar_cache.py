@@ -0,0 +1,206 @@
+import asyncio
+import copy
+import json
+import os
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import httpx
+import pytest
+
+from app.core import llm_client
+from app.core.metrics import metrics
+from app.services.agentic import agentic_calendar
+from app.services.agentic.agentic_calendar_cache import CalendarSnapshotCache, calendar_snapshots
+
+
+def test_lock_serializes_same_user_and_is_dropped_after_use():
+    cache = CalendarSnapshotCache()
+    order = []
+
+    async def request(token, index):
+        async with cache.lock(token):
+            order.append(("enter", index))
+            await asyncio.sleep(0.01)
+            if cache.get(token, record=False) is None:
+                cache.put(token, [{"id": str(index)}])
+            order.append(("exit", index))
+
+    async def run():
+        await asyncio.gather(*(request("token", index) for index in range(3)))
+
+    asyncio.run(run())
+
+    # 같은 사용자 요청은 겹치지 않고, 첫 요청이 저장한 스냅샷을 나머지가 사용
+    assert order == [("enter", 0), ("exit", 0), ("enter", 1), ("exit", 1), ("enter", 2), ("exit", 2)]
+    assert cache.get("token") == [{"id": "0"}]
+    assert cache.lock_count == 0
+
+
+def test_locks_do_not_accumulate_per_token():
+    cache = CalendarSnapshotCache(max_users=10)
+
+    async def request(token):
+        async with cache.lock(token):
+            await asyncio.sleep(0)
+
+    async def run():
+        await asyncio.gather(*(request(f"token-{index}") for index in range(1000)))
+        for index in range(100):
+            # 예외로 끝나도 락 제거
+            try:
+                async with cache.lock(f"failed-{index}"):
+                    raise RuntimeError("backend error")
+            except RuntimeError:
+                pass
+
+    asyncio.run(run())
+
+    assert cache.lock_count == 0
+
+
+CALENDAR_PATH = httpx.URL(agentic_calendar.CALENDAR_API_URL).path
+EVENTS = [
+    {"id": "1", "summary": "치과", "start": {"dateTime": "2026-10-20T10:00:00+09:00"}, "end": {"dateTime": "2026-10-20T11:00:00+09:00"}},
+    {"id": "2", "summary": "회의", "start": {"dateTime": "2026-10-21T14:00:00+09:00"}, "end": {"dateTime": "2026-10-21T15:00:00+09:00"}},
+]
+
+
+class FakeCalendarBackend:
+    """ETag / Last-Modified 조건부 조회와 추가/수정/삭제를 흉내 내는 캘린더 API"""
+
+    def __init__(self, created_id="3"):
+        self.events = copy.deepcopy(EVENTS)
+        self.version = 1
+        self.created_id = created_id
+        self.requests = []
+
+    @property
+    def etag(self):
+        return f'"v{self.version}"'
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((request.method, request.url.path, request.headers.get("If-None-Match"), request.headers.get("If-Modified-Since")))
+        if request.method == "GET":
+            if request.headers.get("If-None-Match") == self.etag:
+                return httpx.Response(304)
+            return httpx.Response(200, json=copy.deepcopy(self.events), headers={"ETag": self.etag, "Last-Modified": f"v{self.version}-date"})
+        self.version += 1
+        if request.method == "POST":
+            return httpx.Response(200, json={"id": self.created_id} if self.created_id else {})
+        return httpx.Response(200, json={})
+
+    @property
+    def gets(self):
+        return [entry for entry in self.requests if entry[0] == "GET"]
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    fake = FakeCalendarBackend()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(fake.handler))
+    monkeypatch.setitem(llm_client._async_http_clients, llm_client._pool_key(agentic_calendar.CALENDAR_API_URL), client)
+    calendar_snapshots.clear()
+    yield fake
+    calendar_snapshots.clear()
+
+
+def _expire(token):
+    calendar_snapshots.peek(token).fetched_at -= calendar_snapshots.ttl
+
+
+def test_snapshot_expires_after_ttl():
+    cache = CalendarSnapshotCache(ttl=0.05)
+    cache.put("token", [{"id": "1"}], etag='"v1"')
+
+    assert cache.get("token") == [{"id": "1"}]
+    time.sleep(0.06)
+
+    # 만료된 스냅샷은 반환하지 않지만 조건부 갱신 정보는 유지
+    assert cache.get("token") is None
+    assert cache.conditional_headers("token") == {"If-None-Match": '"v1"'}
+
+
+def test_schedule_reuses_snapshot_until_ttl_and_revalidates_with_304(backend):
+    not_modified = metrics.get("calendar.snapshot.not_modified")
+
+    async def run():
+        first = await agentic_calendar.schedule("token")
+        cached = await agentic_calendar.schedule("token")
+        _expire("token")
+        revalidated = await agentic_calendar.schedule("token")
+        after_304 = await agentic_calendar.schedule("token")
+        return first, cached, revalidated, after_304
+
+    first, cached, revalidated, after_304 = asyncio.run(run())
+
+    assert first == cached == revalidated == after_304 == EVENTS
+    # TTL 안에서는 조회하지 않고, 만료 후에는 ETag / Last-Modified 로 조건부 조회 → 304 로 유효 시간 연장
+    assert backend.gets == [
+        ("GET", CALENDAR_PATH, None, None),
+        ("GET", CALENDAR_PATH, '"v1"', "v1-date"),
+    ]
+    assert metrics.get("calendar.snapshot.not_modified") == not_modified + 1
+
+
+def test_schedule_refetches_when_backend_changed(backend):
+    async def run():
+        await agentic_calendar.schedule("token")
+        backend.events = backend.events[:1]
+        backend.version += 1
+        _expire("token")
+        return await agentic_calendar.schedule("token")
+
+    events = asyncio.run(run())
+
+    assert events == EVENTS[:1]
+    assert backend.gets[-1] == ("GET", CALENDAR_PATH, '"v1"', "v1-date")
+    assert calendar_snapshots.peek("token").etag == '"v2"'
+
+
+def test_add_edit_delete_write_through_without_refetch(backend):
+    new_event = {
+        "summary": "저녁 약속",
+        "location": "강남역",
+        "description": "",
+        "startDateTime": "2026-10-22T19:00:00+09:00",
+        "endDateTime": "2026-10-22T21:00:00+09:00",
+    }
+
+    async def run():
+        await agentic_calendar.schedule("token")
+        await agentic_calendar.add_event(new_event, "token")
+        await agentic_calendar.calendar_edit_api(json.dumps({"id": "1", "summary": "치과 (재진)"}), "token")
+        await agentic_calendar.calendar_delete_api(json.dumps({"id": "2"}), "token")
+        return await agentic_calendar.schedule("token")
+
+    events = asyncio.run(run())
+
+    assert [(event["id"], event["summary"]) for event in events] == [("1", "치과 (재진)"), ("3", "저녁 약속")]
+    assert events[0]["start"] == EVENTS[0]["start"]
+    assert events[1]["start"] == {"dateTime": "2026-10-22T19:00:00+09:00"}
+    # 스냅샷에 바로 반영되므로 다시 조회하지 않음
+    assert len(backend.gets) == 1
+    assert [method for method, *_ in backend.requests] == ["GET", "POST", "PATCH", "DELETE"]
+
+
+def test_unknown_changes_invalidate_snapshot(backend):
+    backend.created_id = None
+
+    async def run():
+        await agentic_calendar.schedule("token")
+        # 생성된 일정 id 를 알 수 없으면 스냅샷 만료
+        await agentic_calendar.add_event({"summary": "운동", "startDateTime": "2026-10-23T07:00:00+09:00"}, "token")
+        await agentic_calendar.schedule("token")
+        # 스냅샷에 없는 일정을 수정한 경우도 만료
+        await agentic_calendar.calendar_edit_api(json.dumps({"id": "99", "summary": "없는 일정"}), "token")
+        await agentic_calendar.schedule("token")
+
+    asyncio.run(run())
+
+    assert backend.gets == [
+        ("GET", CALENDAR_PATH, None, None),
+        ("GET", CALENDAR_PATH, '"v1"', "v1-date"),
+        ("GET", CALENDAR_PATH, '"v2"', "v2-date"),
+    ]
@@ -0,0 +1,202 @@
+import os
+import pickle
+import threading
+from datetime import datetime, timedelta
+from itertools import islice
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import pytest
+from google.oauth2.credentials import Credentials
+
+from app.services.agentic import agentic_calendar, agentic_calendar_google
+from app.services.agentic.agentic_calendar import CalendarEvent
+from app.services.agentic.agentic_calendar_google import GoogleCalendarClient
+from app.services.agentic.agentic_calendar_time import CALENDAR_TIMEZONE
+
+NOW = datetime(2025, 4, 14, 9, 0, tzinfo=CALENDAR_TIMEZONE)
+
+
+class FakeEvents:
+    """events().list(...).execute() 를 흉내내는 페이지 단위 응답 (호출 인자 기록)"""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.calls = []
+
+    def list(self, **params):
+        self.calls.append(params)
+        return self
+
+    def execute(self):
+        params = self.calls[-1]
+        offset = int(params.get("pageToken") or 0)
+        size = params["maxResults"]
+        items = [
+            {
+                "id": f"evt-{index}",
+                "summary": f"일정 {index}",
+                "start": {"dateTime": (NOW + timedelta(hours=index)).isoformat()},
+                "end": {"dateTime": (NOW + timedelta(hours=index + 1)).isoformat()}
+            }
+            for index in range(offset, min(offset + size, self.total))
+        ]
+        result = {"items": items}
+        if offset + size < self.total:
+            result["nextPageToken"] = str(offset + size)
+        return result
+
+
+class FakeService:
+    def __init__(self, total: int):
+        self._events = FakeEvents(total)
+
+    def events(self):
+        return self._events
+
+
+def _use_fake_service(monkeypatch, total: int) -> FakeEvents:
+    service = FakeService(total)
+    monkeypatch.setattr(agentic_calendar, "calendar_service", lambda: service)
+    return service.events()
+
+
+def test_pages_are_requested_lazily(monkeypatch):
+    events = _use_fake_service(monkeypatch, total=1000)
+
+    first = list(islice(agentic_calendar.iter_calendar_events(page_size=50), 60))
+
+    assert len(first) == 60
+    assert isinstance(first[0], CalendarEvent)
+    assert len(events.calls) == 2
+
+
+def test_all_pages_are_followed(monkeypatch):
+    events = _use_fake_service(monkeypatch, total=120)
+
+    ids = [event.id for event in agentic_calendar.iter_calendar_events(page_size=50)]
+
+    assert ids == [f"evt-{index}" for index in range(120)]
+    assert [call.get("pageToken") for call in events.calls] == [None, "50", "100"]
+
+
+def test_calendar_list_uses_request_window(monkeypatch):
+    events = _use_fake_service(monkeypatch, total=3)
+
+    list(agentic_calendar.Calendar_list("내일 일정 알려줘", now=NOW))
+    list(agentic_calendar.Calendar_list(now=NOW))
+
+    assert events.calls[0]["timeMin"] == "2025-04-15T00:00:00+09:00"
+    assert events.calls[0]["timeMax"] == "2025-04-16T00:00:00+09:00"
+    assert events.calls[1]["timeMin"] == "2025-04-14T00:00:00+09:00"
+    assert events.calls[1]["timeMax"] == (NOW.replace(hour=0) + timedelta(days=agentic_calendar.CALENDAR_LIST_DEFAULT_DAYS)).isoformat()
+
+
+def _write_token(path, expires_in: int, refresh_token: str = "refresh"):
+    creds = Credentials(token="old-token", refresh_token=refresh_token, expiry=datetime.utcnow() + timedelta(seconds=expires_in))
+    with open(path, "wb") as token:
+        pickle.dump(creds, token)
+
+
+def _fake_refresh(self, request):
+    self.token = "new-token"
+    self.expiry = datetime.utcnow() + timedelta(hours=1)
+
+
+def test_credentials_and_service_are_cached(tmp_path, monkeypatch):
+    token_path = tmp_path / "token.pickle"
+    _write_token(token_path, expires_in=3600)
+    written_at = os.stat(token_path).st_mtime_ns
+    builds = []
+    monkeypatch.setattr(agentic_calendar_google, "build", lambda *args, **kwargs: builds.append(kwargs) or object())
+    monkeypatch.setattr(Credentials, "refresh", _fake_refresh)
+    loads = []
+    original_load = pickle.load
+    monkeypatch.setattr(agentic_calendar_google.pickle, "load", lambda file: loads.append(file) or original_load(file))
+    client = GoogleCalendarClient(token_path=str(token_path))
+
+    try:
+        first = client.service()
+        for _ in range(5):
+            assert client.service() is first
+            assert client.credentials().token == "old-token"
+    finally:
+        client.close()
+
+    assert len(loads) == 1
+    assert len(builds) == 1
+    assert os.stat(token_path).st_mtime_ns == written_at
+
+
+def test_expiring_token_is_refreshed_and_saved_once(tmp_path, monkeypatch):
+    token_path = tmp_path / "token.pickle"
+    _write_token(token_path, expires_in=60)
+    monkeypatch.setattr(Credentials, "refresh", _fake_refresh)
+    client = GoogleCalendarClient(token_path=str(token_path), refresh_margin=300)
+
+    try:
+        assert client.credentials().token == "new-token"
+        mtime = os.path.getmtime(token_path)
+        client.credentials()
+        assert os.path.getmtime(token_path) == mtime
+        assert client._timer is not None and client._timer.daemon
+    finally:
+        client.close()
+
+    with open(token_path, "rb") as token:
+        assert pickle.load(token).token == "new-token"
+
+
+def test_each_thread_gets_its_own_service_and_http(tmp_path, monkeypatch):
+    token_path = tmp_path / "token.pickle"
+    _write_token(token_path, expires_in=3600)
+    monkeypatch.setattr(agentic_calendar_google, "build", lambda *args, **kwargs: object())
+    client = GoogleCalendarClient(token_path=str(token_path))
+    services = []
+
+    def worker():
+        services.append((client.service(), client.service()))
+
+    try:
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        client.close()
+
+    # 같은 스레드에서는 재사용, 스레드끼리는 공유하지 않음
+    assert all(first is second for first, second in services)
+    assert len({id(first) for first, _ in services}) == 3
+
+
+def test_expired_token_without_refresh_token_reauthorizes(tmp_path, monkeypatch):
+    token_path = tmp_path / "token.pickle"
+    _write_token(token_path, expires_in=3600, refresh_token=None)
+    new_creds = Credentials(token="authorized-token", refresh_token="refresh", expiry=datetime.utcnow() + timedelta(hours=1))
+    flows = []
+
+    class FakeFlow:
+        def run_local_server(self, port):
+            flows.append(port)
+            return new_creds
+
+    monkeypatch.setattr(agentic_calendar_google.InstalledAppFlow, "from_client_secrets_file", lambda *args: FakeFlow())
+    monkeypatch.setattr(agentic_calendar_google, "build", lambda *args, **kwargs: object())
+    client = GoogleCalendarClient(token_path=str(token_path), refresh_margin=0)
+
+    try:
+        first = client.service()
+        assert client.credentials().token == "old-token"
+        client.credentials().expiry = datetime.utcnow() - timedelta(seconds=1)
+
+        assert client.credentials().token == "authorized-token"
+        # 인증 정보가 바뀌었으므로 service 도 새로 생성
+        assert client.service() is not first
+    finally:
+        client.close()
+
+    assert len(flows) == 1
+    with open(token_path, "rb") as token:
+        assert pickle.load(token).token == "authorized-token"
@@ -0,0 +1,114 @@
+import os
+import re
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from app.services.agentic.agentic_calendar import calendar_events
+from app.services.agentic.agentic_calendar_selector import select_candidates, to_check_items
+from app.services.agentic.agentic_calendar_time import CALENDAR_TIMEZONE, parse_time_window
+
+# 2025-04-14 (월) 09:00 KST
+NOW = datetime(2025, 4, 14, 9, 0, tzinfo=CALENDAR_TIMEZONE)
+CALENDAR_SIZES = [10, 100, 1000]
+TITLES = ["회의", "치과 예약", "친구와 저녁", "헬스장", "프로젝트 미팅", "스터디 모임", "점심약속", "개발자 밋업", "출장 - 부산", "가족 여행"]
+
+
+def _event(event_id: str, summary: str, start: datetime, hours: int = 1) -> dict:
+    return {
+        "id": event_id,
+        "summary": summary,
+        "description": summary,
+        "start": {"dateTime": start.isoformat(), "timeZone": "Asia/Seoul"},
+        "end": {"dateTime": (start + timedelta(hours=hours)).isoformat(), "timeZone": "Asia/Seoul"}
+    }
+
+
+def _calendar(size: int) -> list:
+    """NOW 기준 앞뒤로 퍼져 있는 일정 size 개 (하루 최대 4개)"""
+    events = []
+    for index in range(size):
+        start = NOW + timedelta(days=index // 4 - size // 8, hours=(index % 4) * 3)
+        events.append(_event(f"evt-{index}", f"{TITLES[index % len(TITLES)]} {index}", start))
+    return events
+
+
+def _estimate_tokens(text: str) -> int:
+    """단어 / 기호 단위 근사 토큰 수"""
+    return len(re.findall(r"\w+|[^\w\s]", text))
+
+
+def test_parse_time_window():
+    assert parse_time_window("오늘 헬스장 삭제해줘", NOW) == (NOW.replace(hour=0), NOW.replace(hour=0) + timedelta(days=1))
+    assert parse_time_window("내일 일정 확인해줘", NOW)[0].day == 15
+    assert parse_time_window("다음주 금요일 스케줄 알려줘", NOW)[0].date().isoformat() == "2025-04-25"
+    assert parse_time_window("5월 3일에 무슨 일정 있었지?", NOW)[0].date().isoformat() == "2025-05-03"
+    assert parse_time_window("22일 점심약속 빼줘", NOW)[0].date().isoformat() == "2025-04-22"
+
+    week_start, week_end = parse_time_window("이번 주 내 일정 알려줘", NOW)
+    assert (week_start.date().isoformat(), (week_end - week_start).days) == ("2025-04-14", 7)
+
+    weekend_start, weekend_end = parse_time_window("이번 주말에 일정 있어?", NOW)
+    assert (weekend_start.date().isoformat(), (weekend_end - weekend_start).days) == ("2025-04-19", 2)
+
+    month_start, month_end = parse_time_window("내가 이번 달에 뭐 있지?", NOW)
+    assert (month_start.date().isoformat(), month_end.date().isoformat()) == ("2025-04-01", "2025-05-01")
+
+    assert parse_time_window("show my schedule for next monday", NOW)[0].date().isoformat() == "2025-04-21"
+    assert parse_time_window("친구 만나는 일정 지워줘", NOW) is None
+
+
+def test_select_candidates_matches_title_and_window():
+    events = [
+        _event("a", "프로젝트 미팅", NOW.replace(hour=14)),
+        _event("b", "헬스장", NOW.replace(hour=18)),
+        _event("c", "헬스장", NOW.replace(hour=18) + timedelta(days=1)),
+        _event("d", "개발자 밋업", NOW + timedelta(days=3)),
+    ]
+
+    assert select_candidates(events, "오늘 헬스장 삭제해줘", NOW)["candidates"][0]["id"] == "b"
+    assert select_candidates(events, "내일 헬스장 취소", NOW)["candidates"][0]["id"] == "c"
+    assert select_candidates(events, "개발자 모임 일정 지워줘", NOW)["candidates"][0]["id"] == "d"
+
+    # 기간 내 일정이 없으면 전체 일정에서 제목으로 선정
+    assert select_candidates(events, "다음달 개발자 밋업 취소", NOW)["candidates"][0]["id"] == "d"
+
+
+def test_check_items_are_sorted_by_start():
+    events = [_event("late", "저녁", NOW.replace(hour=19)), _event("early", "아침", NOW.replace(hour=7))]
+
+    items = to_check_items(select_candidates(events, "오늘 일정 알려줘", NOW)["in_window"])
+
+    assert [item["summary"] for item in items] == ["아침", "저녁"]
+    assert items[0]["start"]["timeZone"] == "Asia/Seoul"
+
+
+def test_candidate_prompt_token_count_is_flat():
+    """
+    일정 수가 늘어도 LLM 에 전달되는 후보 목록의 토큰 수(근사치)는 일정해야 함
+    (LLM 지연 시간은 측정하지 않음, 후보 선정 시간만 상한 확인)
+    """
+    query = "헬스장 일정 취소해줘"
+    rows = []
+    for size in CALENDAR_SIZES:
+        events = _calendar(size)
+        full_tokens = _estimate_tokens(calendar_events(events))
+
+        start = time.perf_counter()
+        selection = select_candidates(events, query, NOW)
+        candidate_list = calendar_events(selection["candidates"])
+        select_ms = (time.perf_counter() - start) * 1000
+
+        rows.append((size, full_tokens, _estimate_tokens(candidate_list), select_ms))
+        assert "헬스장" in selection["candidates"][0]["summary"]
+
+    print("\n[calendar candidate prompt token count]")
+    print(f"{'events':>8} {'full list tokens':>18} {'candidate tokens':>18} {'select ms':>10}")
+    for size, full_tokens, candidate_tokens, select_ms in rows:
+        print(f"{size:>8} {full_tokens:>18} {candidate_tokens:>18} {select_ms:>10.2f}")
+
+    smallest, largest = rows[0], rows[-1]
+    assert largest[1] > smallest[1] * 50
+    assert largest[2] <= smallest[2] * 1.5
+    assert largest[3] < 500, f"1000개 일정 후보 선정에 {largest[3]:.0f}ms 소요"
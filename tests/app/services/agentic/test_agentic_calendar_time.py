@@ -0,0 +1,135 @@
+import asyncio
+import json
+import os
+from datetime import datetime
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.core import llm_client
+from app.services.agentic import agentic_calendar
+from app.services.agentic.agentic_calendar import rule_based_schedule
+from app.services.agentic.agentic_calendar_time import CALENDAR_TIMEZONE, parse_event_time
+
+# 2025-04-14 (월) 08:00 KST
+NOW = datetime(2025, 4, 14, 8, 0, tzinfo=CALENDAR_TIMEZONE)
+
+# Input_analysis 의 일정 추가 예시 + 영어 / ISO 표현
+# (입력, 제목, 시작, 종료)
+ADD_CORPUS = [
+    ("오늘 오후에 영화 보자", "영화", "2025-04-14T14:00", "2025-04-14T15:00"),
+    ("5월 3일에 생일 파티 일정 추가해줘", "생일 파티", "2025-05-03T09:00", "2025-05-03T10:00"),
+    ("이번 주 금요일에 미용실 예약 좀 넣어줘", "미용실 예약", "2025-04-18T09:00", "2025-04-18T10:00"),
+    ("4월 20일에 친구랑 저녁 약속 있어", "친구랑 저녁 약속", "2025-04-20T18:00", "2025-04-20T19:00"),
+    ("내일 오전 9시에 회의 있어", "회의", "2025-04-15T09:00", "2025-04-15T10:00"),
+    ("주말에 등산 일정 잡아줘", "등산", "2025-04-19T09:00", "2025-04-19T10:00"),
+    ("다음주 화요일에 프로젝트 발표 있어", "프로젝트 발표", "2025-04-22T09:00", "2025-04-22T10:00"),
+    ("오늘 밤에 헬스장 갈 거야", "헬스장", "2025-04-14T20:00", "2025-04-14T21:00"),
+    ("7시에 엄마랑 전화하기 일정 넣어줘", "엄마랑 전화하기", "2025-04-14T19:00", "2025-04-14T20:00"),
+    ("모레 오후 3시 30분부터 5시까지 강남역에서 스터디", "스터디", "2025-04-16T15:30", "2025-04-16T17:00"),
+    ("3시 반에 팀 미팅", "팀 미팅", "2025-04-14T15:30", "2025-04-14T16:30"),
+    ("Add dentist appointment on May 3 at 3pm to my calendar", "dentist appointment", "2025-05-03T15:00", "2025-05-03T16:00"),
+    ("Lunch with Tom tomorrow at 12:30", "Lunch with Tom", "2025-04-15T12:30", "2025-04-15T13:30"),
+    ("next friday 9am standup", "standup", "2025-04-25T09:00", "2025-04-25T10:00"),
+    ("2025-05-02 10:00-11:30 team sync", "team sync", "2025-05-02T10:00", "2025-05-02T11:30"),
+    ("2025-05-02T10:00:00-05:00 client call", "client call", "2025-05-03T00:00", "2025-05-03T01:00"),
+]
+
+
+@pytest.mark.parametrize("text,summary,start,end", ADD_CORPUS)
+def test_rule_based_schedule_corpus(text, summary, start, end):
+    event = rule_based_schedule(text, NOW)
+
+    assert event is not None
+    assert event["summary"] == summary
+    assert event["startDateTime"] == f"{start}:00+09:00"
+    assert event["endDateTime"] == f"{end}:00+09:00"
+    assert event["description"] == text
+
+
+def test_location_is_extracted():
+    assert rule_based_schedule("내일 오후 2시 강남역에서 스터디", NOW)["location"] == "강남역"
+
+
+def test_past_time_without_date_moves_to_next_day():
+    start, _ = parse_event_time("오전 7시 조깅", NOW)
+
+    assert start.isoformat() == "2025-04-15T07:00:00+09:00"
+
+
+# 2026-10-18 (일) 10:00 KST
+SUNDAY = datetime(2026, 10, 18, 10, 0, tzinfo=CALENDAR_TIMEZONE)
+
+
+@pytest.mark.parametrize("text,summary,start", [
+    ("5월 3일에 생일 파티 일정 추가해줘", "생일 파티", "2027-05-03T09:00"),
+    ("Lunch with Sam on May 2nd", "Lunch with Sam", "2027-05-02T09:00"),
+    ("1일에 월세 내기", "월세 내기", "2026-11-01T09:00"),
+    ("18일 오후 3시에 치과", "치과", "2026-10-18T15:00"),
+    ("2026-05-02 10:00 회고", "회고", "2026-05-02T10:00"),
+])
+def test_past_dates_roll_forward(text, summary, start):
+    event = rule_based_schedule(text, SUNDAY)
+
+    assert event["summary"] == summary
+    assert event["startDateTime"] == f"{start}:00+09:00"
+
+
+@pytest.mark.parametrize("text", [
+    "이번 주 금요일에 미용실 예약 좀 넣어줘",
+    "this friday 9am standup",
+    "매주 월요일 회의",
+    "매일 아침 7시 조깅",
+    "every Monday 10am team sync",
+])
+def test_ambiguous_or_recurring_dates_fall_back(text):
+    assert rule_based_schedule(text, SUNDAY) is None
+
+
+@pytest.mark.parametrize("text", ["친구 만나는 일정 추가해줘", "내일 일정 추가해줘", "회의 시간 2시간"])
+def test_unparseable_requests_fall_back(text):
+    assert rule_based_schedule(text, NOW) is None
+
+
+@pytest.mark.parametrize("text", [
+    "Add a meeting at 5 tomorrow",
+    "Dinner at 7pm for 3 hours",
+    "Dinner at 7pm for an hour",
+    "Add a meeting on Friday the 13th",
+    "Add a meeting on Friday the thirteenth",
+    "내일 오후 3시에 2시간 동안 회의",
+])
+def test_partially_understood_requests_fall_back(text):
+    # 해석하지 못한 숫자 / 기간 / 서수 날짜가 남으면 잘못된 일정을 만들지 않고 LLM 으로
+    assert rule_based_schedule(text, SUNDAY) is None
+
+
+def test_make_schedule_uses_llm_only_as_fallback():
+    llm_event = {"summary": "친구 만나기", "location": "", "description": "친구 만나는 일정 추가해줘",
+                 "startDateTime": "2025-04-14T18:00:00+09:00", "endDateTime": "2025-04-14T19:00:00+09:00"}
+    llm_client.reset_llm_registry()
+    fake = FakeListChatModel(responses=[json.dumps(llm_event, ensure_ascii=False)])
+    llm_client._langchain_llms[llm_client._registry_key(False)] = fake
+
+    assert asyncio.run(agentic_calendar.MakeSchedule("내일 오전 9시에 회의 있어"))["summary"] == "회의"
+    assert fake.i == 0
+
+    assert asyncio.run(agentic_calendar.MakeSchedule("친구 만나는 일정 추가해줘")) == llm_event
+    llm_client.reset_llm_registry()
+
+
+def test_make_schedule_parses_original_query_before_translation():
+    llm_client.reset_llm_registry()
+    fake = FakeListChatModel(responses=["{}"])
+    llm_client._langchain_llms[llm_client._registry_key(False)] = fake
+
+    try:
+        event = asyncio.run(agentic_calendar.MakeSchedule("I have a meeting at 9 am tomorrow", "내일 오전 9시에 회의 있어"))
+    finally:
+        llm_client.reset_llm_registry()
+
+    assert event["summary"] == "회의"
+    assert event["description"] == "내일 오전 9시에 회의 있어"
+    assert fake.i == 0
@@ -0,0 +1,98 @@
+import asyncio
+import json
+import os
+import time
+from typing import Any, List, Optional
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import httpx
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from app.core import llm_client
+from app.services.agentic import agentic_calendar
+from app.services.agentic.agentic_find_foodstore import foodstore
+from app.services.common.preprocessor import translate_query
+
+LLM_LATENCY = 0.3
+PARALLEL_REQUESTS = 10
+
+
+class SlowChatModel(BaseChatModel):
+    """고정 지연 후 JSON 을 반환하는 테스트용 LLM (동기 호출은 이벤트 루프를 막음)"""
+
+    content: str
+    latency: float = LLM_LATENCY
+
+    @property
+    def _llm_type(self) -> str:
+        return "slow-fake"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs) -> ChatResult:
+        time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.content))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.content))])
+
+
+def _use_fake_llm(content: dict) -> None:
+    llm_client.reset_llm_registry()
+    fake = SlowChatModel(content=json.dumps(content, ensure_ascii=False))
+    llm_client._langchain_llms[llm_client._registry_key(True)] = fake
+    llm_client._langchain_llms[llm_client._registry_key(False)] = fake
+
+
+async def _gather_timed(coroutines) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*coroutines)
+    return time.perf_counter() - start
+
+
+def test_translate_query_runs_concurrently():
+    """번역 요청 N개를 동시에 실행하면 LLM 1회 호출 시간 수준에 끝나야 함"""
+    _use_fake_llm({"translated_query": "hello", "lang_code": "ko"})
+
+    elapsed = asyncio.run(_gather_timed(
+        translate_query(f"안녕하세요 {i}", lang_code="ko") for i in range(PARALLEL_REQUESTS)
+    ))
+
+    assert elapsed < LLM_LATENCY * 3, f"{PARALLEL_REQUESTS}개 요청에 {elapsed:.2f}초 소요 (이벤트 루프 블로킹 의심)"
+
+
+def test_agent_chain_runs_concurrently():
+    """에이전트 체인 호출도 이벤트 루프를 막지 않아야 함"""
+    _use_fake_llm({"intention": "스타벅스", "tag": "Find"})
+    store = foodstore()
+
+    elapsed = asyncio.run(_gather_timed(
+        store.query_analyze(f"Find a starbucks near me {i}") for i in range(PARALLEL_REQUESTS)
+    ))
+
+    assert elapsed < LLM_LATENCY * 3, f"{PARALLEL_REQUESTS}개 요청에 {elapsed:.2f}초 소요 (이벤트 루프 블로킹 의심)"
+
+
+def test_calendar_request_runs_concurrently():
+    """캘린더 요청(LLM + 백엔드 호출)도 이벤트 루프를 막지 않아야 함"""
+    _use_fake_llm({"output": "check"})
+
+    async def slow_backend(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(LLM_LATENCY)
+        return httpx.Response(200, json=[])
+
+    base_url = agentic_calendar.CALENDAR_API_URL
+    llm_client._async_http_clients[llm_client._pool_key(base_url)] = httpx.AsyncClient(transport=httpx.MockTransport(slow_backend))
+    calendar = agentic_calendar.AgenticCalendar()
+
+    try:
+        # 분류(LLM) → 일정 조회(백엔드) → 요약(LLM) 순서로 3번 대기
+        elapsed = asyncio.run(_gather_timed(
+            calendar.Calendar_function(f"이번 주 내 일정 알려줘 {i}", "token") for i in range(PARALLEL_REQUESTS)
+        ))
+    finally:
+        llm_client._async_http_clients.pop(llm_client._pool_key(base_url), None)
+
+    assert elapsed < LLM_LATENCY * 3 * 3, f"{PARALLEL_REQUESTS}개 요청에 {elapsed:.2f}초 소요 (이벤트 루프 블로킹 의심)"
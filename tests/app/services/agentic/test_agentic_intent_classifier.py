@@ -0,0 +1,141 @@
+import asyncio
+import os
+import zlib
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import numpy as np
+import pytest
+
+from app.models.agentic_response import AgentType, SubIntent
+from app.services.agentic import agentic_intent_classifier
+from app.services.agentic.agentic_classifier import AgenticClassifier, to_sub_intent
+from app.services.agentic.agentic_intent_classifier import EmbeddingIntentClassifier, load_examples
+
+TOY_TRAIN = {
+    "weather": ["오늘 날씨 어때", "내일 날씨 알려줘", "weather today", "weather forecast"],
+    "calendar": ["일정 추가해줘", "내 일정 알려줘", "add to my calendar", "calendar schedule"],
+    "dog": ["강아지 보여줘", "강아지 사진", "show me a dog", "dog picture"],
+}
+
+
+def hashing_encoder(texts):
+    """문자 bigram 해싱 임베딩 (테스트용 결정적 인코더)"""
+    vectors = np.zeros((len(texts), 256), dtype=np.float32)
+    for row, text in enumerate(texts):
+        text = text.lower().replace(" ", "")
+        for index in range(len(text) - 1):
+            vectors[row, zlib.crc32(text[index:index + 2].encode("utf-8")) % 256] += 1
+    return vectors
+
+
+@pytest.fixture
+def toy_classifier(monkeypatch):
+    classifier = EmbeddingIntentClassifier(hashing_encoder, margin=0.05, min_score=0.2).fit(TOY_TRAIN)
+    monkeypatch.setattr(agentic_intent_classifier, "_intent_classifier", classifier)
+    monkeypatch.setattr(agentic_intent_classifier, "_intent_classifier_loaded", True)
+    return classifier
+
+
+def test_examples_cover_every_agent_type():
+    examples = load_examples()
+
+    assert set(examples["train"]) == {agent_type.value for agent_type in AgentType}
+    assert all(AgentType(item["agent_type"]) for item in examples["eval"])
+
+
+def test_nearest_centroid_prediction(toy_classifier):
+    prediction = toy_classifier.predict("내일 날씨 어때?")
+
+    assert prediction.agent_type == AgentType.WEATHER
+    assert prediction.confident
+    assert toy_classifier.predict("show me a dog please").agent_type == AgentType.DOG
+
+
+def test_low_margin_is_not_confident(toy_classifier):
+    # 어느 유형과도 겹치지 않는 문장
+    assert not toy_classifier.predict("xyz").confident
+
+
+def test_classifier_skips_llm_when_confident(toy_classifier, monkeypatch):
+    llm_calls = []
+
+    async def fake_llm(self, query):
+        llm_calls.append(query)
+        return AgentType.GENERAL
+
+    monkeypatch.setattr(AgenticClassifier, "_classify_agent_type_llm", fake_llm)
+    classifier = AgenticClassifier()
+
+    assert asyncio.run(classifier.classify("내 일정 알려줘")) == AgentType.CALENDAR.value
+    assert llm_calls == []
+
+    assert asyncio.run(classifier.classify("xyz")) == AgentType.GENERAL.value
+    assert llm_calls == ["xyz"]
+
+
+def test_sub_intent_keeps_only_valid_fields_of_agent_type():
+    sub_intent = to_sub_intent(AgentType.LOCATION, {
+        "location_tag": "find", "location_intention": "약국", "kakao_category": "pm9", "calendar_action": "add"
+    })
+
+    assert (sub_intent.location_tag, sub_intent.location_intention, sub_intent.kakao_category) == ("Find", "약국", "PM9")
+    assert sub_intent.calendar_action is None
+    assert to_sub_intent(AgentType.CALENDAR, {"calendar_action": "move"}) is None
+    assert to_sub_intent(AgentType.COVER_LETTER, {"job_role": "no", "desired_field": "None"}) == SubIntent(job_role=False)
+
+
+def test_hierarchical_classification_returns_sub_intent_in_one_call(monkeypatch):
+    prompts = []
+
+    async def fake_generate(prompt):
+        prompts.append(prompt)
+        return '```json\n{"agent_type": "calendar", "sub_intent": {"calendar_action": "delete"}}\n```'
+
+    monkeypatch.setattr(agentic_intent_classifier, "_intent_classifier", None)
+    monkeypatch.setattr(agentic_intent_classifier, "_intent_classifier_loaded", True)
+    classifier = AgenticClassifier()
+    monkeypatch.setattr(classifier.llm_client, "generate", fake_generate)
+
+    result = asyncio.run(classifier.classify_hierarchical("내일 약속 취소해줘"))
+
+    assert result == {"agent_type": "calendar", "sub_intent": SubIntent(calendar_action="delete")}
+    assert len(prompts) == 1
+
+
+def test_warm_up_loads_classifier_before_first_request(monkeypatch):
+    loads = []
+
+    def fake_encoder():
+        loads.append(1)
+        return hashing_encoder
+
+    monkeypatch.setattr(agentic_intent_classifier, "sentence_transformer_encoder", fake_encoder)
+    monkeypatch.setattr(agentic_intent_classifier, "_intent_classifier", None)
+    monkeypatch.setattr(agentic_intent_classifier, "_intent_classifier_loaded", False)
+
+    asyncio.run(agentic_intent_classifier.warm_intent_classifier())
+    assert loads == [1]
+    assert agentic_intent_classifier._intent_classifier_loaded
+
+    # 요청 시에는 로드 없이 바로 분류
+    assert asyncio.run(agentic_intent_classifier.classify_intent("오늘 날씨 어때")) is not None
+    assert loads == [1]
+
+
+def test_calibration_prefers_highest_coverage_at_target_accuracy():
+    def prediction(agent_type, score, margin):
+        return agentic_intent_classifier.IntentPrediction(agent_type, score, margin, True)
+
+    predictions = [
+        (AgentType.WEATHER, prediction(AgentType.WEATHER, 0.8, 0.3)),
+        (AgentType.WEATHER, prediction(AgentType.WEATHER, 0.6, 0.1)),
+        # 낮은 점수 / 차이에서는 오분류
+        (AgentType.CALENDAR, prediction(AgentType.WEATHER, 0.45, 0.02)),
+    ]
+
+    best = agentic_intent_classifier.calibrate(predictions, target_accuracy=1.0)[0]
+
+    assert best["coverage"] == 2 / 3
+    assert best["accuracy"] == 1.0
+    assert best["min_score"] > 0.45 or best["margin"] > 0.02
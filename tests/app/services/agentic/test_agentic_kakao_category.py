@@ -0,0 +1,61 @@
+import asyncio
+import json
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.core import llm_client
+from app.core.metrics import metrics
+from app.services.agentic.agentic_find_foodstore import foodstore
+from app.services.agentic.agentic_kakao_category import KAKAO_CATEGORY_CODES, resolve_kakao_category
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("1", "MT1"),
+    ("2번", "CS2"),
+    ("10번이요", "SC4"),
+    ("15.", "PO3"),
+    ("no. 4", "CE7"),
+    ("근처 편의점 찾아줘", "CS2"),
+    ("Find a starbucks near me", "CE7"),
+    ("gas station", "OL7"),
+    ("subway station", "SW8"),
+    ("이마트24", "CS2"),
+    ("近くの薬局", "PM9"),
+    ("附近的医院", "HP8"),
+])
+def test_direct_matches(text, expected):
+    assert resolve_kakao_category(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "16", "0번", "Find nearby amenities", "cute", "", "3번이랑 4번",
+    # 다른 장소를 기준점으로 언급하거나 서로 다른 카테고리 키워드가 섞인 경우
+    "pharmacy near the subway station", "지하철역 근처 약국", "cafe near the hospital", "주차장 있는 식당", "대학원",
+])
+def test_unresolved_inputs_fall_back(text):
+    assert resolve_kakao_category(text) is None
+
+
+def test_menu_numbers_follow_category_query_order():
+    assert [resolve_kakao_category(str(number)) for number in range(1, 16)] == list(KAKAO_CATEGORY_CODES)
+
+
+def test_category_extraction_uses_llm_only_on_miss():
+    llm_client.reset_llm_registry()
+    llm_client._langchain_llms[llm_client._registry_key(False)] = FakeListChatModel(
+        responses=[json.dumps({"input": "기념품", "output": "AT4"})]
+    )
+    before = metrics.get("kakao_category.llm_fallback")
+    try:
+        store = foodstore()
+        assert asyncio.run(store.Category_extraction("3번")) == {"input": "3번", "output": "FD6"}
+        assert metrics.get("kakao_category.llm_fallback") == before
+
+        assert asyncio.run(store.Category_extraction("기념품 살 곳"))["output"] == "AT4"
+        assert metrics.get("kakao_category.llm_fallback") == before + 1
+    finally:
+        llm_client.reset_llm_registry()
@@ -0,0 +1,46 @@
+import asyncio
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from app.models.agentic_response import SubIntent
+from app.services.agentic.agentic_classifier import AgentType
+from app.services.agentic.agentic_context import RequestContext
+from app.services.agentic.agentic_response_generator import AgenticResponseGenerator
+
+
+class FakeFoodstore:
+    """의도 분석 호출을 기록하고 카테고리 질문으로 끝나는 위치 에이전트"""
+
+    def __init__(self):
+        self.analyzed = []
+
+    async def query_analyze(self, query):
+        self.analyzed.append(query)
+        return {"intention": "약국", "tag": "None"}
+
+    async def category_query(self, source_lang):
+        return "어떤 장소를 찾으세요?"
+
+
+def _route(sub_intent):
+    generator = AgenticResponseGenerator.__new__(AgenticResponseGenerator)
+    generator.TEST = FakeFoodstore()
+    context = RequestContext(uid="uid", token="token", source_lang="ko")
+    result = asyncio.run(generator.generate_response("주변 약국", "주변 약국", AgentType.LOCATION, "initial", context, sub_intent))
+    return generator.TEST, result
+
+
+def test_sub_intent_with_tag_and_intention_skips_query_analyze():
+    store, result = _route(SubIntent(location_tag="None", location_intention="약국"))
+
+    assert store.analyzed == []
+    assert result["metadata"]["state"] == "location_category"
+
+
+def test_sub_intent_without_intention_falls_back_to_query_analyze():
+    for sub_intent in (SubIntent(location_tag="Find"), SubIntent(location_tag="Find", location_intention=""), None):
+        store, result = _route(sub_intent)
+
+        assert store.analyzed == ["주변 약국"]
+        assert result["metadata"]["state"] == "location_category"
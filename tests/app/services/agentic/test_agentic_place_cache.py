@@ -0,0 +1,137 @@
+import asyncio
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from app.core.metrics import metrics
+from app.services.agentic.agentic_place_cache import PlaceSearchCache, geohash_bounds, geohash_encode, haversine_m
+
+# 시청역 부근 사용자 / 장소
+USER = (37.5657, 126.9769)
+PLACES = [
+    {"place_name": "far", "x": "126.9900", "y": "37.5700"},
+    {"place_name": "near", "x": "126.9772", "y": "37.5659"},
+    {"place_name": "outside", "x": "127.0600", "y": "37.5100"},
+    {"place_name": "middle", "x": "126.9800", "y": "37.5662"},
+]
+
+
+class FakeKakao:
+    def __init__(self):
+        self.calls = []
+
+    async def fetch(self, latitude: float, longitude: float, radius: int, page: int):
+        self.calls.append((latitude, longitude, radius))
+        await asyncio.sleep(0.01)
+        return PLACES, True
+
+
+class DenseKakao:
+    """격자 중심 주변에 장소가 빽빽한 지역 (격자 검색은 항상 다음 페이지가 남음)"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def fetch(self, latitude: float, longitude: float, radius: int, page: int):
+        self.calls.append((latitude, longitude, radius, page))
+        if radius > 3000:
+            places = [{"place_name": f"center-{page}-{index}", "x": f"{longitude + index * 0.00001:.6f}", "y": f"{latitude:.6f}"} for index in range(15)]
+            return places, False
+        return [{"place_name": "user-near", "x": f"{longitude:.6f}", "y": f"{latitude + 0.0001:.6f}"}], True
+
+
+def test_geohash_matches_reference_values():
+    assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    lat_min, lat_max, lon_min, lon_max = geohash_bounds("u4pruydqqvj")
+    assert lat_min <= 57.64911 <= lat_max and lon_min <= 10.40744 <= lon_max
+
+
+def test_nearby_users_share_a_tile_and_get_their_own_distances():
+    kakao = FakeKakao()
+    cache = PlaceSearchCache(precision=6, radius=3000)
+    hits = metrics.get("place_cache.hit")
+
+    async def run():
+        first = await asyncio.gather(*(cache.search(kakao.fetch, *USER, "FD6", "Cafe ") for _ in range(5)))
+        # 같은 격자 안의 다른 사용자
+        moved = await cache.search(kakao.fetch, 37.5661, 126.9790, "FD6", "cafe")
+        return first, moved
+
+    first, moved = asyncio.run(run())
+
+    assert len(kakao.calls) == 1
+    center_lat, center_lon, radius = kakao.calls[0]
+    # 격자 안 어느 위치에서도 반경 3km 를 덮도록 격자 반대각선만큼 넓혀서 조회
+    assert radius > 3000
+    assert geohash_encode(center_lat, center_lon, 6) == geohash_encode(*USER, 6)
+
+    assert [place["place_name"] for place in first[0]] == ["near", "middle", "far"]
+    assert first[0][0]["distance"] == str(round(haversine_m(*USER, 37.5659, 126.9772)))
+    assert [place["place_name"] for place in moved] == ["middle", "near", "far"]
+    assert metrics.get("place_cache.hit") == hits + 1
+
+
+def test_tiles_are_keyed_by_category_and_evicted_lru():
+    kakao = FakeKakao()
+    cache = PlaceSearchCache(max_tiles=2)
+
+    async def run():
+        await cache.search(kakao.fetch, *USER, "FD6")
+        await cache.search(kakao.fetch, *USER, "CE7")
+        await cache.search(kakao.fetch, *USER, "FD6")
+        await cache.search(kakao.fetch, *USER, "PM9")  # CE7 제거
+        await cache.search(kakao.fetch, *USER, "FD6")
+        await cache.search(kakao.fetch, *USER, "CE7")
+
+    asyncio.run(run())
+
+    assert len(kakao.calls) == 4
+    assert cache.tile_count == 2
+
+
+def test_expired_tiles_are_refetched():
+    kakao = FakeKakao()
+    cache = PlaceSearchCache(ttl=0)
+
+    async def run():
+        await cache.search(kakao.fetch, *USER, "FD6")
+        await cache.search(kakao.fetch, *USER, "FD6")
+
+    asyncio.run(run())
+
+    assert len(kakao.calls) == 2
+
+
+def test_incomplete_tile_falls_back_to_user_point_at_cell_edge():
+    kakao = DenseKakao()
+    cache = PlaceSearchCache(precision=6, radius=3000)
+    lat_min, lat_max, lon_min, lon_max = geohash_bounds(geohash_encode(*USER, 6))
+    edge = (lat_max - 0.00001, lon_max - 0.00001)
+    fallbacks = metrics.get("place_cache.user_point_fallback")
+
+    async def run():
+        return await cache.search(kakao.fetch, *edge, "FD6", limit=10)
+
+    places = asyncio.run(run())
+
+    # 격자는 최대 3페이지까지 채우고, 사용자 기준 상위 10곳을 확정할 수 없으므로 사용자 위치에서 검색
+    assert [call[3] for call in kakao.calls] == [1, 2, 3, 1]
+    assert kakao.calls[-1][:3] == (*edge, 3000)
+    assert places[0]["place_name"] == "user-near"
+    assert metrics.get("place_cache.user_point_fallback") == fallbacks + 1
+
+
+def test_incomplete_tile_is_used_when_nearest_places_are_certain():
+    kakao = DenseKakao()
+    cache = PlaceSearchCache(precision=6, radius=3000)
+    lat_min, lat_max, lon_min, lon_max = geohash_bounds(geohash_encode(*USER, 6))
+    center = ((lat_min + lat_max) / 2, (lon_min + lon_max) / 2)
+
+    async def run():
+        return await cache.search(kakao.fetch, *center, "FD6", limit=10)
+
+    places = asyncio.run(run())
+
+    assert len(kakao.calls) == 3
+    assert len(places) == 10
+    assert all(place["place_name"].startswith("center-") for place in places)
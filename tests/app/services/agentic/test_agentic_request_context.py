@@ -0,0 +1,149 @@
+import asyncio
+import json
+import random
+import re
+from types import SimpleNamespace
+from typing import Any, List, Optional
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from app.core import llm_client
+from app.services.agentic.agentic_context import RequestContext, PROFILE, PREFERENCE, LOCATION_INFO
+from app.services.agentic.agentic_find_foodstore import foodstore
+from app.services.agentic.agentic_response_generator import SPECULATIVE_DEPENDENCIES, agent_dependencies
+
+CONCURRENT_REQUESTS = 200
+
+
+class FakeUserApi:
+    """토큰별 사용자 정보를 임의 지연 후 반환 (요청 간 실행 순서를 뒤섞음)"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def user_api(self, token):
+        self.calls.append(("profile", token))
+        await asyncio.sleep(random.uniform(0, 0.01))
+        return {"birthday": f"birthday-{token}", "address": ""}
+
+    async def user_prefer_api(self, token):
+        self.calls.append(("preference", token))
+        await asyncio.sleep(random.uniform(0, 0.01))
+        return {"nation": f"nation-{token}", "visitPurpose": "travel", "gender": "none"}
+
+
+class EchoChatModel(BaseChatModel):
+    """프롬프트의 사용자 정보를 그대로 돌려주는 모델"""
+
+    @property
+    def _llm_type(self) -> str:
+        return "echo"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs) -> ChatResult:
+        raise NotImplementedError
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs) -> ChatResult:
+        await asyncio.sleep(random.uniform(0, 0.01))
+        text = str(messages[-1].content)
+        found = [re.search(pattern, text).group(1) for pattern in (r"birthday : (\S+)", r"country born: (\S+)", r"\[user_intention\]\s+(\S+)")]
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=json.dumps({"output": found})))])
+
+
+def test_shared_agent_keeps_requests_isolated():
+    llm_client.reset_llm_registry()
+    for is_lightweight in (True, False):
+        llm_client._langchain_llms[llm_client._registry_key(is_lightweight)] = EchoChatModel()
+    store = foodstore()
+
+    async def one_request(index):
+        context = RequestContext(uid=f"uid-{index}", token=f"token-{index}", user_api=FakeUserApi())
+        await store.load_user_data(context)
+        return await store.ai_match([], f"intention-{index}", context)
+
+    async def run():
+        return await asyncio.gather(*(one_request(index) for index in range(CONCURRENT_REQUESTS)))
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        llm_client.reset_llm_registry()
+
+    assert results == [
+        [f"birthday-token-{index}", f"nation-token-{index}", f"intention-{index}"] for index in range(CONCURRENT_REQUESTS)
+    ]
+
+
+def test_profile_is_fetched_once_per_request():
+    user_api = FakeUserApi()
+    context = RequestContext(uid="uid", token="token", user_api=user_api)
+
+    async def run():
+        return await asyncio.gather(*(context.user_profile() for _ in range(10)), context.user_preference())
+
+    results = asyncio.run(run())
+
+    assert all(result is results[0] for result in results[:10])
+    assert sorted(user_api.calls) == [("preference", "token"), ("profile", "token")]
+
+
+def test_location_info_falls_back_to_default_address_without_mutating_profile():
+    context = RequestContext(uid="uid", token="token", location=SimpleNamespace(latitude="", longitude=""), user_api=FakeUserApi())
+
+    async def run():
+        return await context.location_info(default_address="서울 중구"), await context.user_profile()
+
+    location_info, profile = asyncio.run(run())
+
+    assert not context.has_live_location
+    assert location_info["address"] == "서울 중구"
+    assert profile["address"] == ""
+
+
+def test_prefetch_overlaps_classification_and_is_reused():
+    user_api = FakeUserApi()
+    context = RequestContext(uid="uid", token="token", user_api=user_api)
+
+    async def run():
+        context.prefetch(SPECULATIVE_DEPENDENCIES)
+        # 분류 단계 대기 중에 조회가 진행됨
+        await asyncio.sleep(0.02)
+        started = list(user_api.calls)
+        context.cancel_prefetch(keep=agent_dependencies("weather"))
+        await asyncio.gather(context.user_profile(), context.user_preference())
+        return started
+
+    started = asyncio.run(run())
+
+    assert sorted(started) == [("preference", "token"), ("profile", "token")]
+    assert len(user_api.calls) == 2
+
+
+def test_unused_prefetch_is_cancelled_after_routing():
+    context = RequestContext(uid="uid", token="token", location=SimpleNamespace(latitude="37.5", longitude="127.0"), user_api=FakeUserApi())
+
+    async def run():
+        context.prefetch(SPECULATIVE_DEPENDENCIES)
+        tasks = dict(context._tasks)
+        context.cancel_prefetch(keep=agent_dependencies("location"))
+        await asyncio.sleep(0)
+        return tasks
+
+    tasks = asyncio.run(run())
+
+    assert set(tasks) == {PROFILE, PREFERENCE, LOCATION_INFO}
+    # 위치 에이전트는 좌표를 그대로 사용하므로 주소 변환 조회만 취소
+    assert tasks[LOCATION_INFO].cancelled()
+    assert set(context._tasks) == {PROFILE, PREFERENCE}
+
+
+def test_prefetch_requires_token_or_live_location():
+    context = RequestContext(uid="uid")
+
+    assert context.available_dependencies() == frozenset()
+    assert agent_dependencies("general") == frozenset()
+    assert agent_dependencies("unknown") == frozenset()
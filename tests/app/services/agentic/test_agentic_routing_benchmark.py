@@ -0,0 +1,357 @@
+"""
+라우팅(분류) 정확도 / 지연 시간 오프라인 벤치마크
+
+- data/routing_corpus.json 의 라벨링된 다국어 질의로 분류기 구현별 정확도, p50/p95 지연 시간, 질의당 LLM 호출 수를 측정
+- LLM 은 실제 모델로 기록한 응답(data/routing_recordings.json)을 (구현, 질의)별 호출 순서대로 재생하고,
+  호출마다 기록된 지연 시간을 실제 대기 없이 더해서 계산
+- 임베딩 분류기는 고정 인코더(RAGConfig.EMBEDDING_MODEL)로 미리 계산한 문장 임베딩(data/routing_embeddings.npz)을 사용
+- 구현별 최소 정확도 / 최대 LLM 호출 수(BASELINES)를 밑돌면 실패 → 변경 사항 게이트로 사용
+  LLM 없이 판단한 질의의 정확도는 항상 검사하고, 기록이 없는 LLM 호출이 있으면 나머지 검사는 건너뜀
+
+실행: pytest -s tests/app/services/agentic/test_agentic_routing_benchmark.py
+기록: ROUTING_BENCHMARK_RECORD=1 pytest -s tests/app/services/agentic/test_agentic_routing_benchmark.py
+      (설정된 LLM 프로바이더 API 키 / sentence-transformers 필요, 프롬프트나 코퍼스를 바꾸면 다시 기록)
+"""
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import numpy as np
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from app.config.rag_config import RAGConfig
+from app.core import llm_client
+from app.services.agentic import agentic_calendar, agentic_intent_classifier
+from app.services.agentic.agentic_classifier import AgenticClassifier
+from app.services.agentic.agentic_find_foodstore import foodstore
+from app.services.agentic.agentic_intent_classifier import EmbeddingIntentClassifier, load_examples
+
+DATA_DIR = Path(__file__).parent / "data"
+CORPUS = json.loads((DATA_DIR / "routing_corpus.json").read_text(encoding="utf-8"))
+RECORDINGS_PATH = DATA_DIR / "routing_recordings.json"
+EMBEDDINGS_PATH = DATA_DIR / "routing_embeddings.npz"
+RECORD = os.getenv("ROUTING_BENCHMARK_RECORD", "").lower() in ("1", "true", "yes")
+
+
+def _load_recordings() -> Dict[str, Any]:
+    """{"models": {tier: 모델}, "recorded_at": ..., "calls": {"작업/구현": {질의: [{tier, output, latency_ms}]}}}"""
+    if RECORDINGS_PATH.exists():
+        return json.loads(RECORDINGS_PATH.read_text(encoding="utf-8"))
+    return {"models": {}, "recorded_at": None, "calls": {}}
+
+
+RECORDINGS = _load_recordings()
+
+
+class MissingRecording(Exception):
+    """기록되지 않은 LLM 호출"""
+
+
+class RecordedLLM:
+    """
+    (구현, 질의)별 실제 모델 응답을 호출 순서대로 재생. 호출 수와 (기록된) 지연 시간을 누적
+    기록 모드에서는 실제 모델을 호출하고 응답 / 지연 시간을 기록
+    """
+
+    def __init__(self, calls: Dict[str, List[Dict[str, Any]]], record: bool = False):
+        self.recorded_calls = calls
+        self.record_mode = record
+        self.query: Optional[str] = None
+        self.index = 0
+        self.calls = 0
+        self.latency = 0.0
+        self.missing = 0
+
+    def start(self, query: str) -> None:
+        self.query, self.index = query, 0
+        if self.record_mode:
+            self.recorded_calls[query] = []
+
+    def replay(self, tier: str) -> str:
+        self.calls += 1
+        calls = self.recorded_calls.get(self.query, [])
+        if self.index >= len(calls):
+            self.missing += 1
+            raise MissingRecording(f"{self.query} ({self.index + 1}번째 호출)")
+        call = calls[self.index]
+        self.index += 1
+        self.latency += call["latency_ms"] / 1000
+        return call["output"]
+
+    async def record(self, tier: str, response: Awaitable[str]) -> str:
+        self.calls += 1
+        start = time.perf_counter()
+        output = await response
+        latency = time.perf_counter() - start
+        self.latency += latency
+        self.recorded_calls[self.query].append({"tier": tier, "output": output, "latency_ms": round(latency * 1000)})
+        return output
+
+
+class RecordedChatModel(BaseChatModel):
+    """LangChain 체인용 기록 응답 모델 (inner 가 있으면 실제 모델 응답을 기록)"""
+
+    recorded: Any
+    tier: str
+    inner: Any = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "recorded"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs) -> ChatResult:
+        return self._result(self.recorded.replay(self.tier))
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs) -> ChatResult:
+        if self.inner is None:
+            return self._result(self.recorded.replay(self.tier))
+        return self._result(await self.recorded.record(self.tier, self._live(messages)))
+
+    async def _live(self, messages: List[BaseMessage]) -> str:
+        return str((await self.inner.ainvoke(messages)).content)
+
+    @staticmethod
+    def _result(content: str) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+
+class RecordedLLMClient(llm_client.BaseLLMClient):
+    """BaseLLMClient(generate) 용 기록 응답 클라이언트 (inner 가 있으면 실제 모델 응답을 기록)"""
+
+    def __init__(self, recorded: RecordedLLM, tier: str, inner: Optional[llm_client.BaseLLMClient] = None):
+        self.recorded = recorded
+        self.tier = tier
+        self.inner = inner
+        self.model = inner.model if inner is not None else "recorded"
+
+    async def generate(self, prompt: str, **kwargs) -> str:
+        if self.inner is None:
+            return self.recorded.replay(self.tier)
+        return await self.recorded.record(self.tier, self.inner.generate(prompt, **kwargs))
+
+    async def generate_stream(self, prompt: str, **kwargs):
+        yield await self.generate(prompt, **kwargs)
+
+    async def check_connection(self) -> bool:
+        return True
+
+
+def _install_recorded_llm(task: str, name: str) -> RecordedLLM:
+    live = {}
+    if RECORD:
+        llm_client.reset_llm_registry()
+        for is_lightweight in (True, False):
+            live[is_lightweight] = (llm_client.get_llm_client(is_lightweight), llm_client.get_langchain_llm(is_lightweight))
+
+    recorded = RecordedLLM(RECORDINGS["calls"].setdefault(f"{task}/{name}", {}), record=RECORD)
+    llm_client.reset_llm_registry()
+    for is_lightweight in (True, False):
+        key = llm_client._registry_key(is_lightweight)
+        tier = key[0]
+        inner_client, inner_llm = live.get(is_lightweight, (None, None))
+        if inner_client is not None:
+            RECORDINGS["models"][tier] = f"{key[1]}/{inner_client.model}"
+        llm_client._llm_clients[key] = RecordedLLMClient(recorded, tier, inner_client)
+        llm_client._langchain_llms[key] = RecordedChatModel(recorded=recorded, tier=tier, inner=inner_llm)
+    return recorded
+
+
+def _save_recordings() -> None:
+    RECORDINGS["recorded_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    RECORDINGS_PATH.write_text(json.dumps(RECORDINGS, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+
+class RecordedEncoder:
+    """고정 인코더로 미리 계산한 문장 임베딩 (기록 모드에서는 실제 인코더로 계산해 저장)"""
+
+    def __init__(self, path: Path = EMBEDDINGS_PATH, model_name: str = RAGConfig.EMBEDDING_MODEL):
+        self.path = path
+        self.model_name = model_name
+        self.vectors: Dict[str, np.ndarray] = {}
+        if path.exists():
+            data = np.load(path, allow_pickle=False)
+            if str(data["model"]) == model_name:
+                self.vectors = dict(zip(data["texts"].tolist(), data["vectors"]))
+
+    def covers(self, texts: List[str]) -> bool:
+        return all(text in self.vectors for text in texts)
+
+    def record(self, texts: List[str]) -> None:
+        encoder = agentic_intent_classifier.sentence_transformer_encoder(self.model_name)
+        if encoder is None:
+            raise RuntimeError("임베딩 기록에는 sentence-transformers 가 필요합니다.")
+        texts = list(dict.fromkeys(texts))
+        vectors = np.asarray(encoder(texts), dtype=np.float32)
+        np.savez_compressed(self.path, model=np.array(self.model_name), texts=np.array(texts), vectors=vectors)
+        self.vectors = dict(zip(texts, vectors))
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        return np.stack([self.vectors[text] for text in texts])
+
+
+################################################ 분류기 구현 (작업 → 이름 → 질의를 라벨로 변환하는 함수)
+async def _agent_type_llm(query: str) -> str:
+    return (await AgenticClassifier()._classify_agent_type_llm(query)).value
+
+
+async def _agent_type_classify(query: str) -> str:
+    return await AgenticClassifier().classify(query)
+
+
+async def _agent_type_hierarchical(query: str) -> str:
+    return (await AgenticClassifier().classify_hierarchical(query))["agent_type"]
+
+
+async def _calendar_action_llm(query: str) -> str:
+    return await agentic_calendar.Input_analysis(query)
+
+
+async def _calendar_action_hierarchical(query: str) -> str:
+    # 계층 분류 결과에 하위 의도가 없으면 응답 생성기처럼 후속 호출로 판단
+    sub_intent = (await AgenticClassifier().classify_hierarchical(query))["sub_intent"]
+    if sub_intent is not None and sub_intent.calendar_action is not None:
+        return sub_intent.calendar_action
+    return await agentic_calendar.Input_analysis(query)
+
+
+async def _location_tag_llm(query: str) -> str:
+    return (await foodstore().query_analyze(query))["tag"]
+
+
+async def _location_tag_hierarchical(query: str) -> str:
+    sub_intent = (await AgenticClassifier().classify_hierarchical(query))["sub_intent"]
+    if sub_intent is not None and sub_intent.location_tag is not None:
+        return sub_intent.location_tag
+    return (await foodstore().query_analyze(query))["tag"]
+
+
+async def _kakao_category_dictionary(query: str) -> str:
+    # 키워드 / 메뉴 번호 사전, 판단 불가 시 LLM
+    return (await foodstore().Category_extraction(query))["output"]
+
+
+IMPLEMENTATIONS: Dict[str, Dict[str, Callable[[str], Awaitable[str]]]] = {
+    # embedding: 임베딩 분류기가 확신하지 못한 질의만 LLM (classify 와 같은 경로, 임베딩 분류기 사용)
+    "agent_type": {"llm": _agent_type_llm, "classify": _agent_type_classify, "hierarchical": _agent_type_hierarchical,
+                   "embedding": _agent_type_classify},
+    "calendar_action": {"llm": _calendar_action_llm, "hierarchical": _calendar_action_hierarchical},
+    "location_tag": {"llm": _location_tag_llm, "hierarchical": _location_tag_hierarchical},
+    "kakao_category": {"dictionary": _kakao_category_dictionary},
+}
+
+# 구현별 최소 정확도 / 질의당 최대 LLM 호출 수
+BASELINES = {
+    ("agent_type", "llm"): {"accuracy": 0.9, "llm_calls": 1.0},
+    ("agent_type", "classify"): {"accuracy": 0.9, "llm_calls": 1.0},
+    ("agent_type", "hierarchical"): {"accuracy": 0.9, "llm_calls": 1.0},
+    ("agent_type", "embedding"): {"accuracy": 0.9, "llm_calls": 1.0},
+    ("calendar_action", "llm"): {"accuracy": 1.0, "llm_calls": 1.0},
+    # 분류 호출 1회로 하위 의도까지 (기존: 분류 + 후속 분류 2회)
+    ("calendar_action", "hierarchical"): {"accuracy": 1.0, "llm_calls": 1.0},
+    ("location_tag", "llm"): {"accuracy": 1.0, "llm_calls": 1.0},
+    ("location_tag", "hierarchical"): {"accuracy": 1.0, "llm_calls": 1.0},
+    # 기준점 장소를 함께 언급한 질의 등 여러 카테고리가 매칭되면 LLM
+    ("kakao_category", "dictionary"): {"accuracy": 1.0, "llm_calls": 0.15},
+}
+
+
+def run_benchmark(task: str, name: str) -> Dict[str, float]:
+    """코퍼스 전체를 분류하고 정확도 / 지연 시간 / LLM 호출 수를 반환합니다."""
+    implementation = IMPLEMENTATIONS[task][name]
+    recorded = _install_recorded_llm(task, name)
+    correct, latencies = 0, []
+    local_total, local_correct = 0, 0
+
+    async def run():
+        nonlocal correct, local_total, local_correct
+        for item in CORPUS[task]:
+            recorded.start(item["query"])
+            llm_latency, llm_calls = recorded.latency, recorded.calls
+            start = time.perf_counter()
+            try:
+                label = await implementation(item["query"])
+            except MissingRecording:
+                label = None
+            local_latency = time.perf_counter() - start
+            latencies.append(local_latency + recorded.latency - llm_latency)
+            correct += label == item["expected"]
+            if recorded.calls == llm_calls:
+                # LLM 없이 판단한 질의 (사전 / 임베딩)
+                local_total += 1
+                local_correct += label == item["expected"]
+
+    try:
+        asyncio.run(run())
+    finally:
+        llm_client.reset_llm_registry()
+    if RECORD:
+        _save_recordings()
+
+    total = len(CORPUS[task])
+    values = np.array(latencies) * 1000
+    return {
+        "queries": total,
+        "accuracy": correct / total,
+        "local_queries": local_total,
+        "local_accuracy": local_correct / local_total if local_total else 1.0,
+        "p50_ms": float(np.percentile(values, 50)),
+        "p95_ms": float(np.percentile(values, 95)),
+        "llm_calls": recorded.calls / total,
+        "missing": recorded.missing,
+    }
+
+
+@pytest.fixture(autouse=True)
+def _without_embedding_model(monkeypatch):
+    # 기본은 임베딩 분류기 없이 실행 (모델 다운로드 없음), embedding 구현만 기록된 임베딩으로 분류기 설치
+    monkeypatch.setattr(agentic_intent_classifier, "_intent_classifier", None)
+    monkeypatch.setattr(agentic_intent_classifier, "_intent_classifier_loaded", True)
+
+
+def _install_embedding_classifier(monkeypatch) -> None:
+    train = load_examples()["train"]
+    texts = [text for examples in train.values() for text in examples] + [item["query"] for item in CORPUS["agent_type"]]
+    encoder = RecordedEncoder()
+    if RECORD:
+        encoder.record(texts)
+    if not encoder.covers(texts):
+        pytest.skip(f"{EMBEDDINGS_PATH.name} 에 {RAGConfig.EMBEDDING_MODEL} 임베딩이 없습니다. ROUTING_BENCHMARK_RECORD=1 로 기록하세요.")
+    monkeypatch.setattr(agentic_intent_classifier, "_intent_classifier", EmbeddingIntentClassifier(encoder).fit(train))
+
+
+def test_corpus_covers_every_label():
+    from app.models.agentic_response import AgentType
+
+    assert {item["expected"] for item in CORPUS["agent_type"]} == {agent_type.value for agent_type in AgentType}
+    assert {item["expected"] for item in CORPUS["calendar_action"]} == {"add", "delete", "edit", "check"}
+    assert {item["expected"] for item in CORPUS["location_tag"]} == {"Find", "None"}
+    assert len({item["expected"] for item in CORPUS["kakao_category"]}) == 15
+
+
+@pytest.mark.parametrize("task,name", list(BASELINES))
+def test_routing_benchmark(task, name, monkeypatch):
+    if name == "embedding":
+        _install_embedding_classifier(monkeypatch)
+    result = run_benchmark(task, name)
+
+    print(f"\n[routing benchmark] {task:<16} {name:<12} n={result['queries']:<3} "
+          f"accuracy {result['accuracy']:.1%}  p50 {result['p50_ms']:.0f}ms  p95 {result['p95_ms']:.0f}ms  "
+          f"llm calls/query {result['llm_calls']:.2f}  "
+          f"local {result['local_queries']} ({result['local_accuracy']:.1%})  unrecorded llm calls {result['missing']}")
+
+    baseline = BASELINES[(task, name)]
+    # LLM 없이 판단한 질의는 기록과 관계없이 검사
+    assert result["local_accuracy"] >= baseline["accuracy"]
+    if result["missing"]:
+        pytest.skip(f"기록되지 않은 LLM 호출 {result['missing']}회. ROUTING_BENCHMARK_RECORD=1 로 실제 모델 응답을 기록하세요.")
+    assert result["accuracy"] >= baseline["accuracy"]
+    assert result["llm_calls"] <= baseline["llm_calls"]
@@ -0,0 +1,66 @@
+import asyncio
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import pytest
+
+from app.models.agentic_response import AgentType
+from app.services.agentic import agentic as agentic_module
+from app.services.agentic.agentic import Agentic
+from app.services.agentic.agentic_response_generator import STATE_ROUTES, TRANSLATED_STATES, state_route_needs_translation
+
+
+@pytest.fixture
+def translations(monkeypatch):
+    """translate_query 호출을 기록하고 고정된 번역을 돌려줌"""
+    calls = []
+
+    async def fake_translate_query(query, lang_code=None):
+        calls.append((query, lang_code))
+        return {"translated_query": "pharmacy", "lang_code": lang_code or "es"}
+
+    monkeypatch.setattr(agentic_module, "translate_query", fake_translate_query)
+    return calls
+
+
+def _understand(query, state, source_lang):
+    agentic = Agentic.__new__(Agentic)
+    return asyncio.run(agentic._understand(query, state, source_lang))
+
+
+def test_location_category_turn_is_translated_for_other_languages(translations):
+    understanding = _understand("farmacia", "location_category", "es")
+
+    assert understanding["agentic_type"] == AgentType.LOCATION.value
+    assert understanding["english_query"] == "pharmacy"
+    assert translations == [("farmacia", "es")]
+
+
+def test_location_category_translation_reuses_detection_call(translations, monkeypatch):
+    # 로컬 감지 실패 시 언어 감지용 번역 결과를 그대로 사용
+    monkeypatch.setattr(agentic_module, "detect_query_language", lambda query: None)
+    understanding = _understand("farmacia", "location_category", None)
+
+    assert understanding["source_lang"] == "es"
+    assert understanding["english_query"] == "pharmacy"
+    assert translations == [("farmacia", None)]
+
+
+@pytest.mark.parametrize("query, source_lang", [("약국", "ko"), ("pharmacy", "en")])
+def test_location_category_keeps_korean_and_english_text(translations, query, source_lang):
+    understanding = _understand(query, "location_category", source_lang)
+
+    assert understanding["english_query"] == query
+    assert translations == []
+
+
+@pytest.mark.parametrize("state", sorted(set(STATE_ROUTES) - TRANSLATED_STATES))
+def test_rewriting_agents_receive_original_text(translations, state):
+    # 이력서 / 자소서 / 잡서치는 원문을 자체적으로 한국어로 다시 작성
+    understanding = _understand("Estudié informática en Madrid", state, "es")
+
+    assert understanding["english_query"] == "Estudié informática en Madrid"
+    assert understanding["pipeline_mode"] == "state"
+    assert translations == []
+    assert not state_route_needs_translation(state, "es")
@@ -0,0 +1,121 @@
+import asyncio
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import httpx
+import pytest
+
+from app.services.common import geocoder as geocoder_module
+from app.services.common.geocoder import GeocodeStore, Geocoder, default_city_coordinates
+
+ADDRESSES = {
+    "서울 중구 세종대로 110": [{"lat": "37.5663", "lon": "126.9779"}],
+    **{f"부산 해운대구 우동 {index}": [{"lat": f"35.16{index}", "lon": "129.16"}] for index in range(4)},
+}
+
+
+class FakeNominatim:
+    """주소별 검색 결과를 돌려주고 요청 수를 기록하는 Nominatim"""
+
+    def __init__(self):
+        self.fail = False
+        self.requests = []
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request.url.params["q"])
+        await asyncio.sleep(0.01)
+        if self.fail:
+            return httpx.Response(503)
+        return httpx.Response(200, json=ADDRESSES.get(request.url.params["q"], []))
+
+
+@pytest.fixture
+def nominatim(monkeypatch):
+    fake = FakeNominatim()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(fake.handler))
+    monkeypatch.setattr(geocoder_module, "get_http_client", lambda base_url: client)
+    return fake
+
+
+def test_same_address_is_collapsed_and_persisted(nominatim, tmp_path):
+    path = str(tmp_path / "geocode.sqlite3")
+    geocoder = Geocoder(store=GeocodeStore(path), min_interval=0)
+
+    async def run():
+        return await asyncio.gather(*(geocoder.geocode(" 서울 중구  세종대로 110") for _ in range(10)))
+
+    results = asyncio.run(run())
+    geocoder.store.close()
+
+    assert results == [(37.5663, 126.9779)] * 10
+    assert nominatim.requests == ["서울 중구 세종대로 110"]
+
+    # 재시작 후에도 저장된 좌표 사용
+    restarted = Geocoder(store=GeocodeStore(path), min_interval=0)
+    assert asyncio.run(restarted.geocode("서울 중구 세종대로 110")) == (37.5663, 126.9779)
+    assert len(nominatim.requests) == 1
+
+
+def test_unknown_address_is_remembered_but_errors_are_retried(nominatim, tmp_path):
+    geocoder = Geocoder(store=GeocodeStore(str(tmp_path / "geocode.sqlite3")), min_interval=0)
+
+    async def run():
+        unknown = [await geocoder.geocode("없는 주소") for _ in range(2)]
+        nominatim.fail = True
+        failed = await geocoder.geocode("서울 중구 세종대로 110")
+        nominatim.fail = False
+        recovered = await geocoder.geocode("서울 중구 세종대로 110")
+        return unknown, failed, recovered
+
+    unknown, failed, recovered = asyncio.run(run())
+
+    assert unknown == [None, None]
+    assert failed is None
+    assert recovered == (37.5663, 126.9779)
+    assert nominatim.requests == ["없는 주소", "서울 중구 세종대로 110", "서울 중구 세종대로 110"]
+
+
+def test_requests_are_spaced_by_min_interval(nominatim, tmp_path):
+    geocoder = Geocoder(store=GeocodeStore(str(tmp_path / "geocode.sqlite3")), min_interval=0.05)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.gather(*(geocoder.geocode(f"주소 {index}") for index in range(3)))
+        return loop.time() - start
+
+    assert asyncio.run(run()) >= 0.1
+
+
+def test_long_queue_returns_default_coordinates_and_geocodes_in_background(nominatim, tmp_path):
+    geocoder = Geocoder(store=GeocodeStore(str(tmp_path / "geocode.sqlite3")), min_interval=0.1, max_wait=0.15)
+    addresses = [f"부산 해운대구 우동 {index}" for index in range(4)]
+    default = default_city_coordinates("부산 해운대구")
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        first = await asyncio.gather(*(geocoder.geocode(address) for address in addresses))
+        elapsed = loop.time() - start
+        # 대기 중인 주소를 다시 요청해도 조회를 추가로 시작하지 않음
+        again = [await geocoder.geocode(address) for address in addresses if address in geocoder._background]
+        await asyncio.gather(*geocoder._background.values())
+        second = await asyncio.gather(*(geocoder.geocode(address) for address in addresses))
+        return first, elapsed, again, second
+
+    first, elapsed, again, second = asyncio.run(run())
+
+    # 대기 시간이 max_wait 이내인 두 주소만 기다리고 나머지는 기본 좌표로 바로 응답
+    assert first.count(default) == 2
+    assert elapsed < 0.2
+    assert again == [default, default]
+    # 백그라운드 조회 결과는 다음 요청부터 사용
+    assert second == [(float(f"35.16{index}"), 129.16) for index in range(4)]
+    assert sorted(nominatim.requests) == addresses
+
+
+def test_default_city_coordinates_prefers_most_specific_region():
+    assert default_city_coordinates("부산 해운대구 우동") == (35.163177, 129.163634)
+    assert default_city_coordinates("대전광역시 서구") == (36.350412, 127.384548)
+    assert default_city_coordinates("Tokyo") == default_city_coordinates("서울 강남")
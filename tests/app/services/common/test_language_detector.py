@@ -0,0 +1,90 @@
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import pytest
+
+from app.config.app_config import settings
+from app.core.metrics import metrics
+from app.services.common import language_detector
+from app.services.common.language_detector import LanguageDetector
+from app.services.common.preprocessor import detect_query_language
+
+detector = LanguageDetector()
+
+
+@pytest.mark.parametrize("text, lang_code", [
+    ("서울 날씨 알려줘", "ko"),
+    ("今日の天気はどうですか", "ja"),
+    ("Где ближайшая аптека?", "ru"),
+    ("What is the weather like in Seoul today?", "en"),
+    ("¿Dónde está la farmacia más cercana?", "es"),
+    ("Où est la pharmacie la plus proche ?", "fr"),
+    ("Wo ist die nächste Apotheke?", "de"),
+])
+def test_single_script_queries_are_detected_confidently(text, lang_code):
+    detection = detector.detect(text)
+
+    assert detection["lang_code"] == lang_code
+    assert detection["confidence"] >= settings.LANG_DETECT_CONFIDENCE_THRESHOLD
+
+
+@pytest.mark.parametrize("text", ["今日天气怎么样", "今日天気"])
+def test_han_only_text_stays_below_threshold(text):
+    # 가나 없는 일본어 한자 문장과 중국어를 구분할 수 없으므로 LLM 에 맡김
+    detection = detector.detect(text)
+
+    assert detection["lang_code"] == "zh"
+    assert detection["confidence"] < settings.LANG_DETECT_CONFIDENCE_THRESHOLD
+
+
+@pytest.mark.parametrize("text", [
+    "Ciao, che tempo fa oggi",
+    "Dove si trova la farmacia più vicina?",
+    "Onde fica a farmácia mais próxima?",
+    "Waar is de dichtstbijzijnde apotheek?",
+    "Gdzie jest najbliższa apteka?",
+])
+def test_unsupported_latin_languages_are_left_to_llm(text):
+    # en/es/fr/de 중 가장 가까운 언어로 확신하지 않고 LLM 에 맡김
+    detection = detector.detect(text)
+
+    assert detection["lang_code"] is None
+    assert detection["confidence"] < settings.LANG_DETECT_CONFIDENCE_THRESHOLD
+
+
+def test_poor_trigram_fit_caps_confidence(monkeypatch):
+    text = "Book a table for two tonight"
+    assert detector.detect(text)["confidence"] >= settings.LANG_DETECT_CONFIDENCE_THRESHOLD
+
+    # 학습 문장에 없는 3-gram 비율이 기준을 넘으면 LLM 이 판별하도록 신뢰도 제한
+    monkeypatch.setattr(language_detector, "LATIN_MAX_UNSEEN_RATIO", 0.5)
+    detection = detector.detect(text)
+
+    assert detection["lang_code"] == "en"
+    assert detection["confidence"] <= language_detector.OUT_OF_PROFILE_MAX_CONFIDENCE
+
+
+def test_mixed_script_text_uses_dominant_script_with_reduced_confidence():
+    detection = detector.detect("이번 주 Google Calendar 일정 보여줘")
+
+    assert detection["lang_code"] == "ko"
+    assert detection["confidence"] < settings.LANG_DETECT_CONFIDENCE_THRESHOLD
+
+
+def test_text_without_letters_is_undetected():
+    assert detector.detect("") == {"lang_code": None, "confidence": 0.0}
+    assert detector.detect("12:30 !!") == {"lang_code": None, "confidence": 0.0}
+
+
+def test_detect_query_language_counts_fast_and_llm_paths():
+    fast, llm = metrics.get("lang_detect.fast_path"), metrics.get("lang_detect.llm_path")
+
+    assert detect_query_language("서울 날씨 알려줘") == "ko"
+    assert detect_query_language("Wo ist die nächste Apotheke?") == "de"
+    assert detect_query_language("今日天気") is None
+    assert detect_query_language("이번 주 Google Calendar 일정 보여줘") is None
+    assert detect_query_language("Ciao, che tempo fa oggi") is None
+
+    assert metrics.get("lang_detect.fast_path") == fast + 2
+    assert metrics.get("lang_detect.llm_path") == llm + 3
@@ -0,0 +1,146 @@
+import asyncio
+import json
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from app.api.v1.agentic import AgenticResponse, _split_response
+from app.services.common.postprocessor import Postprocessor, _collect_translatable
+
+EVENTS = [
+    {
+        "title": "서울 재즈 페스티벌",
+        "link": "https://example.com/events/1",
+        "date": "2026-10-24",
+        "category_group_code": "CT1",
+        "tags": ["음악", "FD6", "야외 공연"],
+    },
+    {"title": "불꽃 축제", "description": "  ", "contact": "info@example.com"},
+]
+
+
+class FakeLLMClient:
+    """프롬프트를 기록하고 미리 정한 응답을 돌려주는 번역 모델"""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.prompts = []
+
+    async def generate(self, prompt):
+        self.prompts.append(prompt)
+        return self.reply
+
+
+def _postprocessor(reply):
+    postprocessor = Postprocessor.__new__(Postprocessor)
+    postprocessor.llm_client = FakeLLMClient(reply)
+    return postprocessor
+
+
+def test_collect_translatable_keeps_only_human_readable_fields():
+    fields = []
+    _collect_translatable(EVENTS, (), None, fields)
+
+    # 링크, 날짜, 코드, 빈 문자열, 이메일, 번역 대상이 아닌 키는 제외
+    assert fields == [
+        ((0, "title"), "서울 재즈 페스티벌"),
+        ((1, "title"), "불꽃 축제"),
+    ]
+
+
+def test_collect_translatable_includes_plain_strings_of_top_level_lists():
+    fields = []
+    _collect_translatable(["가까운 약국", "https://example.com", "02-123-4567", "CE7"], (), None, fields)
+
+    assert fields == [((0,), "가까운 약국")]
+
+
+def test_translate_structured_writes_translations_back_by_path():
+    postprocessor = _postprocessor('```json\n["Seoul Jazz Festival", "Fireworks Festival"]\n```')
+
+    translated = asyncio.run(postprocessor._translate_structured(EVENTS, "English"))
+
+    assert translated[0]["title"] == "Seoul Jazz Festival"
+    assert translated[1]["title"] == "Fireworks Festival"
+    assert translated[0]["link"] == EVENTS[0]["link"]
+    assert translated[0]["tags"] == EVENTS[0]["tags"]
+    # 원본은 변경하지 않음
+    assert EVENTS[0]["title"] == "서울 재즈 페스티벌"
+    assert json.loads(postprocessor.llm_client.prompts[0].split("[Texts]")[1]) == ["서울 재즈 페스티벌", "불꽃 축제"]
+
+
+def test_translate_structured_keeps_original_on_malformed_reply():
+    for reply in ("Seoul Jazz Festival", '["Seoul Jazz Festival"]', '{"title": "Seoul Jazz Festival"}'):
+        postprocessor = _postprocessor(reply)
+
+        assert asyncio.run(postprocessor._translate_structured(EVENTS, "English")) == EVENTS
+
+
+def test_translate_structured_keeps_original_for_empty_translations():
+    postprocessor = _postprocessor('["", "Fireworks Festival"]')
+
+    translated = asyncio.run(postprocessor._translate_structured(EVENTS, "English"))
+
+    assert translated[0]["title"] == "서울 재즈 페스티벌"
+    assert translated[1]["title"] == "Fireworks Festival"
+
+
+def test_translate_structured_skips_llm_without_translatable_fields():
+    postprocessor = _postprocessor("[]")
+    response = [{"link": "https://example.com", "x": "127.0"}]
+
+    assert asyncio.run(postprocessor._translate_structured(response, "English")) is response
+    assert postprocessor.llm_client.prompts == []
+
+
+def test_structured_response_keeps_response_a_string():
+    response = AgenticResponse(**_split_response(EVENTS), metadata={})
+
+    assert isinstance(response.response, str)
+    assert json.loads(response.response) == EVENTS
+    assert response.structured_response == EVENTS
+
+    text = AgenticResponse(**_split_response("안녕하세요"), metadata={})
+    assert text.response == "안녕하세요"
+    assert text.structured_response is None
+
+
+def test_should_translate_skips_response_already_in_declared_language():
+    postprocessor = _postprocessor("")
+
+    assert postprocessor.should_translate("서울은 오늘 맑습니다.", "ko", output_lang="ko") is False
+    # 언어를 확신할 수 없는 짧은 응답도 선언을 따름
+    assert postprocessor.should_translate("OK", "ko", output_lang="ko") is False
+
+
+def test_should_translate_when_declared_language_contradicts_script():
+    postprocessor = _postprocessor("")
+
+    # LLM 이 번역 지시를 무시한 경우
+    assert postprocessor.should_translate("It is sunny in Seoul today.", "ko", output_lang="ko") is True
+
+
+def test_should_translate_when_declared_language_differs_from_source():
+    postprocessor = _postprocessor("")
+
+    assert postprocessor.should_translate("It is sunny in Seoul today.", "ko", output_lang="en") is True
+    assert postprocessor.should_translate("Où est la pharmacie la plus proche ?", "ko", output_lang="fr") is True
+
+
+def test_should_translate_without_declaration_uses_detection():
+    postprocessor = _postprocessor("")
+
+    assert postprocessor.should_translate("서울은 오늘 맑습니다.", "ko") is False
+    assert postprocessor.should_translate("It is sunny in Seoul today.", "ko") is True
+    # 확신할 수 없으면 번역
+    assert postprocessor.should_translate("12:30", "en") is True
+    assert postprocessor.should_translate("이번 주 Google Calendar 일정", "ko") is True
+
+
+def test_should_translate_structured_responses_by_declaration_only():
+    postprocessor = _postprocessor("")
+
+    assert postprocessor.should_translate(EVENTS, "ko", output_lang="ko") is False
+    assert postprocessor.should_translate(EVENTS, "en", output_lang="ko") is True
+    assert postprocessor.should_translate(EVENTS, "ko") is True
+    assert postprocessor.should_translate({"title": "Seoul"}, "en") is True
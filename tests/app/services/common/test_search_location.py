@@ -0,0 +1,82 @@
+import asyncio
+import os
+from types import SimpleNamespace
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import httpx
+import pytest
+
+from app.core.metrics import metrics
+from app.services.common import search_location as search_location_module
+from app.services.common.search_location import ReverseGeocoder, search_location
+
+
+class FakeKakao:
+    """coord2address 요청 수를 기록하고 지연 / 실패를 흉내내는 카카오 API"""
+
+    def __init__(self, delay: float = 0.01, status_code: int = 200):
+        self.delay = delay
+        self.status_code = status_code
+        self.requests = []
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((request.url.params["y"], request.url.params["x"]))
+        await asyncio.sleep(self.delay)
+        if self.status_code != 200:
+            return httpx.Response(self.status_code, json={"message": "error"})
+        return httpx.Response(200, json={"documents": [{"address": {"address_name": "서울 중구 태평로1가"}, "road_address": None}]})
+
+
+@pytest.fixture
+def kakao(monkeypatch):
+    fake = FakeKakao()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(fake.handler))
+    monkeypatch.setattr(search_location_module, "get_http_client", lambda base_url: client)
+    return fake
+
+
+def test_nearby_coordinates_share_one_cached_lookup(kakao):
+    geocoder = ReverseGeocoder()
+    hits = metrics.get("reverse_geocode.hit")
+
+    async def run():
+        first = await asyncio.gather(*(geocoder.reverse(37.56651, 126.97801) for _ in range(5)))
+        # 약 20m 떨어진 좌표는 같은 격자
+        nearby = await geocoder.reverse(37.56667, 126.97815)
+        return first, nearby
+
+    first, nearby = asyncio.run(run())
+
+    assert all(document["address"]["address_name"] == "서울 중구 태평로1가" for document in first)
+    assert nearby is first[0]
+    assert len(kakao.requests) == 1
+    assert metrics.get("reverse_geocode.hit") == hits + 1
+
+
+def test_slow_or_failing_kakao_falls_back_to_offline_geocoder(kakao):
+    geocoder = ReverseGeocoder(timeout=0.05)
+
+    async def run():
+        kakao.delay = 1
+        slow = await geocoder.reverse(35.1028, 129.0403)
+        kakao.delay, kakao.status_code = 0, 500
+        failed = await geocoder.reverse(35.1028, 129.0403)
+        kakao.status_code = 200
+        recovered = await geocoder.reverse(35.1028, 129.0403)
+        return slow, failed, recovered
+
+    slow, failed, recovered = asyncio.run(run())
+
+    assert slow["source"] == "offline" and "Busan" in slow["address"]["address_name"]
+    assert failed["source"] == "offline"
+    # 오프라인 결과는 캐시하지 않으므로 카카오가 복구되면 다시 사용
+    assert recovered["address"]["address_name"] == "서울 중구 태평로1가"
+    assert len(kakao.requests) == 3
+
+
+def test_search_ignores_invalid_location(kakao):
+    result = asyncio.run(search_location().search(SimpleNamespace(latitude="", longitude=None)))
+
+    assert result == {}
+    assert kakao.requests == []
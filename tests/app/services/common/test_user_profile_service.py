@@ -0,0 +1,95 @@
+import asyncio
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import httpx
+
+from app.services.common.user_profile_service import UserProfileService
+
+
+class FakeUserBackend:
+    """경로 / 토큰별 응답을 돌려주고 요청 수를 기록하는 사용자 API"""
+
+    def __init__(self, status_code: int = 200):
+        self.status_code = status_code
+        self.requests = []
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((request.url.path, request.headers["Authorization"]))
+        await asyncio.sleep(0.01)
+        if self.status_code != 200:
+            return httpx.Response(self.status_code, text="unauthorized")
+        return httpx.Response(200, json={"path": request.url.path, "token": request.headers["Authorization"], "address": "서울"})
+
+
+def _service(backend: FakeUserBackend, **kwargs) -> UserProfileService:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(backend.handler))
+    return UserProfileService(base_url="https://users.test", http_client=client, **kwargs)
+
+
+def test_profile_is_cached_per_token():
+    backend = FakeUserBackend()
+    service = _service(backend)
+
+    async def run():
+        first = await service.profile("token-a")
+        first["address"] = "변경"
+        second = await service.profile("token-a")
+        other = await service.profile("token-b")
+        return first, second, other
+
+    first, second, other = asyncio.run(run())
+
+    # 같은 토큰은 한 번만 조회, 반환값을 수정해도 캐시에 영향 없음
+    assert second == {"path": "/users/profile", "token": "token-a", "address": "서울"}
+    assert other["token"] == "token-b"
+    assert backend.requests == [("/users/profile", "token-a"), ("/users/profile", "token-b")]
+
+
+def test_concurrent_requests_share_one_fetch():
+    backend = FakeUserBackend()
+    service = _service(backend)
+
+    async def run():
+        return await asyncio.gather(*[service.profile_and_preference("token-a") for _ in range(20)])
+
+    results = asyncio.run(run())
+
+    assert all(profile["path"] == "/users/profile" and preference["path"] == "/users/preference" for profile, preference in results)
+    assert sorted(backend.requests) == [("/users/preference", "token-a"), ("/users/profile", "token-a")]
+
+
+def test_errors_are_not_cached_and_entries_expire():
+    backend = FakeUserBackend(status_code=401)
+    service = _service(backend, ttl=0)
+
+    async def run():
+        error = await service.preference("token-a")
+        backend.status_code = 200
+        await service.preference("token-a")
+        await service.preference("token-a")
+        return error
+
+    error = asyncio.run(run())
+
+    assert error == {"error": "unauthorized"}
+    assert len(backend.requests) == 3
+
+
+def test_invalidate_and_lru_eviction():
+    backend = FakeUserBackend()
+    service = _service(backend, max_entries=2)
+
+    async def run():
+        await service.profile("token-a")
+        await service.profile("token-b")
+        await service.profile("token-c")  # token-a 제거
+        service.invalidate("token-c")
+        await service.profile("token-b")
+        await service.profile("token-a")
+        await service.profile("token-c")
+
+    asyncio.run(run())
+
+    assert [token for _, token in backend.requests] == ["token-a", "token-b", "token-c", "token-a", "token-c"]